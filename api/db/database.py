@@ -1,7 +1,16 @@
 """ The database module
 """
-from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
+from importlib.util import find_spec
+
+from fastapi import Depends, Request
+from sqlalchemy.orm import Session, sessionmaker, scoped_session, declarative_base
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from api.db.async_session import SyncSessionAdapter
+from api.db.instrumentation import register_query_instrumentation
+from api.db.pool import pool_options, register_pool_logging
+from api.db.replicas import ReplicaRouter, ReplicaSession, track_primary_writes
+from api.db.slow_queries import register_slow_query_log
 from api.utils.settings import settings, BASE_DIR
 
 
@@ -31,15 +40,66 @@ def get_db_engine(test_mode: bool = False):
             f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
         )
 
+        db_engine = create_engine(DATABASE_URL, **pool_options())
+        register_pool_logging(db_engine)
+        return db_engine
+
     return create_engine(DATABASE_URL)
 
 
+def get_async_db_engine(test_mode: bool = False):
+    """Returns an async engine for postgresql, or None when the sync stand-in
+    should be used (sqlite, test mode or the asyncpg driver is not installed)
+    """
+
+    if DB_TYPE != "postgresql" or test_mode or find_spec("asyncpg") is None:
+        return None
+
+    DATABASE_URL = (
+        f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    )
+
+    db_engine = create_async_engine(DATABASE_URL, **pool_options(is_async=True))
+    register_pool_logging(db_engine.sync_engine)
+    return db_engine
+
+
 engine = get_db_engine()
+register_query_instrumentation(engine)
+register_slow_query_log(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 db_session = scoped_session(SessionLocal)
 
+replica_router = ReplicaRouter(
+    urls=[url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()],
+    strategy=settings.DB_REPLICA_STRATEGY,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    lag_check_interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
+    sticky_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
+
+if replica_router.enabled:
+    track_primary_writes(SessionLocal)
+
+for replica in replica_router.replicas:
+    register_query_instrumentation(replica.engine)
+    register_slow_query_log(replica.engine)
+
+async_engine = get_async_db_engine()
+if async_engine is not None:
+    register_query_instrumentation(async_engine.sync_engine)
+    register_slow_query_log(async_engine.sync_engine, explain=False)
+
+AsyncSessionLocal = (
+    async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+    if async_engine is not None
+    else None
+)
+
 Base = declarative_base()
 
 
@@ -53,3 +113,39 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """Yields a session for read-only endpoints.
+
+    Reads are served by a replica when one is configured, healthy and the
+    client has not written recently; otherwise the primary session is used.
+    """
+
+    replica = replica_router.choose(request.scope.get("session"))
+
+    if replica is None:
+        yield db
+        return
+
+    read_db = ReplicaSession(primary=engine, replica=replica, autoflush=False)
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+
+
+async def get_async_db(sync_db: Session = Depends(get_db)):
+    """Yields an AsyncSession for `async def` routes.
+
+    Falls back to the `get_db` session of the request wrapped in an awaitable
+    adapter when no async engine is available, so the same service code runs
+    on sqlite.
+    """
+
+    if AsyncSessionLocal is None:
+        yield SyncSessionAdapter(sync_db)
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,133 @@
+""" Per-request SQL statement counting and N+1 detection
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from api.utils.logger import db_logger
+from api.utils.settings import settings
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\((?:\s*(?:\?|%\([^)]*\)s|%s|\$\d+|:\w+)\s*,?)+\)")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalises a SQL statement so executions differing only in their
+    literal values or IN-list lengths share the same shape
+    """
+
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _LITERALS.sub("?", shape)
+    return _PLACEHOLDER_LISTS.sub("(?)", shape)
+
+
+class RequestQueryStats:
+    """Statements executed and time spent in the database during one request"""
+
+    def __init__(self, scope: Optional[dict] = None):
+        self._lock = threading.Lock()
+        self.scope = scope or {}
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, duration: float):
+        shape = statement_shape(statement)
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.shapes[shape] += 1
+
+    def repeated_shapes(self, threshold: int):
+        """Returns (shape, count) pairs executed at least `threshold` times"""
+
+        with self._lock:
+            return [
+                (shape, count) for shape, count in self.shapes.most_common()
+                if count >= threshold
+            ]
+
+
+_request_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _request_query_stats.get()
+
+
+def register_query_instrumentation(engine):
+    """Times every cursor execution of `engine` into the current request's stats"""
+
+    # the start is kept on the execution context, which a failing statement
+    # discards, rather than on the pooled connection
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_query_stats.get()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - context._query_start_time)
+
+
+def endpoint_name(scope) -> str:
+    """Returns `module.function` of the matched route, or the request path"""
+
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return scope.get("path", "")
+    return f"{endpoint.__module__}.{endpoint.__name__}"
+
+
+class QueryStatsMiddleware:
+    """Logs likely N+1 query patterns of each request and, when `headers` is
+    set (`DB_QUERY_STATS_HEADERS`, off by default), adds `X-DB-Queries` and
+    `Server-Timing` headers with its statement count and database time
+    """
+
+    def __init__(self, app, headers: Optional[bool] = None):
+        self.app = app
+        self.headers = settings.DB_QUERY_STATS_HEADERS if headers is None else headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope)
+        token = _request_query_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.headers:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'.encode(),
+                ))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_query_stats.reset(token)
+            self.log_repeated_shapes(scope, stats)
+
+    @staticmethod
+    def log_repeated_shapes(scope, stats: RequestQueryStats):
+        for shape, count in stats.repeated_shapes(settings.DB_N_PLUS_ONE_THRESHOLD):
+            db_logger.warning(
+                f"Possible N+1 query in {endpoint_name(scope)} "
+                f"({scope.get('method')} {scope.get('path')}): "
+                f"statement executed {count} times: {shape}"
+            )
@@ -0,0 +1,126 @@
+""" Connection pool configuration and metrics
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from api.utils.logger import db_logger
+from api.utils.settings import settings
+
+
+class PoolMetrics:
+    """Thread-safe counters for time spent waiting on pool checkouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.slow_checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if seconds * 1000 >= settings.DB_POOL_SLOW_CHECKOUT_MS:
+                self.slow_checkouts += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "slow_checkouts": self.slow_checkouts,
+                "total_wait_ms": round(self.total_wait * 1000, 3),
+                "avg_wait_ms": round(
+                    self.total_wait * 1000 / self.checkouts, 3
+                ) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class _TimedCheckoutMixin:
+    """Times every `connect()` call, i.e. queueing for or opening a connection"""
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # QueuePool only keeps this privately; recorded for `pool_status`
+        self.max_overflow = max_overflow
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            waited = time.perf_counter() - start
+            self.metrics.record_wait(waited)
+            if waited * 1000 >= settings.DB_POOL_SLOW_CHECKOUT_MS:
+                log_pool_status(self, reason=f"slow checkout ({waited * 1000:.1f} ms)")
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        # created lazily so pools rebuilt by `recreate()` get fresh counters
+        if "_metrics" not in self.__dict__:
+            self._metrics = PoolMetrics()
+        return self._metrics
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that records checkout wait times"""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times"""
+
+
+def pool_options(is_async: bool = False) -> dict:
+    """Returns the `create_engine` pool keyword arguments built from settings"""
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+    }
+
+
+def pool_status(pool) -> dict:
+    """Returns checked-out, idle and overflow counts plus wait metrics of a pool"""
+
+    if not isinstance(pool, QueuePool):
+        return {"pool_class": type(pool).__name__}
+
+    status = {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "timeout": pool.timeout(),
+    }
+    if isinstance(pool, _TimedCheckoutMixin):
+        status["max_overflow"] = pool.max_overflow
+        status.update(pool.metrics.to_dict())
+
+    return status
+
+
+def log_pool_status(pool, reason: str = "status"):
+    """Logs the current pool status"""
+
+    db_logger.warning(f"Connection pool {reason}: {pool_status(pool)}")
+
+
+def register_pool_logging(engine):
+    """Logs the pool status whenever a checkout has to use overflow connections"""
+
+    @event.listens_for(engine, "checkout")
+    def _log_overflow_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool = engine.pool
+        if isinstance(pool, QueuePool) and pool.overflow() > 0:
+            log_pool_status(pool, reason="overflow checkout")
@@ -0,0 +1,210 @@
+""" Read replica routing
+"""
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from api.db.pool import pool_options
+from api.utils.logger import db_logger
+
+# session key holding the time of the last write made by a client
+LAST_WRITE_SESSION_KEY = "db_last_write"
+
+REPLICA_LAG_QUERY = text(
+    "SELECT COALESCE("
+    "EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())), 0)"
+)
+
+
+class RequestWriteState:
+    """Mutable per-request flag, shared with the threadpool workers of a request"""
+
+    def __init__(self):
+        self.wrote = False
+
+
+_request_write_state: ContextVar[Optional[RequestWriteState]] = ContextVar(
+    "request_write_state", default=None
+)
+
+
+def mark_request_write():
+    """Records that the current request has written to the primary"""
+
+    state = _request_write_state.get()
+    if state is not None:
+        state.wrote = True
+
+
+def request_has_written() -> bool:
+    state = _request_write_state.get()
+    return state is not None and state.wrote
+
+
+def track_primary_writes(session_factory):
+    """Marks the current request as having written whenever a primary session
+    flushes changes or executes an INSERT/UPDATE/DELETE
+    """
+
+    @event.listens_for(session_factory, "after_flush")
+    def _after_flush(session, flush_context):
+        mark_request_write()
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _do_orm_execute(orm_execute_state):
+        if (
+            orm_execute_state.is_insert
+            or orm_execute_state.is_update
+            or orm_execute_state.is_delete
+        ):
+            mark_request_write()
+
+
+class Replica:
+    """A replica engine with a cached replication lag"""
+
+    def __init__(self, url: str):
+        self.engine = create_engine(url, **pool_options())
+        self.lag: float = 0.0
+        self.lag_checked_at: float = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def in_use(self) -> int:
+        return self.engine.pool.checkedout()
+
+    def refresh_lag(self, interval: float) -> float:
+        """Re-reads the replication lag at most once every `interval` seconds"""
+
+        now = time.monotonic()
+        if now - self.lag_checked_at < interval:
+            return self.lag
+
+        with self._lock:
+            if now - self.lag_checked_at < interval:
+                return self.lag
+            try:
+                with self.engine.connect() as conn:
+                    self.lag = float(conn.execute(REPLICA_LAG_QUERY).scalar() or 0)
+            except Exception as exc:
+                db_logger.warning(f"Replica {self.name} unavailable: {exc}")
+                self.lag = float("inf")
+            self.lag_checked_at = now
+
+        return self.lag
+
+
+class ReplicaRouter:
+    """Selects a replica for read-only sessions.
+
+    Replicas lagging more than `max_lag` seconds are skipped; when none is
+    usable, or the client wrote recently, reads go to the primary.
+    """
+
+    STRATEGIES = ("round_robin", "least_connections")
+
+    def __init__(
+        self,
+        urls: List[str],
+        strategy: str = "round_robin",
+        max_lag: float = 10.0,
+        lag_check_interval: float = 5.0,
+        sticky_seconds: float = 5.0,
+    ):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown replica strategy '{strategy}'")
+
+        self.replicas = [Replica(url) for url in urls]
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.lag_check_interval = lag_check_interval
+        self.sticky_seconds = sticky_seconds
+        self._cycle = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def is_sticky(self, session: Optional[dict]) -> bool:
+        """True if the request or the client session wrote recently"""
+
+        if request_has_written():
+            return True
+
+        last_write = (session or {}).get(LAST_WRITE_SESSION_KEY)
+        return last_write is not None and time.time() - last_write < self.sticky_seconds
+
+    def choose(self, session: Optional[dict] = None) -> Optional[Replica]:
+        """Returns the replica to read from, or None to read from the primary"""
+
+        if not self.enabled or self.is_sticky(session):
+            return None
+
+        healthy = [
+            replica for replica in self.replicas
+            if replica.refresh_lag(self.lag_check_interval) <= self.max_lag
+        ]
+        if not healthy:
+            return None
+
+        if self.strategy == "least_connections":
+            return min(healthy, key=lambda replica: replica.in_use())
+
+        return healthy[next(self._cycle) % len(healthy)]
+
+
+class ReplicaSession(Session):
+    """Session bound to a replica which switches to the primary for flushes
+    and for any statement issued after the request has written
+    """
+
+    def __init__(self, primary, replica: Replica, **kwargs):
+        super().__init__(bind=primary, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or request_has_written():
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        return self.replica.engine
+
+
+class ReadYourWritesMiddleware:
+    """Tracks primary writes per request and remembers them in the client
+    session so that the following reads are served by the primary.
+
+    Must be added before `SessionMiddleware` so it runs inside it.
+    """
+
+    def __init__(self, app, router: ReplicaRouter):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        state = RequestWriteState()
+        token = _request_write_state.set(state)
+
+        async def send_wrapper(message):
+            if (
+                message["type"] == "http.response.start"
+                and state.wrote
+                and "session" in scope
+            ):
+                scope["session"][LAST_WRITE_SESSION_KEY] = time.time()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_write_state.reset(token)
@@ -0,0 +1,158 @@
+""" Slow query log with EXPLAIN plan capture
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import event
+
+from api.db.instrumentation import current_query_stats, endpoint_name, statement_shape
+from api.utils.logger import db_logger
+from api.utils.settings import settings
+
+SERVICES_MODULE = "api.v1.services"
+
+
+def redact_parameters(parameters):
+    """Keeps the structure and non-string values of statement parameters but
+    hides the content of strings, which may hold emails, passwords or tokens
+    """
+
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    if isinstance(parameters, (str, bytes)):
+        return f"<redacted {type(parameters).__name__}({len(parameters)})>"
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    return f"<{type(parameters).__name__}>"
+
+
+def calling_service_method() -> Optional[str]:
+    """Returns the innermost service method on the current call stack"""
+
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(SERVICES_MODULE):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            if owner is not None:
+                name = f"{type(owner).__name__}.{name}"
+            return f"{module}.{name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryRecorder:
+    """Keeps the most recent slow statements and one EXPLAIN plan per
+    statement shape, both in bounded ring buffers
+    """
+
+    def __init__(self, buffer_size: int = 100):
+        self._lock = threading.Lock()
+        self.queries = deque(maxlen=buffer_size)
+        self.plans = OrderedDict()
+        self.buffer_size = buffer_size
+        self._explainer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="slow-query-explain"
+        )
+
+    def record(self, engine, statement: str, parameters, duration: float, explain: bool = True):
+        stats = current_query_stats()
+        entry = {
+            "sql": statement,
+            "shape": statement_shape(statement),
+            "params": redact_parameters(parameters),
+            "duration_ms": round(duration * 1000, 3),
+            "service": calling_service_method(),
+            "route": endpoint_name(stats.scope) if stats is not None else None,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        with self._lock:
+            self.queries.append(entry)
+            explain = (
+                explain
+                and settings.DB_SLOW_QUERY_EXPLAIN
+                and engine.dialect.name == "postgresql"
+                and entry["shape"] not in self.plans
+            )
+            if explain:
+                # reserve the shape so it is only explained once
+                self._store_plan(entry["shape"], None)
+
+        db_logger.warning(
+            f"Slow query ({entry['duration_ms']} ms) in {entry['route']} "
+            f"from {entry['service']}: {statement} | params={entry['params']}"
+        )
+
+        if explain:
+            self._explainer.submit(self.explain, engine, statement, parameters, entry["shape"])
+
+    def explain(self, engine, statement: str, parameters, shape: str):
+        """Runs `EXPLAIN (ANALYZE off)` on a separate connection and stores the plan"""
+
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return
+
+        try:
+            with engine.connect() as conn:
+                rows = conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE off) {statement}", parameters
+                ).all()
+            plan = "\n".join(row[0] for row in rows)
+        except Exception as exc:
+            plan = f"EXPLAIN failed: {exc}"
+
+        with self._lock:
+            self._store_plan(shape, plan)
+
+    def _store_plan(self, shape: str, plan: Optional[str]):
+        self.plans[shape] = {
+            "shape": shape,
+            "plan": plan,
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.plans.move_to_end(shape)
+        while len(self.plans) > self.buffer_size:
+            self.plans.popitem(last=False)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "threshold_ms": settings.DB_SLOW_QUERY_MS,
+                "queries": list(reversed(self.queries)),
+                "plans": [plan for plan in reversed(self.plans.values()) if plan["plan"]],
+            }
+
+
+slow_query_recorder = SlowQueryRecorder(buffer_size=settings.DB_SLOW_QUERY_BUFFER_SIZE)
+
+
+def register_slow_query_log(
+    engine, recorder: SlowQueryRecorder = slow_query_recorder, explain: bool = True
+):
+    """Records every statement of `engine` slower than `DB_SLOW_QUERY_MS`.
+
+    Pass `explain=False` for the `sync_engine` of an async engine: its
+    connections only work inside the event loop's greenlet, so the
+    explainer thread cannot use them.
+    """
+
+    # the start is kept on the execution context, which a failing statement
+    # discards, rather than on the pooled connection
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._slow_query_start_time
+        if duration * 1000 >= settings.DB_SLOW_QUERY_MS:
+            recorder.record(conn.engine, statement, parameters, duration, explain=explain)
@@ -0,0 +1,179 @@
+""" Cache backends shared by the in-process caches of the API
+
+`LocalCache` keeps entries in this process only. `SharedCache` keeps them
+in a key-value store shared by every worker (Redis, or `LocalSharedStore`
+as a stand-in for development and tests) so invalidations reach all of
+them. Values stored in a `SharedCache` must be JSON serializable.
+
+Invalidating a `LocalCache` only reaches the process that made the write,
+so with several workers other processes keep stale entries until they
+expire. `create_cache` caps the time to live of local caches at
+`max_local_ttl` when it is told there is more than one worker.
+"""
+import json
+import threading
+import time
+from typing import Any, Optional
+
+from cachetools import TTLCache
+
+
+class CacheMetrics:
+    """Thread-safe hit, miss and invalidation counters of a cache"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidations += 1
+
+    def to_dict(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class LocalCache:
+    """In-process cache with a time to live and least recently used eviction"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._lock = threading.Lock()
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._entries.currsize
+
+
+class LocalSharedStore:
+    """Minimal in-memory stand-in for the subset of the Redis client API
+    used by `SharedCache`
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value, expires_at = self._values.get(key, (None, None))
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value, ex: Optional[float] = None):
+        if isinstance(value, str):
+            value = value.encode()
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + ex if ex else None)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def scan_iter(self, match: str = "*"):
+        prefix = match.rstrip("*")
+        with self._lock:
+            return [key for key in list(self._values) if key.startswith(prefix)]
+
+
+class SharedCache:
+    """Cache stored in a shared key-value store under a key prefix"""
+
+    def __init__(self, client, prefix: str, ttl: float):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self._key(key))
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any):
+        self.client.set(self._key(key), json.dumps(value), ex=self.ttl)
+
+    def delete(self, key: str):
+        self.client.delete(self._key(key))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        # counting shared keys means scanning the store
+        return None
+
+
+def create_cache(
+    url: str,
+    prefix: str,
+    maxsize: int,
+    ttl: float,
+    workers: int = 1,
+    max_local_ttl: Optional[float] = None,
+):
+    """Returns the cache backend selected by `url`:
+
+    - empty or `local://`: a `LocalCache` of `maxsize` entries, expiring
+      after `max_local_ttl` at most when there are several `workers`
+    - `memory://`: a `SharedCache` in a process-local `LocalSharedStore`
+    - `redis://` or `rediss://`: a `SharedCache` in Redis (requires `redis`)
+    """
+
+    if not url or url.startswith("local://"):
+        if workers > 1 and max_local_ttl is not None:
+            ttl = min(ttl, max_local_ttl)
+        return LocalCache(maxsize=maxsize, ttl=ttl)
+
+    if url.startswith("memory://"):
+        return SharedCache(LocalSharedStore(), prefix=prefix, ttl=ttl)
+
+    if url.startswith(("redis://", "rediss://")):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                f"The redis package is required for the cache backend {url}"
+            ) from exc
+        return SharedCache(redis.Redis.from_url(url), prefix=prefix, ttl=ttl)
+
+    raise ValueError(f"Unsupported cache backend '{url}'")
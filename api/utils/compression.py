@@ -0,0 +1,201 @@
+""" Compression of response bodies
+
+`CompressionMiddleware` encodes responses with brotli or gzip, whichever the
+client prefers in `Accept-Encoding`, brotli winning ties. Brotli is only
+offered when the `brotli` package is installed.
+
+Responses are left as they are when:
+
+- the path is under one of `excluded_paths`, such as the already compressed
+  images served from `/media` and `/static`
+- the content type is not in `COMPRESSIBLE_TYPES`, or a `Content-Encoding`
+  is already set
+- the whole body is smaller than `minimum_size`
+
+A strong `ETag` of a compressed response is made weak, since the encoded
+bytes are no longer the representation it was computed for.
+
+Streamed bodies, such as `StreamingResponse`, are compressed chunk by chunk
+and each compressed chunk is flushed as soon as its source chunk arrives,
+so clients keep receiving rows while the listing is still being read.
+"""
+import zlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from api.utils.settings import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/csv",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+})
+
+EXCLUDED_PATHS = ("/media", "/static")
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        # wbits 16 + MAX_WBITS writes the gzip header and trailer
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self.compressor.process(data) + self.compressor.finish()
+
+
+def accepted_encodings(accept_encoding: str) -> dict:
+    """Returns the `{coding: q}` of an `Accept-Encoding` header"""
+
+    encodings = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[coding.lower()] = q
+    return encodings
+
+
+class CompressionMiddleware:
+    """Compresses response bodies with brotli or gzip"""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+        compressible_types: Iterable[str] = COMPRESSIBLE_TYPES,
+        excluded_paths: Iterable[str] = EXCLUDED_PATHS,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.compressible_types = frozenset(compressible_types)
+        self.excluded_paths = tuple(excluded_paths)
+
+    def encoder(self, accept_encoding: str):
+        """Returns an encoder for the preferred coding of the client, if any"""
+
+        encodings = accepted_encodings(accept_encoding)
+        wildcard = encodings.get("*", 0.0)
+        br = encodings.get("br", wildcard) if brotli is not None else 0.0
+        gzip = encodings.get("gzip", wildcard)
+
+        if br > 0 and br >= gzip:
+            return BrotliEncoder(self.brotli_quality)
+        if gzip > 0:
+            return GzipEncoder(self.gzip_level)
+        return None
+
+    def compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type in self.compressible_types
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        encoder = self.encoder(Headers(scope=scope).get("accept-encoding", ""))
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoder, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Compresses the messages of one response, holding back the start
+    message until the first body chunk shows whether to compress
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoder, send):
+        self.middleware = middleware
+        self.encoder = encoder
+        self._send = send
+        self.start: Optional[dict] = None
+        self.compress: Optional[bool] = None
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compress is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            self.compress = self.middleware.compressible(headers) and (
+                more_body or len(body) >= self.middleware.minimum_size
+            )
+            if self.compress:
+                headers["Content-Encoding"] = self.encoder.name
+                headers.add_vary_header("Accept-Encoding")
+                del headers["Content-Length"]
+                etag = headers.get("ETag")
+                if etag is not None and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                if not more_body:
+                    body = self.encoder.finish(body)
+                    headers["Content-Length"] = str(len(body))
+                    await self._send(self.start)
+                    await self._send({"type": "http.response.body", "body": body})
+                    return
+            await self._send(self.start)
+
+        if self.compress:
+            message = {
+                "type": "http.response.body",
+                "body": self.encoder.chunk(body) if more_body else self.encoder.finish(body),
+                "more_body": more_body,
+            }
+        await self._send(message)
@@ -0,0 +1,241 @@
+""" Conditional GET for read-heavy public endpoints
+
+`ConditionalGet(*models)` is added as the last dependency of a route. Before
+the route loads anything it reads `max(updated_at)` and `count(*)` of the
+tables the response is built from, which are cheap index lookups, and hashes
+them with the path and query string into a weak `ETag`:
+
+- when `If-None-Match` matches, `NotModified` is raised and the client gets
+  an empty `304` without the route loading or serialising its rows
+- otherwise the validator is kept on `request.state` and
+  `ConditionalGetMiddleware` adds `ETag`, `Last-Modified` and
+  `Cache-Control` to the response of the route
+
+Updates move `max(updated_at)` and inserts or deletes move `count(*)`, so
+the tag changes with every write. Values kept on a row without moving its
+`updated_at`, such as the like and dislike counts of blogs, are covered by
+also passing the tables they are counted from. Deletes do not move
+`Last-Modified`, so `If-Modified-Since` is only honoured for a single row of
+a single table, through `by=`, and when the request has no `If-None-Match`.
+
+`Cache-Control` defaults to `HTTP_CACHE_CONTROL` and each route's `policy`
+name can be given its own value in `HTTP_CACHE_CONTROL_ROUTES`, e.g.
+`blogs=public, max-age=60;faqs=public, max-age=300`.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from api.db.database import get_read_db
+from api.utils.settings import settings
+
+
+def parse_policies(value: str) -> Dict[str, str]:
+    """Parses `name=policy;name=policy` into a dict"""
+
+    policies = {}
+    for item in value.split(";"):
+        name, _, policy = item.partition("=")
+        if name.strip() and policy.strip():
+            policies[name.strip()] = policy.strip()
+    return policies
+
+
+CACHE_CONTROL_POLICIES = parse_policies(settings.HTTP_CACHE_CONTROL_ROUTES)
+
+
+@dataclass(frozen=True)
+class Validator:
+    etag: str
+    last_modified: Optional[datetime]
+    cache_control: str
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+class NotModified(Exception):
+    """Raised by `ConditionalGet` to answer with `304 Not Modified`"""
+
+    def __init__(self, validator: Validator):
+        self.validator = validator
+
+
+def not_modified_response(exc: NotModified) -> Response:
+    return Response(status_code=304, headers=exc.validator.headers())
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Weak comparison of `etag` against an `If-None-Match` header"""
+
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def not_modified_since(last_modified: Optional[datetime], if_modified_since: str) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have no fractions of a second
+    return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+
+
+class ConditionalGet:
+    """Dependency validating a conditional GET against the last update of
+    `models` before the route runs.
+
+    Args:
+        models: the tables the response is built from.
+        by: name of the path parameter holding the id of a single row of
+            the first model; a missing row is left to the route to answer.
+            The other models are narrowed to the rows referencing it.
+        policy: name of the route in `HTTP_CACHE_CONTROL_ROUTES`.
+        cache_control: `Cache-Control` of the route when `policy` is not
+            configured, `HTTP_CACHE_CONTROL` by default.
+    """
+
+    def __init__(
+        self,
+        *models,
+        by: Optional[str] = None,
+        policy: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ):
+        self.models = models
+        self.by = by
+        self.policy = policy
+        self.cache_control = cache_control
+
+    @property
+    def cache_control_header(self) -> str:
+        return CACHE_CONTROL_POLICIES.get(
+            self.policy, self.cache_control or settings.HTTP_CACHE_CONTROL
+        )
+
+    def state(self, db: Session, request: Request):
+        """Returns `(max(updated_at), count(*))` of each model, read in one
+        statement
+        """
+        queries = [self.aggregates(model, request) for model in self.models]
+        if len(queries) == 1:
+            query = queries[0]
+        else:
+            query = select(*(
+                aggregates.with_only_columns(column).scalar_subquery()
+                for aggregates in queries
+                for column in aggregates.selected_columns
+            ))
+
+        row = tuple(db.execute(query).one())
+        if len(row) != 2 * len(self.models):
+            raise ValueError("Expected max(updated_at) and count(*) of each model")
+        return [row[index:index + 2] for index in range(0, len(row), 2)]
+
+    def aggregates(self, model, request: Request):
+        query = select(func.max(model.updated_at), func.count()).select_from(model)
+        if self.by is not None:
+            query = query.where(*self.rows_of(model, request.path_params[self.by]))
+        return query
+
+    def rows_of(self, model, id: str) -> list:
+        """Returns the criteria selecting the rows of `model` that belong to
+        the row `id` of the first model
+        """
+        first = self.models[0].__table__
+        if model.__table__ is first:
+            return [model.id == id]
+        return [
+            foreign_key.parent == id
+            for foreign_key in model.__table__.foreign_keys
+            if foreign_key.column.table is first
+        ]
+
+    def validator(self, db: Session, request: Request) -> Optional[Validator]:
+        try:
+            state = self.state(db, request)
+        except (TypeError, ValueError):
+            # not a `(max, count)` row, the route answers unconditionally
+            return None
+        if self.by is not None and state[0][1] == 0:
+            return None
+
+        key = repr((
+            request.url.path,
+            sorted(request.query_params.multi_items()),
+            [(model.__tablename__, str(latest), count)
+             for model, (latest, count) in zip(self.models, state)],
+        ))
+        etag = 'W/"%s"' % hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        latest = [_utc(latest) for latest, _ in state if latest is not None]
+
+        return Validator(etag, max(latest, default=None), self.cache_control_header)
+
+    def __call__(self, request: Request, db: Session = Depends(get_read_db)):
+        validator = self.validator(db, request)
+        if validator is None:
+            return
+
+        if_none_match = request.headers.get("if-none-match")
+        if_modified_since = request.headers.get("if-modified-since")
+
+        if if_none_match is not None:
+            if etag_matches(validator.etag, if_none_match):
+                raise NotModified(validator)
+        elif self.by is not None and len(self.models) == 1 and if_modified_since is not None:
+            if not_modified_since(validator.last_modified, if_modified_since):
+                raise NotModified(validator)
+
+        request.state.conditional = validator
+
+
+class ConditionalGetMiddleware:
+    """Adds the headers of the validator checked by `ConditionalGet` to
+    successful responses
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                validator = scope.get("state", {}).get("conditional")
+                if validator is not None:
+                    headers = [
+                        (name, value) for name, value in message.get("headers", [])
+                        if name.lower() not in (b"etag", b"last-modified", b"cache-control")
+                    ]
+                    headers.extend(
+                        (name.lower().encode(), value.encode())
+                        for name, value in validator.headers().items()
+                    )
+                    message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,71 @@
+""" Lazily created per-user rows
+
+Settings-like rows (notification settings, data privacy setting, profile)
+only hold column defaults until a user changes them, so they are not
+inserted at signup. Reads fall back to an unsaved instance holding the
+defaults and the row is written on the first update.
+"""
+from functools import lru_cache
+
+from sqlalchemy import Boolean
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+
+def _server_default_value(column):
+    """Python value of a literal server default, or None for SQL expressions"""
+
+    default = column.server_default.arg
+    if isinstance(default, TextClause):
+        default = default.text
+    if not isinstance(default, str):
+        return None
+
+    default = default.strip("'")
+    if isinstance(column.type, Boolean):
+        return default.lower() == "true"
+    return default
+
+
+@lru_cache(maxsize=None)
+def default_values(model) -> dict:
+    """Returns the values a new row of `model` gets from its literal
+    column defaults, leaving out generated values such as ids and timestamps
+    """
+
+    values = {}
+    for column in model.__table__.columns:
+        if column.default is not None and column.default.is_scalar:
+            values[column.key] = column.default.arg
+        elif column.server_default is not None:
+            value = _server_default_value(column)
+            if value is not None:
+                values[column.key] = value
+    return values
+
+
+def default_row(model, **values):
+    """Returns an unsaved `model` instance holding its default values"""
+
+    return model(**{**default_values(model), **values})
+
+
+def fetch_or_default(db: Session, model, user_id: str):
+    """Fetches the row of `model` for a user, or the unsaved default row if
+    the user has not changed it yet. Never writes to the database.
+    """
+
+    row = db.query(model).filter(model.user_id == user_id).first()
+    return row if row is not None else default_row(model, user_id=user_id)
+
+
+def fetch_or_create(db: Session, model, user_id: str):
+    """Fetches the row of `model` for a user, adding the default row to the
+    session if it does not exist yet. The caller commits.
+    """
+
+    row = db.query(model).filter(model.user_id == user_id).first()
+    if row is None:
+        row = default_row(model, user_id=user_id)
+        db.add(row)
+    return row
@@ -0,0 +1,75 @@
+""" Sparse fieldsets for list endpoints
+
+Each model declares the columns a client can select in `__projectable__`,
+merged along the class hierarchy like `__filterable__`. A `fields=` query
+parameter such as `fields=title,excerpt` loads only those columns with
+`load_only`, so large `Text` columns stay in the database, and the payload is
+projected to the same fields. `id` is always returned.
+"""
+from typing import Annotated, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy.orm import load_only
+
+# query parameter of the list endpoints that support sparse fieldsets
+FieldsQuery = Annotated[Optional[str], Query(
+    description="Comma separated fields to return for each item, all fields "
+    "when missing")]
+
+
+def projectable_fields(model) -> Tuple[str, ...]:
+    """Returns the fields of a model that can be selected"""
+
+    fields = []
+    for cls in reversed(model.__mro__):
+        for field in cls.__dict__.get("__projectable__", ()):
+            if field not in fields:
+                fields.append(field)
+    return tuple(fields)
+
+
+def parse_fields(model, fields: Optional[str]) -> Optional[List[str]]:
+    """Validates a `fields=` query parameter against the whitelist of `model`
+
+    Returns None when all fields are wanted.
+    """
+
+    if not fields:
+        return None
+
+    allowed = projectable_fields(model)
+    selected = ["id"]
+    for field in (field.strip() for field in fields.split(",")):
+        if not field or field in selected:
+            continue
+        if field not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot select '{field}', allowed: {', '.join(allowed)}",
+            )
+        selected.append(field)
+
+    return selected
+
+
+def load_fields(query, model, fields: Optional[Sequence[str]], *required: str):
+    """Restricts a Query or Select to the columns of `fields`, plus the
+    `required` ones the caller needs, such as the columns it orders by
+    """
+
+    if fields is None:
+        return query
+
+    names = dict.fromkeys([*fields, *required])
+    return query.options(load_only(*(getattr(model, name) for name in names)))
+
+
+def project(rows: Iterable, fields: Optional[Sequence[str]]) -> list:
+    """Returns the rows as dicts of `fields`, or unchanged when all fields
+    are wanted
+    """
+
+    if fields is None:
+        return list(rows)
+
+    return [{field: getattr(row, field) for field in fields} for row in rows]
@@ -0,0 +1,205 @@
+""" Filters for listing queries
+
+Each model declares the columns it can be filtered by and the operators
+allowed on each in `__filterable__`; plain tables declare them in
+`Table.info["filterable"]`. Declarations are merged along the class
+hierarchy, so fields of `BaseTableModel` are filterable on every model.
+
+Filters are passed as `field=value`, using the first declared operator of the
+field, or `field__<operator>=value`. They compile to predicates an index can
+serve:
+
+- `eq`: `column = value`
+- `ieq`: `lower(column) = lower(value)`, served by an index on `lower(column)`
+- `prefix`: `lower(column) LIKE 'value%'` with the value lowercased,
+  served by a `text_pattern_ops` index on `lower(column)`
+
+`filter_indexes` declares those two indexes for every `ieq` and `prefix`
+field of a model when it is mapped.
+- `gte`, `gt`, `lte`, `lt`: range comparisons
+- `in`: `column IN (...)` from a list or a comma separated string
+
+`contains` (`lower(column) LIKE '%value%'`) cannot use a B-tree index and is only
+declared for keyword search over small tables.
+
+Unknown fields and operators are rejected with a 400 so a typo in a query
+parameter does not silently return the whole table.
+"""
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Index, Table, func
+
+EQ = "eq"
+IEQ = "ieq"
+PREFIX = "prefix"
+GTE = "gte"
+GT = "gt"
+LTE = "lte"
+LT = "lt"
+IN = "in"
+CONTAINS = "contains"
+
+RANGE = (GTE, GT, LTE, LT)
+
+SEPARATOR = "__"
+
+_OPERATORS = {
+    EQ: lambda column, value: column == value,
+    IEQ: lambda column, value: func.lower(column) == value.lower(),
+    PREFIX: lambda column, value: func.lower(column).like(
+        _escape_like(value.lower()) + "%", escape="/"
+    ),
+    GTE: lambda column, value: column >= value,
+    GT: lambda column, value: column > value,
+    LTE: lambda column, value: column <= value,
+    LT: lambda column, value: column < value,
+    IN: lambda column, value: column.in_(value),
+    CONTAINS: lambda column, value: column.icontains(value, autoescape=True),
+}
+
+# operators that compare against text regardless of the column type
+_TEXT_OPERATORS = (IEQ, PREFIX, CONTAINS)
+
+
+def filterable_fields(model) -> Dict[str, Tuple[str, ...]]:
+    """Returns the filterable fields of a model or table and their operators"""
+
+    if isinstance(model, Table):
+        return dict(model.info.get("filterable", {}))
+
+    fields = {}
+    for cls in reversed(model.__mro__):
+        fields.update(cls.__dict__.get("__filterable__", {}))
+    return fields
+
+
+def filter_indexes(model) -> list:
+    """Adds the indexes serving the `ieq` and `prefix` filters of a model
+    to its table and returns them
+    """
+
+    table = model.__table__
+    existing = {index.name for index in table.indexes}
+    indexes = []
+    for field, operators in filterable_fields(model).items():
+        column = table.columns[field]
+        if IEQ in operators and f"ix_{table.name}_{column.name}_lower" not in existing:
+            indexes.append(
+                Index(f"ix_{table.name}_{column.name}_lower", func.lower(column))
+            )
+        if PREFIX in operators and f"ix_{table.name}_{column.name}_pattern" not in existing:
+            # LIKE 'value%' can only use a B-tree index built for pattern
+            # matching unless the database collation is C
+            indexes.append(
+                Index(
+                    f"ix_{table.name}_{column.name}_pattern",
+                    func.lower(column).label(f"lower_{column.name}"),
+                    postgresql_ops={f"lower_{column.name}": "text_pattern_ops"},
+                )
+            )
+    return indexes
+
+
+def filter_predicates(model, params: Mapping[str, Any]) -> list:
+    """Compiles filter parameters to predicates on the columns of `model`
+
+    Parameters set to None or an empty string are skipped.
+    """
+
+    fields = filterable_fields(model)
+    predicates = []
+
+    for param, value in params.items():
+        if value is None or value == "":
+            continue
+
+        field, _, operator = param.partition(SEPARATOR)
+        operators = fields.get(field)
+        if not operators:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot filter by '{field}'",
+            )
+        operator = operator or operators[0]
+        if operator not in operators:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot filter '{field}' by '{operator}', "
+                f"allowed: {', '.join(operators)}",
+            )
+
+        column = _column(model, field)
+        predicates.append(_OPERATORS[operator](column, _coerce(column, operator, value, param)))
+
+    return predicates
+
+
+def apply_filters(query, model, params: Optional[Mapping[str, Any]]):
+    """Applies filter parameters to a Query or Select of `model`"""
+
+    if not params:
+        return query
+
+    predicates = filter_predicates(model, params)
+    return query.filter(*predicates) if predicates else query
+
+
+def _column(model, field: str):
+    if isinstance(model, Table):
+        return model.columns[field]
+    return getattr(model, field)
+
+
+def _coerce(column, operator: str, value, param: str):
+    if operator in _TEXT_OPERATORS:
+        return str(value)
+    if operator == IN:
+        values = value.split(",") if isinstance(value, str) else value
+        return [_coerce_value(column, item, param) for item in values]
+    return _coerce_value(column, value, param)
+
+
+def _coerce_value(column, value, param: str):
+    """Converts a query string value to the Python type of the column"""
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if isinstance(value, python_type) or not isinstance(value, str):
+        return value
+
+    try:
+        if python_type is bool:
+            return _parse_bool(value)
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type in (int, float, Decimal):
+            return python_type(value)
+    except (ValueError, InvalidOperation):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid value for '{param}'",
+        )
+
+    return value
+
+
+def _escape_like(value: str) -> str:
+    # the pattern is bound as a single literal so the planner sees the prefix
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    raise ValueError(value)
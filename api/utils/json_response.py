@@ -1,13 +1,61 @@
 #!/usr/bin/env python3
-""" This module contains the Json response class """
+""" This module contains the Json response classes """
 from enum import Enum
 from json import dumps
+import orjson
 from fastapi import status
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from typing import Any, Dict, Optional
 
+def _default(obj: Any) -> Any:
+    """Encodes what orjson does not handle natively, such as Decimal,
+    timedelta, sets, pydantic models and ORM instances, as `jsonable_encoder`
+    does
+    """
+    return jsonable_encoder(obj)
+
+
+def dumps_bytes(content: Any) -> bytes:
+    """Serializes `content` to the bytes `JSONResponse` renders for
+    `jsonable_encoder(content)`, in a single pass.
+
+    orjson handles datetime, date, UUID, Enum and dataclasses natively with the
+    same output. Floats in exponent notation are written as `1e16` instead of
+    `1e+16`.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def row_content(row: Any, exclude: frozenset = frozenset()) -> Any:
+    """Returns an ORM instance or dict without the `exclude` keys, as
+    `jsonable_encoder(row, exclude=exclude)` would, but leaves encoding the
+    values to `FastJSONResponse` instead of walking them twice
+    """
+    if isinstance(row, dict):
+        data = row
+    elif hasattr(row, "_sa_instance_state"):
+        data = vars(row)
+    else:
+        return jsonable_encoder(row, exclude=exclude)
+
+    return {
+        key: value for key, value in data.items()
+        if key not in exclude and not (isinstance(key, str) and key.startswith("_sa"))
+    }
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that encodes its content with orjson instead of
+    `jsonable_encoder` followed by the stdlib `json`. The default response
+    class of the app
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
 class JsonResponseDict(JSONResponse):
 
     def __init__(
@@ -0,0 +1,87 @@
+""" Cache of verified JWT claims
+
+Clients reuse the same bearer token for many requests, so verifying its
+signature once and caching the claims until the token expires saves a
+signature check on every request. Entries are keyed by a hash of the
+token, so the cache never holds usable tokens.
+"""
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from cachetools import TLRUCache
+from jose import jwt
+
+from api.utils.cache import CacheMetrics
+from api.utils.settings import settings
+
+
+def _expires_at(key, claims: dict, now: float) -> float:
+    return claims["exp"]
+
+
+class TokenClaimsCache:
+    """Decodes JWTs with `jwt.decode`, caching the claims of at most
+    `maxsize` valid tokens until their `exp`. A `maxsize` of 0 disables it.
+    """
+
+    def __init__(self, maxsize: int, secret_key: str, algorithm: str):
+        self.maxsize = maxsize
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.metrics = CacheMetrics()
+        self._lock = threading.Lock()
+        self._claims = TLRUCache(maxsize=max(maxsize, 1), ttu=_expires_at, timer=time.time)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def decode(self, token: str) -> dict:
+        """Returns the claims of `token`, raising `JWTError` if it is invalid
+        or expired like `jwt.decode`
+        """
+
+        if not self.maxsize:
+            return self._decode(token)
+
+        key = self._key(token)
+        with self._lock:
+            claims: Optional[dict] = self._claims.get(key)
+
+        if claims is not None:
+            self.metrics.record_hit()
+            return dict(claims)
+
+        self.metrics.record_miss()
+        claims = self._decode(token)
+        # tokens without an expiry are verified every time
+        if isinstance(claims.get("exp"), (int, float)):
+            with self._lock:
+                self._claims[key] = claims
+        return dict(claims)
+
+    def _decode(self, token: str) -> dict:
+        return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+
+    def clear(self):
+        with self._lock:
+            self._claims.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._claims.currsize
+        return {
+            "enabled": bool(self.maxsize),
+            "size": size,
+            "maxsize": self.maxsize,
+            **self.metrics.to_dict(),
+        }
+
+
+token_claims = TokenClaimsCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_SIZE,
+    secret_key=settings.SECRET_KEY,
+    algorithm=settings.ALGORITHM,
+)
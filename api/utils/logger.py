@@ -8,3 +8,7 @@ logging.basicConfig(
 )
 
 logger = logging.getLogger(__name__)
+
+# Database diagnostics (pool saturation, slow queries) are logged below ERROR
+db_logger = logging.getLogger("api.db")
+db_logger.setLevel(logging.WARNING)
@@ -1,9 +1,31 @@
-from typing import Any, Dict, List, Optional
-from fastapi.encoders import jsonable_encoder
+import base64
+import json
+from datetime import datetime
+from typing import Annotated, Any, Dict, List, Optional
+from fastapi import HTTPException, Query
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from api.db.database import Base
+from api.utils.fieldsets import load_fields, project
+from api.utils.filters import apply_filters
+from api.utils.json_response import row_content
 
 from api.utils.success_response import success_response
+from api.utils.totals import total_counter
+
+
+# query parameter of the list endpoints that support cursor pagination
+CursorQuery = Annotated[Optional[str], Query(
+    description="Cursor from the `next` or `prev` of a previous page, or empty "
+    "for the first page. Switches to cursor pagination, ignoring `skip`")]
+
+# fields never returned by listings
+HIDDEN_FIELDS = frozenset({'password', 'is_superadmin', 'is_deleted', 'is_active'})
+
+IncludeTotalQuery = Annotated[bool, Query(
+    description="Whether to count the items. Skipping the count makes deep "
+    "pages of large listings faster")]
 
 
 def paginated_response(
@@ -12,7 +34,10 @@ def paginated_response(
     skip: int,
     limit: int,
     join: Optional[Any] = None,
-    filters: Optional[Dict[str, Any]]=None
+    filters: Optional[Dict[str, Any]]=None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[List[str]] = None,
 ):
 
     '''
@@ -24,7 +49,19 @@ def paginated_response(
         * skip- this is the number of items to skip before fetching the next page of data. This would also
         be a query parameter
         * join- this is an optional argument to join a table to the query
-        * filters- this is an optional dictionary of filters to apply to the query
+        * filters- this is an optional dictionary of filters to apply to the query, see `api.utils.filters`
+        * cursor- switches to cursor pagination when not None, see below
+        * include_total- whether to count the items, `total` and `pages` are
+        None when False. The count is exact, cached or estimated depending on
+        the model, see `api.utils.totals`, and `total_exact` tells which
+        * fields- optional list of fields from `parse_fields` to load and
+        return for each item, see `api.utils.fieldsets`
+
+    Cursor pagination orders items by `(created_at, id)`, newest first, and
+    returns opaque `next` and `prev` cursors instead of page counts. Pass an
+    empty cursor for the first page and a returned cursor for the next ones.
+    Pages do not shift when items are added, and deep pages cost as much as
+    the first one. `skip` is ignored in this mode.
 
     Example use:
         **Without filter**
@@ -59,30 +96,156 @@ def paginated_response(
             filters={'org_id': org_id}
         )
         ```
+
+        **With cursor**
+        ``` python
+        return paginated_response(
+            db=db,
+            model=Product,
+            limit=limit,
+            skip=skip,
+            cursor=cursor
+        )
+        ```
     '''
 
-    query = db.query(model)
+    query = _apply_join_and_filters(db.query(model), model, join, filters)
+
+    if cursor is not None:
+        query, direction = _apply_cursor(query, model, cursor, limit)
+        query = load_fields(query, model, fields, "created_at")
+        return _cursor_success_response(query.all(), model, cursor, limit, direction, fields)
+
+    total, exact = (
+        total_counter.count(db, query, model) if include_total else (None, False)
+    )
+    query = load_fields(query, model, fields)
+    results = project(query.offset(skip).limit(limit).all(), fields)
+
+    return _paginated_success_response(results, total, skip, limit, exact)
+
+
+async def paginated_response_async(
+    db: AsyncSession,
+    model,
+    skip: int,
+    limit: int,
+    join: Optional[Any] = None,
+    filters: Optional[Dict[str, Any]]=None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[List[str]] = None,
+):
+    '''
+    Async version of `paginated_response` for `async def` routes using `get_async_db`.\n
+    Takes the same arguments and returns the same response shape.
+    '''
+
+    stmt = _apply_join_and_filters(select(model), model, join, filters)
+
+    if cursor is not None:
+        stmt, direction = _apply_cursor(stmt, model, cursor, limit)
+        stmt = load_fields(stmt, model, fields, "created_at")
+        rows = (await db.execute(stmt)).scalars().all()
+        return _cursor_success_response(rows, model, cursor, limit, direction, fields)
+
+    total, exact = (
+        await db.run_sync(total_counter.count, stmt, model)
+        if include_total else (None, False)
+    )
+    stmt = load_fields(stmt, model, fields)
+    rows = (await db.execute(stmt.offset(skip).limit(limit))).scalars().all()
+    results = project(rows, fields)
+
+    return _paginated_success_response(results, total, skip, limit, exact)
+
+
+def _apply_join_and_filters(query, model, join, filters):
+    '''Applies the optional join and filters to a Query or Select, filtering
+    on the columns of `join` when given
+    '''
 
     if join is not None:
         query = query.join(join)
-        
-    if filters and join is None:
-        # Apply filters
-        for attr, value in filters.items():
-            if value is not None:
-                query = query.filter(getattr(model, attr).like(f"%{value}%"))
-
-    elif filters and join is not None:
-        # Apply filters
-        for attr, value in filters.items():
-            if value is not None:
-                query = query.filter(
-                    getattr(getattr(join, "columns"),
-                            attr).like(f"%{value}%"))
-
-    total = query.count()
-    results = jsonable_encoder(query.offset(skip).limit(limit).all())
-    total_pages = int(total / limit) + (total % limit > 0)
+
+    return apply_filters(query, model if join is None else join, filters)
+
+
+def encode_cursor(item, direction: str) -> str:
+    '''Returns an opaque cursor pointing before or after `item`'''
+
+    value = json.dumps([item.created_at.isoformat(), item.id, direction])
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    '''Returns the `(created_at, id, direction)` of a cursor from `encode_cursor`'''
+
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id, direction = json.loads(value)
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return datetime.fromisoformat(created_at), id, direction
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _apply_cursor(query, model, cursor: str, limit: int):
+    '''Limits a Query or Select to the page after or before `cursor`,
+    fetching one extra row to tell whether there are more
+    '''
+
+    key = tuple_(model.created_at, model.id)
+
+    if not cursor:
+        return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1), "next"
+
+    created_at, id, direction = decode_cursor(cursor)
+    if direction == "next":
+        query = query.filter(key < tuple_(created_at, id))
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        # read backwards from the cursor, the page is reversed afterwards
+        query = query.filter(key > tuple_(created_at, id))
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+
+    return query.limit(limit + 1), direction
+
+
+def _cursor_success_response(
+    rows, model, cursor: str, limit: int, direction: str, fields: Optional[List[str]] = None
+):
+    '''Builds the cursor paginated success response from the rows of `_apply_cursor`'''
+
+    rows = list(rows)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if direction == "next":
+        has_next, has_prev = has_more, bool(cursor)
+    else:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+
+    return success_response(
+        status_code=200,
+        message="Successfully fetched items",
+        data={
+            "limit": limit,
+            "next": encode_cursor(rows[-1], "next") if rows and has_next else None,
+            "prev": encode_cursor(rows[0], "prev") if rows and has_prev else None,
+            "items": [row_content(row, HIDDEN_FIELDS) for row in project(rows, fields)]
+        }
+    )
+
+
+def _paginated_success_response(
+    results, total: Optional[int], skip: int, limit: int, exact: bool = True
+):
+    '''Builds the paginated success response from already fetched rows'''
+
+    total_pages = None if total is None else int(total / limit) + (total % limit > 0)
 
     return success_response(
         status_code=200,
@@ -90,16 +253,9 @@ def paginated_response(
         data={
             "pages": total_pages,
             "total": total,
+            "total_exact": exact,
             "skip": skip,
             "limit": limit,
-            "items": jsonable_encoder(
-                results,
-                exclude={
-                    'password',
-                    'is_superadmin',
-                    'is_deleted',
-                    'is_active'
-                }
-            )
+            "items": [row_content(row, HIDDEN_FIELDS) for row in results]
         }
     )
@@ -0,0 +1,128 @@
+""" Password hashing on a dedicated bounded worker pool
+
+bcrypt keeps a CPU core busy for the whole hash, so hashing inline in the
+request threadpool lets a burst of logins starve every other sync
+endpoint. `PasswordHasher` runs hashes on its own small pool of threads
+or processes, and rejects work with a 429 once the pool and its queue
+are full instead of letting requests pile up.
+
+`async def` routes such as login and password changes await the `_async`
+methods and hold no thread while they wait. Sync routes such as register
+still wait on a threadpool thread, so `workers + max_pending` is kept well
+below the 40 threads of the threadpool.
+"""
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from api.utils.settings import settings
+
+
+@lru_cache(maxsize=None)
+def _crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# module level so they can be sent to worker processes
+def _hash(rounds: int, password: str) -> str:
+    return _crypt_context(rounds).hash(secret=password)
+
+
+def _verify(rounds: int, password: str, hash: str) -> bool:
+    return _crypt_context(rounds).verify(secret=password, hash=hash)
+
+
+def _verify_and_update(rounds: int, password: str, hash: str) -> Tuple[bool, Optional[str]]:
+    return _crypt_context(rounds).verify_and_update(secret=password, hash=hash)
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a bounded pool of `workers`
+    threads or processes, with at most `max_pending` calls waiting
+    """
+
+    def __init__(
+        self,
+        rounds: int = 12,
+        workers: int = 2,
+        max_pending: int = 8,
+        use_processes: bool = False,
+    ):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        # created on first use so importing the app does not start workers
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.use_processes:
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="password-hash"
+                        )
+        return self._executor
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many password operations in progress, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            future = self.executor.submit(fn, self.rounds, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def hash(self, password: str) -> str:
+        return self._submit(_hash, password).result()
+
+    def verify(self, password: str, hash: str) -> bool:
+        return self._submit(_verify, password, hash).result()
+
+    def verify_and_update(self, password: str, hash: str) -> Tuple[bool, Optional[str]]:
+        """Verifies a password and returns a new hash if `hash` was made with
+        different parameters, e.g. before the work factor was changed
+        """
+
+        return self._submit(_verify_and_update, password, hash).result()
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify_async(self, password: str, hash: str) -> bool:
+        return await asyncio.wrap_future(self._submit(_verify, password, hash))
+
+    async def verify_and_update_async(
+        self, password: str, hash: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(self._submit(_verify_and_update, password, hash))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_HASH_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    use_processes=settings.PASSWORD_HASH_USE_PROCESSES,
+)
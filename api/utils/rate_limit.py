@@ -0,0 +1,302 @@
+""" Rate limiting shared by every worker of the API
+
+All routes use the single `limiter` below, whose counters live in the
+storage selected by `RATE_LIMIT_STORAGE_URL`:
+
+- `memory://`: counters in this process only, for development and tests
+- `redis://host:port`: counters shared by every worker and node
+- `batched+redis://host:port`: shared counters, with each worker adding up
+  hits locally and sending them to Redis in batches, so checking a limit
+  does not cost a round trip on every request
+
+Limits are keyed by the authenticated user when the request carries a
+valid access token and by client IP otherwise. Routes scoped to an
+organisation are keyed by organisation with `key_func=organisation_key`,
+so its members share the `RATE_LIMIT_ORGANISATION` limit.
+"""
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from jose import JWTError
+from limits import RateLimitItem
+from limits.storage import Storage, storage_from_string
+from limits.strategies import RateLimiter
+from limits.util import WindowStats
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from api.utils.jwt_cache import token_claims
+from api.utils.settings import settings
+
+
+class SlidingWindowCounterRateLimiter(RateLimiter):
+    """Approximates a sliding window from the counters of the current and
+    previous fixed windows, weighting the previous one by how much of it
+    still overlaps the sliding window.
+
+    Unlike the moving window strategy it only needs counters, so it works
+    with `BatchedStorage` and costs one key per client and window.
+    """
+
+    def _window_keys(self, item: RateLimitItem, *identifiers: str) -> Tuple[str, str, float]:
+        period = item.get_expiry()
+        now = time.time()
+        window = int(now // period)
+        key = item.key_for(*identifiers)
+        weight = 1 - (now % period) / period
+        return f"{key}/{window}", f"{key}/{window - 1}", weight
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        current, previous, weight = self._window_keys(item, *identifiers)
+        count = self.storage.incr(current, 2 * item.get_expiry(), amount=cost)
+        return self.storage.get(previous) * weight + count <= item.amount
+
+    def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        current, previous, weight = self._window_keys(item, *identifiers)
+        count = self.storage.get(previous) * weight + self.storage.get(current)
+        return count + cost <= item.amount
+
+    def get_window_stats(self, item: RateLimitItem, *identifiers: str) -> WindowStats:
+        current, previous, weight = self._window_keys(item, *identifiers)
+        count = self.storage.get(previous) * weight + self.storage.get(current)
+        period = item.get_expiry()
+        reset = (int(time.time() // period) + 1) * period
+        return WindowStats(reset, max(0, item.amount - math.ceil(count)))
+
+    def clear(self, item: RateLimitItem, *identifiers: str) -> None:
+        current, previous, _ = self._window_keys(item, *identifiers)
+        self.storage.clear(current)
+        self.storage.clear(previous)
+
+
+class BatchedStorage(Storage):
+    """Counter storage that adds up hits in this process and sends them to a
+    shared storage every `flush_interval` seconds or `batch_size` hits.
+
+    The first hit on a key in each window goes straight to the shared
+    storage to learn the count of the other workers. After that, a worker
+    sees the hits of the other workers at its next flush, so together they
+    can admit up to `batch_size` requests per worker over a limit. Keys
+    that are only read, such as the previous window of the sliding window
+    counter, are read from the shared storage and cached for
+    `flush_interval` seconds.
+
+    Round trips to the shared storage are made without holding the lock.
+    """
+
+    STORAGE_SCHEME = ["batched+memory", "batched+redis", "batched+rediss"]
+
+    def __init__(
+        self,
+        uri: str,
+        wrap_exceptions: bool = False,
+        flush_interval: float = 0.5,
+        batch_size: int = 10,
+        **options,
+    ):
+        self.shared = storage_from_string(uri.split("+", 1)[1], **options)
+        self.flush_interval = float(flush_interval)
+        self.batch_size = int(batch_size)
+        # key -> (last count seen in the shared storage, expiry timestamp)
+        self._counts: Dict[str, Tuple[int, float]] = {}
+        # key -> (hits not yet sent, expiry in seconds)
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._pending_hits = 0
+        self._last_flush = time.monotonic()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return self.shared.base_exceptions
+
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        with self.lock:
+            known = self._count(key) is not None
+            if known:
+                pending, _ = self._pending.get(key, (0, expiry))
+                self._pending[key] = (pending + amount, expiry)
+                self._pending_hits += amount
+        if not known:
+            self._send(key, amount, expiry)
+        elif self._flush_due():
+            self.flush()
+        return self.get(key)
+
+    def get(self, key: str) -> int:
+        with self.lock:
+            count = self._count(key)
+            pending = self._pending.get(key, (0, 0))[0]
+        if count is None:
+            # e.g. the previous window of a client that only other workers
+            # saw, which would otherwise count as 0 here
+            shared = self.shared.get(key)
+            with self.lock:
+                count = self._count(key)
+                if count is None:
+                    count = shared
+                    self._counts[key] = (count, time.time() + self.flush_interval)
+        return count + pending
+
+    def get_expiry(self, key: str) -> int:
+        with self.lock:
+            return int(self._counts.get(key, (0, time.time()))[1])
+
+    def check(self) -> bool:
+        return self.shared.check()
+
+    def reset(self) -> Optional[int]:
+        with self.lock:
+            self._counts.clear()
+            self._pending.clear()
+            self._pending_hits = 0
+        return self.shared.reset()
+
+    def clear(self, key: str) -> None:
+        with self.lock:
+            self._counts.pop(key, None)
+            if key in self._pending:
+                self._pending_hits -= self._pending.pop(key)[0]
+        self.shared.clear(key)
+
+    def flush(self):
+        """Sends the pending hits of every key to the shared storage"""
+
+        with self.lock:
+            pending, self._pending = self._pending, {}
+            self._pending_hits = 0
+            self._last_flush = time.monotonic()
+            # keep counting the hits being sent until the shared count is back
+            for key, (amount, _) in pending.items():
+                count = self._count(key)
+                if count is not None:
+                    self._counts[key] = (count + amount, self._counts[key][1])
+        for key, (amount, expiry) in pending.items():
+            self._send(key, amount, expiry)
+
+    def _count(self, key: str) -> Optional[int]:
+        count, expires_at = self._counts.get(key, (None, 0))
+        if expires_at <= time.time():
+            self._counts.pop(key, None)
+            return None
+        return count
+
+    def _send(self, key: str, amount: int, expiry: int):
+        # called without the lock, so other requests are not held up by the
+        # round trip to the shared storage
+        count = self.shared.incr(key, expiry, amount=amount)
+        with self.lock:
+            known = self._count(key)
+            if known is None:
+                self._counts[key] = (count, time.time() + expiry)
+            else:
+                # a concurrent send may already have brought back a newer count
+                self._counts[key] = (max(count, known), self._counts[key][1])
+
+    def _flush_due(self) -> bool:
+        with self.lock:
+            return (
+                self._pending_hits >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+
+def _bearer_token(request) -> Optional[str]:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return token if scheme.lower() == "bearer" and token else None
+
+
+def user_key(request) -> str:
+    """Keys limits by the user of a valid access token, or by client IP"""
+
+    token = _bearer_token(request)
+    if token:
+        try:
+            payload = token_claims.decode(token)
+        except JWTError:
+            payload = {}
+        if payload.get("user_id") and payload.get("type") == "access":
+            return f"user:{payload['user_id']}"
+    return f"ip:{get_remote_address(request)}"
+
+
+def organisation_key(request) -> str:
+    """Keys limits by the `org_id` of the route, shared by all its members"""
+
+    org_id = request.path_params.get("org_id") or request.query_params.get("org_id")
+    return f"org:{org_id}" if org_id else user_key(request)
+
+
+def _storage_options() -> dict:
+    if not settings.RATE_LIMIT_STORAGE_URL.startswith("batched+"):
+        return {}
+    return {
+        "flush_interval": settings.RATE_LIMIT_FLUSH_INTERVAL,
+        "batch_size": settings.RATE_LIMIT_BATCH_SIZE,
+    }
+
+
+class StrategyLimiter(Limiter):
+    """slowapi `Limiter` that also accepts the strategies defined in this
+    module, without adding them to the global registry of `limits`
+    """
+
+    STRATEGIES = {"sliding-window-counter": SlidingWindowCounterRateLimiter}
+
+    def __init__(self, *args, strategy: Optional[str] = None, **kwargs):
+        local = self.STRATEGIES.get(strategy)
+        super().__init__(*args, strategy="fixed-window" if local else strategy, **kwargs)
+        if local:
+            self._strategy = strategy
+            self._limiter = local(self._storage)
+            if self._fallback_limiter is not None:
+                self._fallback_limiter = local(self._fallback_storage)
+
+
+limiter = StrategyLimiter(
+    key_func=user_key,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URL,
+    storage_options=_storage_options(),
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
+
+
+class RateLimitHeadersMiddleware:
+    """Adds the `RateLimit-Limit`, `RateLimit-Remaining`, `RateLimit-Reset`
+    and `RateLimit-Policy` headers of the limit checked for a request, and
+    `Retry-After` when the request was rejected
+    """
+
+    def __init__(self, app, limiter: Limiter = limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                current_limit = scope.get("state", {}).get("view_rate_limit")
+                if current_limit is not None and self.limiter.enabled:
+                    headers = list(message.get("headers", []))
+                    headers.extend(self.headers(message["status"], *current_limit))
+                    message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def headers(self, status_code: int, item: RateLimitItem, args: list):
+        reset, remaining = self.limiter.limiter.get_window_stats(item, *args)
+        reset_in = max(0, math.ceil(reset - time.time()))
+        headers = [
+            (b"ratelimit-limit", str(item.amount).encode()),
+            (b"ratelimit-remaining", str(remaining).encode()),
+            (b"ratelimit-reset", str(reset_in).encode()),
+            (b"ratelimit-policy", f"{item.amount};w={item.get_expiry()}".encode()),
+        ]
+        if status_code == 429:
+            headers.append((b"retry-after", str(reset_in).encode()))
+        return headers
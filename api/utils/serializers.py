@@ -0,0 +1,78 @@
+""" Serializers of the response schemas
+
+Validating rows one `model_validate` call at a time rebuilds the validation
+state of the schema for every row, and the response is encoded again by
+`jsonable_encoder` afterwards. `serializers` keeps one `TypeAdapter` per
+schema, validates whole lists of ORM instances in a single call and dumps
+them straight to JSON bytes, in the format of the response model path.
+"""
+import threading
+from typing import Any, Dict, Iterable, List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from api.utils.json_response import dumps_bytes
+
+
+class SerializerRegistry:
+    """Cached TypeAdapters of the response schemas"""
+
+    def __init__(self):
+        self._adapters: Dict[Any, TypeAdapter] = {}
+        self._lock = threading.Lock()
+
+    def adapter(self, schema) -> TypeAdapter:
+        """Returns the TypeAdapter of a schema or type such as `List[Schema]`,
+        built on first use
+        """
+
+        adapter = self._adapters.get(schema)
+        if adapter is None:
+            with self._lock:
+                adapter = self._adapters.get(schema)
+                if adapter is None:
+                    adapter = self._adapters[schema] = TypeAdapter(schema)
+        return adapter
+
+    def validate_list(self, schema, rows: Iterable) -> list:
+        """Validates ORM instances or dicts against `schema` in one call"""
+
+        return self.adapter(List[schema]).validate_python(list(rows), from_attributes=True)
+
+    def dump_json(self, schema, value) -> bytes:
+        """Dumps a validated value of `schema` to JSON bytes"""
+
+        return self.adapter(schema).dump_json(value, by_alias=True)
+
+    def response(self, schema, value, status_code: int = 200) -> Response:
+        """Returns a validated value of `schema` as the response, skipping the
+        validation and encoding of the route's response model
+        """
+
+        return Response(
+            self.dump_json(schema, value), status_code=status_code, media_type="application/json"
+        )
+
+    def success_response(
+        self, schema, rows: Iterable, message: str, status_code: int = 200
+    ) -> Response:
+        """Returns the `success_response` envelope with `rows` validated
+        against `schema` as its data
+        """
+
+        data = self.dump_json(List[schema], self.validate_list(schema, rows))
+        envelope = dumps_bytes({"status_code": status_code, "success": True, "message": message})
+
+        return Response(
+            envelope[:-1] + b',"data":' + data + b"}",
+            status_code=status_code,
+            media_type="application/json",
+        )
+
+    def clear(self):
+        with self._lock:
+            self._adapters.clear()
+
+
+serializers = SerializerRegistry()
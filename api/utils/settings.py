@@ -23,6 +23,132 @@ class Settings(BaseSettings):
     DB_NAME: str = config("DB_NAME")
     DB_TYPE: str = config("DB_TYPE")
 
+    # Connection pool configurations
+    DB_POOL_SIZE: int = config("DB_POOL_SIZE", default=5, cast=int)
+    DB_MAX_OVERFLOW: int = config("DB_MAX_OVERFLOW", default=10, cast=int)
+    DB_POOL_TIMEOUT: int = config("DB_POOL_TIMEOUT", default=30, cast=int)
+    DB_POOL_RECYCLE: int = config("DB_POOL_RECYCLE", default=1800, cast=int)
+    DB_POOL_PRE_PING: bool = config("DB_POOL_PRE_PING", default=True, cast=bool)
+    DB_POOL_USE_LIFO: bool = config("DB_POOL_USE_LIFO", default=False, cast=bool)
+    DB_POOL_SLOW_CHECKOUT_MS: float = config(
+        "DB_POOL_SLOW_CHECKOUT_MS", default=100, cast=float
+    )
+
+    # Read replica configurations
+    DB_REPLICA_URLS: str = config("DB_REPLICA_URLS", default="")
+    DB_REPLICA_STRATEGY: str = config("DB_REPLICA_STRATEGY", default="round_robin")
+    DB_REPLICA_MAX_LAG_SECONDS: float = config(
+        "DB_REPLICA_MAX_LAG_SECONDS", default=10, cast=float
+    )
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = config(
+        "DB_REPLICA_LAG_CHECK_INTERVAL", default=5, cast=float
+    )
+    DB_READ_YOUR_WRITES_SECONDS: float = config(
+        "DB_READ_YOUR_WRITES_SECONDS", default=5, cast=float
+    )
+
+    # Query instrumentation configurations
+    # statement counts and database time reveal the workload of each endpoint,
+    # so the headers are for debugging deployments only
+    DB_QUERY_STATS_HEADERS: bool = config(
+        "DB_QUERY_STATS_HEADERS", default=False, cast=bool
+    )
+    DB_N_PLUS_ONE_THRESHOLD: int = config(
+        "DB_N_PLUS_ONE_THRESHOLD", default=5, cast=int
+    )
+    DB_SLOW_QUERY_MS: float = config("DB_SLOW_QUERY_MS", default=200, cast=float)
+    DB_SLOW_QUERY_EXPLAIN: bool = config(
+        "DB_SLOW_QUERY_EXPLAIN", default=False, cast=bool
+    )
+    DB_SLOW_QUERY_BUFFER_SIZE: int = config(
+        "DB_SLOW_QUERY_BUFFER_SIZE", default=100, cast=int
+    )
+
+    # Worker processes serving the API, as read by uvicorn and gunicorn.
+    # Local caches are invalidated in the writing process only, so with
+    # several workers they keep entries for LOCAL_CACHE_MAX_TTL at most;
+    # set the *_CACHE_URL settings to a redis:// store to share them.
+    WEB_CONCURRENCY: int = config("WEB_CONCURRENCY", default=1, cast=int)
+    LOCAL_CACHE_MAX_TTL: float = config("LOCAL_CACHE_MAX_TTL", default=5, cast=float)
+
+    # Authenticated user cache configurations
+    # empty: per-process cache, see WEB_CONCURRENCY
+    AUTH_PRINCIPAL_CACHE_URL: str = config("AUTH_PRINCIPAL_CACHE_URL", default="")
+    AUTH_PRINCIPAL_CACHE_TTL: int = config(
+        "AUTH_PRINCIPAL_CACHE_TTL", default=60, cast=int
+    )
+    AUTH_PRINCIPAL_CACHE_SIZE: int = config(
+        "AUTH_PRINCIPAL_CACHE_SIZE", default=10000, cast=int
+    )
+    AUTH_TOKEN_CACHE_SIZE: int = config("AUTH_TOKEN_CACHE_SIZE", default=10000, cast=int)
+
+    # Service cache configurations
+    # empty: the AUTH_PRINCIPAL_CACHE_URL store, per-process if that is empty
+    SERVICE_CACHE_URL: str = (
+        config("SERVICE_CACHE_URL", default="") or AUTH_PRINCIPAL_CACHE_URL
+    )
+    SERVICE_CACHE_TTL: int = config("SERVICE_CACHE_TTL", default=300, cast=int)
+    SERVICE_CACHE_SIZE: int = config("SERVICE_CACHE_SIZE", default=1000, cast=int)
+
+    # Pagination configurations
+    PAGINATION_TOTAL_CACHE_TTL: float = config(
+        "PAGINATION_TOTAL_CACHE_TTL", default=30, cast=float
+    )
+    PAGINATION_TOTAL_CACHE_SIZE: int = config(
+        "PAGINATION_TOTAL_CACHE_SIZE", default=1000, cast=int
+    )
+    PAGINATION_ESTIMATE_THRESHOLD: int = config(
+        "PAGINATION_ESTIMATE_THRESHOLD", default=10000, cast=int
+    )
+    STREAM_BATCH_SIZE: int = config("STREAM_BATCH_SIZE", default=500, cast=int)
+
+    # HTTP caching configurations
+    HTTP_CACHE_CONTROL: str = config("HTTP_CACHE_CONTROL", default="public, no-cache")
+    HTTP_CACHE_CONTROL_ROUTES: str = config("HTTP_CACHE_CONTROL_ROUTES", default="")
+
+    # Response compression configurations
+    COMPRESSION_MINIMUM_SIZE: int = config("COMPRESSION_MINIMUM_SIZE", default=1024, cast=int)
+    COMPRESSION_GZIP_LEVEL: int = config("COMPRESSION_GZIP_LEVEL", default=6, cast=int)
+    COMPRESSION_BROTLI_QUALITY: int = config("COMPRESSION_BROTLI_QUALITY", default=4, cast=int)
+
+    # Password hashing configurations
+    PASSWORD_HASH_ROUNDS: int = config("PASSWORD_HASH_ROUNDS", default=12, cast=int)
+    PASSWORD_HASH_WORKERS: int = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+    # sync callers such as register wait for the hash on a threadpool thread,
+    # so workers + max pending must stay well below its 40 threads
+    PASSWORD_HASH_MAX_PENDING: int = config(
+        "PASSWORD_HASH_MAX_PENDING", default=8, cast=int
+    )
+    PASSWORD_HASH_USE_PROCESSES: bool = config(
+        "PASSWORD_HASH_USE_PROCESSES", default=False, cast=bool
+    )
+
+    # Rate limit configurations
+    RATE_LIMIT_ENABLED: bool = config("RATE_LIMIT_ENABLED", default=True, cast=bool)
+    RATE_LIMIT_STORAGE_URL: str = config("RATE_LIMIT_STORAGE_URL", default="memory://")
+    RATE_LIMIT_STRATEGY: str = config(
+        "RATE_LIMIT_STRATEGY", default="sliding-window-counter"
+    )
+    RATE_LIMIT_BATCH_SIZE: int = config("RATE_LIMIT_BATCH_SIZE", default=10, cast=int)
+    RATE_LIMIT_FLUSH_INTERVAL: float = config(
+        "RATE_LIMIT_FLUSH_INTERVAL", default=0.5, cast=float
+    )
+    # shared by all members of an organisation on its org-scoped routes
+    RATE_LIMIT_ORGANISATION: str = config(
+        "RATE_LIMIT_ORGANISATION", default="1000/minute"
+    )
+
+    # Token revocation configurations
+    TOKEN_REVOCATION_FILTER_CAPACITY: int = config(
+        "TOKEN_REVOCATION_FILTER_CAPACITY", default=100000, cast=int
+    )
+    TOKEN_REVOCATION_FILTER_ERROR_RATE: float = config(
+        "TOKEN_REVOCATION_FILTER_ERROR_RATE", default=0.001, cast=float
+    )
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = config(
+        "TOKEN_REVOCATION_SYNC_INTERVAL", default=5, cast=float
+    )
+
     MAIL_USERNAME: str = config("MAIL_USERNAME")
     MAIL_PASSWORD: str = config("MAIL_PASSWORD")
     MAIL_FROM: str = config("MAIL_FROM")
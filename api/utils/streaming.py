@@ -0,0 +1,96 @@
+""" Streaming responses for unbounded list endpoints
+
+List endpoints that return every row accept `stream=ndjson` or `stream=json`.
+Rows are then read in batches of `STREAM_BATCH_SIZE` with `yield_per`, which
+uses a server side cursor on Postgres, and written out as they are encoded,
+so the memory of a request no longer grows with the table:
+
+- `ndjson`: one JSON document per line, `application/x-ndjson`
+- `json`: the usual success response with `data` written as a chunked array
+
+Since FastAPI closes the sessions of `yield` dependencies before the body is
+sent, the rows are read through a session of their own, bound to the engine
+the request session would have used and closed once the rows are read. Rows
+are encoded with orjson, like the responses of `FastJSONResponse`.
+"""
+from typing import Annotated, Any, Callable, Iterable, Iterator, Literal, Optional
+
+from fastapi import Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query as ORMQuery
+
+from api.db.database import SessionLocal
+from api.utils.json_response import dumps_bytes, row_content
+from api.utils.settings import settings
+
+NDJSON = "ndjson"
+JSON = "json"
+
+# query parameter of the list endpoints that can stream their rows
+StreamQuery = Annotated[Optional[Literal["ndjson", "json"]], Query(
+    description="Streams every item as newline delimited JSON or as a chunked "
+    "JSON array instead of building the response in memory")]
+
+
+def stream_rows(query: ORMQuery, batch_size: Optional[int] = None) -> Iterator[Any]:
+    """Returns an iterator over the rows of a Query read `batch_size` at a
+    time through a dedicated session, closed when done
+    """
+
+    # resolved now, while a replica session can still tell whether the
+    # request has written
+    bind = query.session.get_bind()
+    return _read_rows(query, bind, batch_size or settings.STREAM_BATCH_SIZE)
+
+
+def _read_rows(query: ORMQuery, bind, batch_size: int) -> Iterator[Any]:
+    db = SessionLocal(bind=bind)
+    try:
+        yield from query.with_session(db).yield_per(batch_size)
+    finally:
+        db.close()
+
+
+def streaming_response(
+    rows: Iterable,
+    format: str,
+    message: str,
+    encode: Callable[[Any], Any] = row_content,
+    status_code: int = 200,
+    batch_size: Optional[int] = None,
+) -> StreamingResponse:
+    """Returns a response writing `rows` as they are encoded, `batch_size`
+    rows per chunk
+    """
+
+    batch_size = batch_size or settings.STREAM_BATCH_SIZE
+
+    if format == NDJSON:
+        body = _chunks((dumps_bytes(encode(row)) + b"\n" for row in rows), batch_size)
+        return StreamingResponse(body, status_code=status_code, media_type="application/x-ndjson")
+
+    body = _json_array(rows, encode, message, status_code, batch_size)
+    return StreamingResponse(body, status_code=status_code, media_type="application/json")
+
+
+def _json_array(rows: Iterable, encode, message: str, status_code: int, batch_size: int):
+    envelope = dumps_bytes({"status_code": status_code, "success": True, "message": message})
+    yield envelope[:-1] + b',"data":['
+
+    separated = (
+        (b"," if index else b"") + dumps_bytes(encode(row))
+        for index, row in enumerate(rows)
+    )
+    yield from _chunks(separated, batch_size)
+    yield b"]}"
+
+
+def _chunks(lines: Iterable[bytes], batch_size: int) -> Iterator[bytes]:
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= batch_size:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
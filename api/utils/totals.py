@@ -0,0 +1,113 @@
+""" Totals of paginated listings
+
+Counting every row of a listing costs a scan of the whole filtered set on
+each page, so each model picks how its totals are computed:
+
+- `exact`: `COUNT(*)` on every request
+- `cached`: `COUNT(*)` cached for `PAGINATION_TOTAL_CACHE_TTL` seconds per
+  filter set, so paging through a listing counts it once
+- `estimated`: the planner's row estimate from `EXPLAIN`, which Postgres
+  derives from `pg_class.reltuples` and the column statistics. Counted
+  exactly below `PAGINATION_ESTIMATE_THRESHOLD` rows, where it is cheap,
+  and on databases other than Postgres
+
+Totals that come from the cache or the planner are reported as not exact.
+"""
+from typing import Optional, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from api.utils.cache import CacheMetrics, LocalCache
+from api.utils.settings import settings
+
+EXACT = "exact"
+CACHED = "cached"
+ESTIMATED = "estimated"
+
+# totals strategy of each listed table, exact when missing
+TOTAL_STRATEGIES = {
+    "users": CACHED,
+    "blogs": ESTIMATED,
+    "products": ESTIMATED,
+    "newsletters": CACHED,
+    "testimonials": CACHED,
+}
+
+
+class TotalCounter:
+    """Counts the rows of listing queries with the strategy of their model"""
+
+    def __init__(self, cache_size: int, cache_ttl: float, estimate_threshold: int):
+        self.cache = LocalCache(maxsize=cache_size, ttl=cache_ttl)
+        self.metrics = CacheMetrics()
+        self.estimate_threshold = estimate_threshold
+
+    def count(self, db: Session, query, model) -> Tuple[int, bool]:
+        """Returns the total rows of a Query or Select and whether it is exact"""
+
+        strategy = TOTAL_STRATEGIES.get(model.__tablename__, EXACT)
+
+        if strategy == ESTIMATED:
+            estimate = self.estimate(db, query)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate, False
+
+        if strategy == CACHED:
+            key = self._key(db, query)
+            total = self.cache.get(key)
+            if total is not None:
+                self.metrics.record_hit()
+                return total, False
+            self.metrics.record_miss()
+            total = self._count(db, query)
+            self.cache.set(key, total)
+            return total, True
+
+        return self._count(db, query), True
+
+    def estimate(self, db: Session, query) -> Optional[int]:
+        """Returns the planner's row estimate of a query, or None when the
+        database is not Postgres
+        """
+
+        dialect = db.get_bind().dialect
+        if dialect.name != "postgresql":
+            return None
+
+        compiled = self._statement(query).compile(dialect=dialect)
+        parameters = compiled.params
+        if compiled.positiontup:
+            parameters = tuple(parameters[name] for name in compiled.positiontup)
+
+        plan = db.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", parameters
+        ).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        return {"size": self.cache.size(), **self.metrics.to_dict()}
+
+    @staticmethod
+    def _statement(query) -> Select:
+        return query if isinstance(query, Select) else query.statement
+
+    @staticmethod
+    def _count(db: Session, query) -> int:
+        if isinstance(query, Select):
+            return db.scalar(select(func.count()).select_from(query.subquery()))
+        return query.count()
+
+    def _key(self, db: Session, query) -> str:
+        compiled = self._statement(query).compile(dialect=db.get_bind().dialect)
+        return f"{compiled}|{sorted(compiled.params.items(), key=str)}"
+
+
+total_counter = TotalCounter(
+    cache_size=settings.PAGINATION_TOTAL_CACHE_SIZE,
+    cache_ttl=settings.PAGINATION_TOTAL_CACHE_TTL,
+    estimate_threshold=settings.PAGINATION_ESTIMATE_THRESHOLD,
+)
@@ -15,6 +15,7 @@ from api.v1.models.blog import Blog, BlogLike, BlogDislike
 from api.v1.models.job import Job, JobApplication
 from api.v1.models.testimonial import Testimonial
 from api.v1.models.token_login import TokenLogin
+from api.v1.models.revoked_token import RevokedToken
 from api.v1.models.oauth import OAuth
 from api.v1.models.invitation import Invitation
 from api.v1.models.faq import FAQ
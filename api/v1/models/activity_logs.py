@@ -1,13 +1,19 @@
 from sqlalchemy import Column, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from api.utils.filters import EQ, PREFIX, IN, RANGE
 from api.v1.models.base_model import BaseTableModel
 
 
 class ActivityLog(BaseTableModel):
     __tablename__ = "activity_logs"
+    __filterable__ = {
+        "user_id": (EQ, IN),
+        "action": (EQ, PREFIX),
+        "timestamp": RANGE,
+    }
 
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     action = Column(String, nullable=False)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
 
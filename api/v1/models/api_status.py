@@ -1,8 +1,14 @@
 from sqlalchemy import Column, DateTime, String, Text, Numeric, func
+from api.utils.filters import EQ, IN, RANGE
 from api.v1.models.base_model import BaseTableModel
 
 class APIStatus(BaseTableModel):
     __tablename__ = "api_status"
+    __filterable__ = {
+        "api_group": (EQ, IN),
+        "status": (EQ, IN),
+        "last_checked": RANGE,
+    }
 
     api_group = Column(String, nullable=False)
     status = Column(String, nullable=False)
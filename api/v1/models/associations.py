@@ -8,6 +8,7 @@ from sqlalchemy import (
         Enum
     )
 from api.db.database import Base
+from api.utils.filters import EQ, IN
 
 
 user_organisation_association = Table(
@@ -34,4 +35,12 @@ user_organisation_association = Table(
         nullable=False,
         default="member",
     ),
+    info={
+        "filterable": {
+            "user_id": (EQ,),
+            "organisation_id": (EQ,),
+            "role": (EQ, IN),
+            "status": (EQ, IN),
+        },
+    },
 )
@@ -3,11 +3,13 @@
 """
 from uuid_extensions import uuid7
 from fastapi import Depends
+from api.utils.filters import EQ, IN, RANGE, filter_indexes
 from api.v1.models.associations import Base
 from sqlalchemy import (
     Column,
     String,
     DateTime,
+    event,
     func
 )
 
@@ -15,6 +17,12 @@ class BaseTableModel(Base):
     """This model creates helper methods for all models"""
 
     __abstract__ = True
+    __filterable__ = {
+        "id": (EQ, IN),
+        "created_at": RANGE,
+        "updated_at": RANGE,
+    }
+    __projectable__ = ("id", "created_at", "updated_at")
 
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid7()))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -51,3 +59,10 @@ class BaseTableModel(Base):
         """
         obj = db.query(cls).filter_by(id=id).first()
         return obj
+
+
+@event.listens_for(BaseTableModel, "after_mapper_constructed", propagate=True)
+def _index_filterable_fields(mapper, cls):
+    """Indexes the `ieq` and `prefix` filters declared in `__filterable__`"""
+
+    filter_indexes(cls)
@@ -2,14 +2,22 @@
 from sqlalchemy import Column, String, ARRAY, ForeignKey, Numeric, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy import DateTime
+from api.utils.filters import EQ, IEQ, PREFIX, IN, RANGE
 from api.v1.models.base_model import BaseTableModel
 
 
 class BillingPlan(BaseTableModel):
     __tablename__ = "billing_plans"
+    __filterable__ = {
+        "organisation_id": (EQ,),
+        "name": (IEQ, PREFIX),
+        "price": (EQ, *RANGE),
+        "currency": (IEQ, IN),
+        "duration": (EQ, IN),
+    }
 
     organisation_id = Column(
-        String, ForeignKey("organisations.id", ondelete="CASCADE"), nullable=False
+        String, ForeignKey("organisations.id", ondelete="CASCADE"), nullable=False, index=True
     )
     name = Column(String, nullable=False)
     price = Column(Numeric, nullable=False)
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 """The Blog Post Model."""
 
-from sqlalchemy import Column, String, Text, ForeignKey, Boolean, text
+from sqlalchemy import (
+    Column, String, Text, ForeignKey, Boolean, Integer, UniqueConstraint, text
+)
 from sqlalchemy.orm import relationship
 from api.v1.models.base_model import BaseTableModel
 
 
 class Blog(BaseTableModel):
     __tablename__ = "blogs"
+    __projectable__ = (
+        "author_id",
+        "title",
+        "content",
+        "image_url",
+        "excerpt",
+        "tags",
+        "likes_count",
+        "dislikes_count",
+    )
 
     author_id = Column(
         String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -20,6 +32,9 @@ class Blog(BaseTableModel):
     tags = Column(
         Text, nullable=True
     )  # Assuming tags are stored as a comma-separated string
+    # kept by `api.v1.services.reaction_counts`
+    likes_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    dislikes_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
 
     author = relationship("User", back_populates="blogs")
     comments = relationship(
@@ -44,6 +59,10 @@ class BlogDislike(BaseTableModel):
     blog = relationship("Blog", back_populates="dislikes")
     user = relationship("User", back_populates="blog_dislikes")
 
+    __table_args__ = (
+        UniqueConstraint("blog_id", "user_id", name="uq_blog_dislike_blog_user"),
+    )
+
 
 class BlogLike(BaseTableModel):
     __tablename__ = "blog_likes"
@@ -54,3 +73,7 @@ class BlogLike(BaseTableModel):
 
     blog = relationship("Blog", back_populates="likes")
     user = relationship("User", back_populates="blog_likes")
+
+    __table_args__ = (
+        UniqueConstraint("blog_id", "user_id", name="uq_blog_like_blog_user"),
+    )
@@ -1,14 +1,22 @@
-from sqlalchemy import Column, String, Text, ForeignKey
+from sqlalchemy import Column, String, Text, ForeignKey, Integer, UniqueConstraint, text
 from sqlalchemy.orm import relationship
+from api.utils.filters import EQ
 from api.v1.models.base_model import BaseTableModel
 
 
 class Comment(BaseTableModel):
     __tablename__ = "comments"
+    __filterable__ = {
+        "user_id": (EQ,),
+        "blog_id": (EQ,),
+    }
 
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     blog_id = Column(String, ForeignKey("blogs.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
+    # kept by `api.v1.services.reaction_counts`
+    likes_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    dislikes_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
 
     user = relationship("User", back_populates="comments")
     blog = relationship("Blog", back_populates="comments")
@@ -22,6 +30,11 @@ class Comment(BaseTableModel):
 
 class CommentLike(BaseTableModel):
     __tablename__ = "comment_likes"
+    __filterable__ = {
+        "comment_id": (EQ,),
+        "user_id": (EQ,),
+        "ip_address": (EQ,),
+    }
 
     comment_id = Column(
         String, ForeignKey("comments.id", ondelete="CASCADE"), nullable=False
@@ -32,9 +45,18 @@ class CommentLike(BaseTableModel):
     comment = relationship("Comment", back_populates="likes")
     user = relationship("User", back_populates="comment_likes")
 
+    __table_args__ = (
+        UniqueConstraint("comment_id", "user_id", name="uq_comment_like_comment_user"),
+    )
+
 
 class CommentDislike(BaseTableModel):
     __tablename__ = "comment_dislikes"
+    __filterable__ = {
+        "comment_id": (EQ,),
+        "user_id": (EQ,),
+        "ip_address": (EQ,),
+    }
 
     comment_id = Column(
         String, ForeignKey("comments.id", ondelete="CASCADE"), nullable=False
@@ -44,3 +66,7 @@ class CommentDislike(BaseTableModel):
 
     comment = relationship("Comment", back_populates="dislikes")
     user = relationship("User", back_populates="comment_dislikes")
+
+    __table_args__ = (
+        UniqueConstraint("comment_id", "user_id", name="uq_comment_dislike_comment_user"),
+    )
@@ -1,11 +1,18 @@
 from sqlalchemy import Column, String, Text, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from api.utils.filters import EQ, IEQ, PREFIX
 from api.v1.models.base_model import BaseTableModel
 
 
 class ContactUs(BaseTableModel):
     __tablename__ = "contact_us"
+    __filterable__ = {
+        "email": (IEQ,),
+        "full_name": (PREFIX, IEQ),
+        "title": (PREFIX,),
+        "org_id": (EQ,),
+    }
 
     full_name = Column(String, nullable=False)
     email = Column(String, nullable=False)
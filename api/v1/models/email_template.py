@@ -1,9 +1,15 @@
 from sqlalchemy import Boolean, Column, Text, String, Enum
+from api.utils.filters import EQ, IEQ, PREFIX, IN
 from api.v1.models.base_model import BaseTableModel
 
 
 class EmailTemplate(BaseTableModel):
     __tablename__ = "email_templates"
+    __filterable__ = {
+        "title": (PREFIX, IEQ),
+        "type": (EQ, IN),
+        "template_status": (EQ, IN),
+    }
 
     title = Column(Text, nullable=False)
     template = Column(Text, nullable=False)
@@ -1,9 +1,16 @@
 from sqlalchemy import Column, String, Text
+from api.utils.filters import EQ, IEQ, PREFIX, IN, CONTAINS
 from api.v1.models.base_model import BaseTableModel
 
 
 class FAQ(BaseTableModel):
     __tablename__ = "faqs"
+    __filterable__ = {
+        # keyword search, faqs are few enough to scan
+        "question": (CONTAINS, PREFIX),
+        "answer": (CONTAINS,),
+        "category": (IEQ, EQ, IN),
+    }
 
     question = Column(String, nullable=False)
     answer = Column(Text, nullable=False)
@@ -1,9 +1,14 @@
 from sqlalchemy import Column, String, Text
+from api.utils.filters import IEQ, PREFIX
 from api.v1.models.base_model import BaseTableModel
 
 
 class FAQInquiries(BaseTableModel):
     __tablename__ = "faq_inquiries"
+    __filterable__ = {
+        "email": (IEQ,),
+        "full_name": (PREFIX, IEQ),
+    }
 
     email = Column(String, nullable=False)
     full_name = Column(String, nullable=False)
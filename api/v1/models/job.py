@@ -3,11 +3,30 @@
 """
 from sqlalchemy import Column, String, Text, ForeignKey, Enum
 from sqlalchemy.orm import relationship
+from api.utils.filters import EQ, IEQ, PREFIX, IN
 from api.v1.models.base_model import BaseTableModel
 
 
 class Job(BaseTableModel):
     __tablename__ = "jobs"
+    __filterable__ = {
+        "author_id": (EQ,),
+        "title": (PREFIX, IEQ),
+        "department": (IEQ, IN),
+        "location": (IEQ, PREFIX),
+        "job_type": (IEQ, IN),
+        "company_name": (IEQ, PREFIX),
+    }
+    __projectable__ = (
+        "author_id",
+        "title",
+        "description",
+        "department",
+        "location",
+        "salary",
+        "job_type",
+        "company_name",
+    )
 
     author_id = Column(
         String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -1,10 +1,14 @@
 from sqlalchemy import Column, String, Text, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from api.utils.filters import EQ, IEQ, PREFIX
 from api.v1.models.base_model import BaseTableModel
 
 
 class Newsletter(BaseTableModel):
     __tablename__ = "newsletters"
+    __filterable__ = {
+        "title": (PREFIX, IEQ),
+    }
 
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -17,6 +21,10 @@ class Newsletter(BaseTableModel):
 
 class NewsletterSubscriber(BaseTableModel):
     __tablename__ = "newsletter_subscribers"
+    __filterable__ = {
+        "email": (IEQ, EQ),
+        "newsletter_id": (EQ,),
+    }
 
     email: Mapped[str] = mapped_column(String(120), nullable=False)
     newsletter_id: Mapped[str] = mapped_column(
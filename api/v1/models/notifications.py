@@ -1,5 +1,6 @@
 from sqlalchemy import Column, String, Text, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
+from api.utils.filters import EQ
 from api.v1.models.base_model import BaseTableModel
 
 
@@ -16,6 +17,9 @@ class Notification(BaseTableModel):
 
 class NotificationSetting(BaseTableModel):
     __tablename__ = "notification_settings"
+    __filterable__ = {
+        "user_id": (EQ,),
+    }
 
     mobile_push_notifications = Column(Boolean, server_default='false')
     email_notification_activity_in_workspace = Column(Boolean, server_default='false')
@@ -4,11 +4,30 @@
 from sqlalchemy import Column, String
 from sqlalchemy.orm import relationship
 from api.v1.models.permissions.user_org_role import user_organisation_roles
+from api.utils.filters import EQ, IEQ, PREFIX, IN
 from api.v1.models.base_model import BaseTableModel
 
 
 class Organisation(BaseTableModel):
     __tablename__ = "organisations"
+    __filterable__ = {
+        "name": (PREFIX, IEQ),
+        "email": (IEQ, EQ),
+        "industry": (IEQ, IN),
+        "type": (IEQ, IN),
+        "country": (IEQ, IN),
+        "state": (IEQ,),
+    }
+    __projectable__ = (
+        "name",
+        "email",
+        "industry",
+        "type",
+        "description",
+        "country",
+        "state",
+        "address",
+    )
 
     name = Column(String, nullable=False, unique=False)
     email = Column(String, nullable=True, unique=True)
@@ -1,10 +1,19 @@
 from sqlalchemy import Column, String, ForeignKey, Numeric
 from sqlalchemy.orm import relationship
+from api.utils.filters import EQ, IEQ, IN, RANGE
 from api.v1.models.base_model import BaseTableModel
 
 
 class Payment(BaseTableModel):
     __tablename__ = "payments"
+    __filterable__ = {
+        "user_id": (EQ,),
+        "amount": (EQ, *RANGE),
+        "currency": (IEQ, IN),
+        "status": (EQ, IN),
+        "method": (EQ, IN),
+        "transaction_id": (EQ,),
+    }
 
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     amount = Column(Numeric, nullable=False)
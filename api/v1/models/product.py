@@ -13,6 +13,7 @@ from sqlalchemy import (
     DateTime,
     func,
 )
+from api.utils.filters import EQ, IEQ, PREFIX, IN, RANGE
 from api.v1.models.base_model import BaseTableModel
 from api.v1.models import User
 from sqlalchemy.orm import relationship
@@ -30,6 +31,28 @@ class ProductFilterStatusEnum(Enum):
 
 class Product(BaseTableModel):
     __tablename__ = "products"
+    __filterable__ = {
+        "name": (PREFIX, IEQ, EQ),
+        "org_id": (EQ,),
+        "category_id": (EQ, IN),
+        "price": (EQ, *RANGE),
+        "quantity": (EQ, *RANGE),
+        "status": (EQ, IN),
+        "archived": (EQ,),
+        "filter_status": (EQ, IN),
+    }
+    __projectable__ = (
+        "name",
+        "description",
+        "price",
+        "org_id",
+        "category_id",
+        "quantity",
+        "image_url",
+        "status",
+        "archived",
+        "filter_status",
+    )
 
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
@@ -76,6 +99,9 @@ class ProductVariant(BaseTableModel):
 
 class ProductCategory(BaseTableModel):
     __tablename__ = "product_categories"
+    __filterable__ = {
+        "name": (IEQ, PREFIX, EQ),
+    }
 
     name = Column(String, nullable=False, unique=True)
     products = relationship("Product", back_populates="category")
@@ -86,8 +112,12 @@ class ProductCategory(BaseTableModel):
 
 class ProductComment(BaseTableModel):
     __tablename__ = "product_comments"
+    __filterable__ = {
+        "product_id": (EQ,),
+        "user_id": (EQ,),
+    }
 
-    product_id = Column(String, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(String, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(String, ForeignKey("users.id", ondelete="SET NULL"), nullable=True) 
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
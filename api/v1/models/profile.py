@@ -3,11 +3,18 @@
 
 from sqlalchemy import Column, String, Text, ForeignKey, DateTime, func
 from sqlalchemy.orm import relationship
+from api.utils.filters import EQ, IEQ, PREFIX, IN
 from api.v1.models.base_model import BaseTableModel
 
 
 class Profile(BaseTableModel):
     __tablename__ = "profiles"
+    __filterable__ = {
+        "user_id": (EQ,),
+        "username": (IEQ, PREFIX),
+        "job_title": (PREFIX, IEQ),
+        "department": (IEQ, IN),
+    }
 
     user_id = Column(
         String, ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False
@@ -39,6 +46,7 @@ class Profile(BaseTableModel):
             "phone_number": self.phone_number,
             "avatar_url": self.avatar_url,
             "recovery_email": self.recovery_email,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            # None for the unsaved default profile of `fetch_or_default`
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
@@ -1,9 +1,16 @@
 from sqlalchemy import Column, String, ForeignKey, Integer
 from sqlalchemy.orm import relationship
+from api.utils.filters import EQ, IEQ, IN
 from api.v1.models.base_model import BaseTableModel
 
 class Region(BaseTableModel):
     __tablename__ = "regions"
+    __filterable__ = {
+        "user_id": (EQ,),
+        "region": (IEQ, IN),
+        "language": (IEQ, IN),
+        "timezone": (EQ, IN),
+    }
 
     user_id = Column(String, ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
     region = Column(String, nullable=False)
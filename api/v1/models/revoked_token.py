@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime
+from api.v1.models.base_model import BaseTableModel
+
+
+class RevokedToken(BaseTableModel):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, unique=True, index=True, nullable=False)
+    user_id = Column(String, nullable=True)
+    expires_at = Column(DateTime(timezone=True), index=True, nullable=False)
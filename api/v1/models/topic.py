@@ -1,10 +1,15 @@
 from sqlalchemy import Column, String, ForeignKey, Text, Float, ARRAY
 from sqlalchemy.orm import relationship
+from api.utils.filters import CONTAINS, IEQ, PREFIX
 from api.v1.models.base_model import BaseTableModel
 
 
 class Topic(BaseTableModel):
     __tablename__ = 'topics'
+    __filterable__ = {
+        "title": (PREFIX, IEQ, CONTAINS),
+        "content": (CONTAINS,),
+    }
 
     title = Column(String, nullable=False)
     content = Column(String, nullable=False)
@@ -10,6 +10,16 @@ from api.v1.models.base_model import BaseTableModel
 
 class User(BaseTableModel):
     __tablename__ = "users"
+    __projectable__ = (
+        "email",
+        "first_name",
+        "last_name",
+        "avatar_url",
+        "is_active",
+        "is_superadmin",
+        "is_deleted",
+        "is_verified",
+    )
 
     email = Column(String, unique=True, nullable=False)
     password = Column(String, nullable=True)
@@ -1,10 +1,16 @@
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.sql import func
+from api.utils.filters import EQ, IEQ, PREFIX, RANGE
 from api.v1.models.base_model import BaseTableModel
 
 
 class Waitlist(BaseTableModel):
     __tablename__ = "waitlist"
+    __filterable__ = {
+        "email": (IEQ, EQ),
+        "full_name": (PREFIX, IEQ),
+        "joined_at": RANGE,
+    }
 
     email = Column(String, nullable=False)
     full_name = Column(String, nullable=False)
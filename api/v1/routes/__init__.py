@@ -46,6 +46,7 @@ from api.v1.routes.privacy import privacies
 from api.v1.routes.settings import settings
 from api.v1.routes.terms_and_conditions import terms_and_conditions
 from api.v1.routes.stripe import subscription_
+from api.v1.routes.database import database
 
 api_version_one = APIRouter(prefix="/api/v1")
 
@@ -96,3 +97,4 @@ api_version_one.include_router(team)
 api_version_one.include_router(terms_and_conditions)
 api_version_one.include_router(product_comment)
 api_version_one.include_router(subscription_)
+api_version_one.include_router(database)
@@ -6,6 +6,7 @@ from api.v1.schemas.activity_logs import ActivityLogCreate, ActivityLogResponse
 from api.v1.services.activity_logs import activity_log_service
 from api.v1.services.user import user_service
 from api.db.database import get_db
+from api.utils.streaming import StreamQuery, streaming_response
 from api.utils.success_response import success_response
 
 activity_logs = APIRouter(prefix="/activity-logs", tags=["Activity Logs"])
@@ -31,9 +32,20 @@ async def create_activity_log(
 
 
 @activity_logs.get("", response_model=list[ActivityLogResponse])
-async def get_all_activity_logs(current_user: User = Depends(user_service.get_current_super_admin), db: Session = Depends(get_db)):
+async def get_all_activity_logs(
+    current_user: User = Depends(user_service.get_current_super_admin),
+    db: Session = Depends(get_db),
+    stream: StreamQuery = None,
+):
     '''Get all activity logs'''
 
+    if stream:
+        return streaming_response(
+            activity_log_service.stream_all(db=db),
+            stream,
+            message="Activity logs retrieved successfully",
+        )
+
     activity_logs = activity_log_service.fetch_all(db=db)
 
     return success_response(
@@ -46,7 +58,8 @@ async def get_all_activity_logs(current_user: User = Depends(user_service.get_cu
 async def fetch_all_users_activity_log(
     user_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(user_service.get_current_super_admin)
+    current_user: User = Depends(user_service.get_current_super_admin),
+    stream: StreamQuery = None,
 ):
     """
     Get endpoint for admin users get a users activity logs.
@@ -55,11 +68,18 @@ async def fetch_all_users_activity_log(
         user_id (str): the id of user
         current_user: the admin user
         db: the database session object
+        stream: streams the logs as ndjson or a json array when set
 
     Returns:
         Response: a response object containing details if successful or appropriate errors if not
     """
 
+    if stream:
+        return streaming_response(
+            activity_log_service.stream_all(db=db, user_id=user_id),
+            stream,
+            message="Activity logs fetched successfully!",
+        )
 
     activity_logs = activity_log_service.fetch_all(
         db=db,
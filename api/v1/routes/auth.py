@@ -1,15 +1,15 @@
 from datetime import timedelta
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from fastapi import (BackgroundTasks, Depends,
                      status, APIRouter,
                      Response, Request)
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Annotated
 
 from api.core.dependencies.email_sender import send_email
+from api.utils.rate_limit import limiter
 from api.utils.success_response import auth_response, success_response
 from api.utils.send_mail import send_magic_link
 from api.v1.models import User
@@ -22,47 +22,36 @@ from api.v1.schemas.user import (UserCreate,
                                  ChangePasswordSchema,
                                  AuthMeResponse)
 from api.v1.services.organisation import organisation_service
-from api.v1.schemas.organisation import CreateUpdateOrganisation
-from api.db.database import get_db
-from api.v1.services.user import user_service
+from api.db.database import get_db, get_async_db
+from api.v1.services.user import oauth2_scheme, user_service
 from api.v1.services.auth import AuthService
 from api.v1.services.profile import profile_service
 
 auth = APIRouter(prefix="/auth", tags=["Authentication"])
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
   
 @auth.post("/register", status_code=status.HTTP_201_CREATED, response_model=auth_response)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 def register(request: Request, background_tasks: BackgroundTasks, response: Response, user_schema: UserCreate, db: Session = Depends(get_db)):
     '''Endpoint for a user to register their account'''
 
-    # Create user account
-    user = user_service.create(db=db, schema=user_schema)
-
-    # create an organization for the user
-    org = CreateUpdateOrganisation(
-        name=f"{user.email}'s Organisation",
-        email=user.email
-    )
-    organisation_service.create(db=db, schema=org, user=user)
-    user_organizations = organisation_service.retrieve_user_organizations(user, db)
+    # Create user account and an organisation for the user
+    user, user_organizations = user_service.register(db=db, schema=user_schema)
 
     # Create access and refresh tokens
-    access_token = user_service.create_access_token(user_id=user.id)
-    refresh_token = user_service.create_refresh_token(user_id=user.id)
+    access_token = user_service.create_access_token(user_id=user['id'])
+    refresh_token = user_service.create_refresh_token(user_id=user['id'])
     cta_link = 'https://anchor-python.teams.hng.tech/about-us'
 
     # Send email in the background
     background_tasks.add_task(
         send_email, 
-        recipient=user.email,
+        recipient=user['email'],
         template_name='welcome.html',
         subject='Welcome to HNG Boilerplate',
         context={
-            'first_name': user.first_name,
-            'last_name': user.last_name,
+            'first_name': user['first_name'],
+            'last_name': user['last_name'],
             'cta_link': cta_link
         }
     )
@@ -72,10 +61,7 @@ def register(request: Request, background_tasks: BackgroundTasks, response: Resp
         message='User created successfully',
         access_token=access_token,
         data={
-            'user': jsonable_encoder(
-                user,
-                exclude=['password', 'is_deleted', 'is_verified', 'updated_at']
-            ),
+            'user': user,
             'organisations': user_organizations
         }
     )
@@ -94,32 +80,22 @@ def register(request: Request, background_tasks: BackgroundTasks, response: Resp
 
 
 @auth.post(path="/register-super-admin", status_code=status.HTTP_201_CREATED, response_model=auth_response)
-@limiter.limit("1000/minute")  # Limit to 5 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 def register_as_super_admin(request: Request, user: UserCreate, db: Session = Depends(get_db)):
     """Endpoint for super admin creation"""
 
-    user = user_service.create_admin(db=db, schema=user)
-    # create an organization for the user
-    org = CreateUpdateOrganisation(
-        name=f"{user.email}'s Organisation",
-        email=user.email
-    )
-    organisation_service.create(db=db, schema=org, user=user)
-    user_organizations = organisation_service.retrieve_user_organizations(user, db)
+    user, user_organizations = user_service.register(db=db, schema=user, is_superadmin=True)
 
     # Create access and refresh tokens
-    access_token = user_service.create_access_token(user_id=user.id)
-    refresh_token = user_service.create_refresh_token(user_id=user.id)
+    access_token = user_service.create_access_token(user_id=user['id'])
+    refresh_token = user_service.create_refresh_token(user_id=user['id'])
 
     response = auth_response(
         status_code=201,
         message='User created successfully',
         access_token=access_token,
         data={
-            'user': jsonable_encoder(
-                user,
-                exclude=['password', 'is_deleted', 'is_verified', 'updated_at']
-            ),
+            'user': user,
             'organisations': user_organizations
         }
     )
@@ -138,15 +114,19 @@ def register_as_super_admin(request: Request, user: UserCreate, db: Session = De
 
 
 @auth.post("/login", status_code=status.HTTP_200_OK, response_model=auth_response)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
-def login(request: Request, login_request: LoginRequest, db: Session = Depends(get_db)):
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
+async def login(
+    request: Request, login_request: LoginRequest, db: AsyncSession = Depends(get_async_db)
+):
     """Endpoint to log in a user"""
 
-    # Authenticate the user
-    user = user_service.authenticate_user(
+    # Authenticate the user, waiting for the password check without holding a thread
+    user = await user_service.authenticate_user_async(
         db=db, email=login_request.email, password=login_request.password
     )
-    user_organizations = organisation_service.retrieve_user_organizations(user, db)
+    user_organizations = await db.run_sync(
+        lambda session: organisation_service.retrieve_user_organizations(user, session)
+    )
 
     # Generate access and refresh tokens
     access_token = user_service.create_access_token(user_id=user.id)
@@ -179,15 +159,19 @@ def login(request: Request, login_request: LoginRequest, db: Session = Depends(g
 
 
 @auth.post("/logout", status_code=status.HTTP_200_OK)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 def logout(
     request: Request, 
     response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(user_service.get_current_user),
+    access_token: str = Depends(oauth2_scheme),
 ):
     """Endpoint to log a user out of their account"""
 
+    # Stop both tokens from being used again before they expire
+    user_service.revoke_tokens(db, access_token, request.cookies.get("refresh_token"))
+
     response = success_response(status_code=200, message="User logged put successfully")
 
     # Delete refresh token from cookies
@@ -197,7 +181,7 @@ def logout(
 
 
 @auth.post("/refresh-access-token", status_code=status.HTTP_200_OK)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 def refresh_access_token(
     request: Request, response: Response, db: Session = Depends(get_db)
 ):
@@ -231,7 +215,7 @@ def refresh_access_token(
 
 
 @auth.post("/request-token", status_code=status.HTTP_200_OK)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 async def request_signin_token(request: Request, background_tasks: BackgroundTasks,
     email_schema: EmailRequest, db: Session = Depends(get_db)
 ):
@@ -265,7 +249,7 @@ async def request_signin_token(request: Request, background_tasks: BackgroundTas
 
 
 @auth.post("/verify-token", status_code=status.HTTP_200_OK, response_model=auth_response)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 async def verify_signin_token(
     request: Request, 
     token_schema: TokenRequest, db: Session = Depends(get_db)
@@ -308,7 +292,7 @@ async def verify_signin_token(
 
 # TODO: Fix magic link authentication
 @auth.post("/magic-link", status_code=status.HTTP_200_OK)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 def request_magic_link(
     request: Request, 
     requests: MagicLinkRequest, background_tasks: BackgroundTasks,
@@ -335,7 +319,7 @@ def request_magic_link(
 
 
 @auth.post("/magic-link/verify")
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 async def verify_magic_link(request: Request, token_schema: Token, db: Session = Depends(get_db)):
     user, access_token = AuthService.verify_magic_token(token_schema.token, db)
     user_organizations = organisation_service.retrieve_user_organizations(user, db)
@@ -369,7 +353,7 @@ async def verify_magic_link(request: Request, token_schema: Token, db: Session =
 
 
 @auth.put("/password", status_code=200)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 async def change_password(
     request: Request, 
     schema: ChangePasswordSchema,
@@ -377,10 +361,10 @@ async def change_password(
     user: User = Depends(user_service.get_current_user),
 ):
     """Endpoint to change the user's password"""
-    user_service.change_password(new_password=schema.new_password,
-                                 user=user,
-                                 db=db,
-                                 old_password=schema.old_password)
+    await user_service.change_password_async(new_password=schema.new_password,
+                                             user=user,
+                                             db=db,
+                                             old_password=schema.old_password)
 
     return success_response(status_code=200, message="Password changed successfully")
 
@@ -388,7 +372,7 @@ async def change_password(
 @auth.get("/@me",
           status_code=status.HTTP_200_OK,
           response_model=AuthMeResponse)
-@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per IP
+@limiter.limit("1000/minute")  # Limit to 1000 requests per minute per user or IP
 def get_current_user_details(
     request: Request, 
     db: Annotated[Session, Depends(get_db)],
@@ -5,7 +5,9 @@ from fastapi import (
 )
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
+from api.utils.conditional import ConditionalGet
 from api.utils.success_response import success_response
+from api.v1.models.billing_plan import BillingPlan
 from api.v1.models.user import User
 from api.v1.services.billing_plan import billing_plan_service
 from api.db.database import get_db
@@ -20,7 +22,9 @@ bill_plan = APIRouter(prefix="/organisations", tags=["Billing-Plan"])
 
 @bill_plan.get("/{organisation_id}/billing-plans", response_model=GetBillingPlanListResponse)
 async def retrieve_all_billing_plans(
-    organisation_id: str, db: Session = Depends(get_db)
+    organisation_id: str,
+    db: Session = Depends(get_db),
+    _: None = Depends(ConditionalGet(BillingPlan, policy="billing_plans")),
 ):
     """
     Endpoint to get all billing plans
@@ -98,7 +102,10 @@ async def delete_a_billing_plan(
 async def retrieve_single_billing_plans(
     billing_plan_id: str,
     db: Session = Depends(get_db),
-    _: User = Depends(user_service.get_current_user)
+    _: User = Depends(user_service.get_current_user),
+    __: None = Depends(ConditionalGet(
+        BillingPlan, by="billing_plan_id", policy="billing_plans", cache_control="private, no-cache"
+    )),
 ):
     """
     Endpoint to get single billing plan by id
@@ -6,11 +6,13 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from typing import Annotated
 
-from api.db.database import get_db
-from api.utils.pagination import paginated_response
+from api.db.database import get_db, get_read_db
+from api.utils.conditional import ConditionalGet
+from api.utils.fieldsets import FieldsQuery, parse_fields
+from api.utils.pagination import CursorQuery, IncludeTotalQuery, paginated_response
 from api.utils.success_response import success_response
 from api.v1.models.user import User
-from api.v1.models.blog import Blog
+from api.v1.models.blog import Blog, BlogDislike, BlogLike
 from api.v1.schemas.blog import (
     BlogCreate,
     BlogPostResponse,
@@ -49,7 +51,15 @@ def create_blog(
 
 
 @blog.get("/", response_model=success_response)
-def get_all_blogs(db: Session = Depends(get_db), limit: int = 10, skip: int = 0):
+def get_all_blogs(
+    db: Session = Depends(get_read_db),
+    limit: int = 10,
+    skip: int = 0,
+    cursor: CursorQuery = None,
+    include_total: IncludeTotalQuery = True,
+    fields: FieldsQuery = None,
+    _: None = Depends(ConditionalGet(Blog, BlogLike, BlogDislike, policy="blogs")),
+):
     """Endpoint to get all blogs"""
 
     return paginated_response(
@@ -57,11 +67,18 @@ def get_all_blogs(db: Session = Depends(get_db), limit: int = 10, skip: int = 0)
         model=Blog,
         limit=limit,
         skip=skip,
+        cursor=cursor,
+        include_total=include_total,
+        fields=parse_fields(Blog, fields),
     )
 
 
 @blog.get("/{id}", response_model=BlogPostResponse)
-def get_blog_by_id(id: str, db: Session = Depends(get_db)):
+def get_blog_by_id(
+    id: str,
+    db: Session = Depends(get_read_db),
+    _: None = Depends(ConditionalGet(Blog, BlogLike, BlogDislike, by="id", policy="blogs")),
+):
     """
     Retrieve a blog post by its Id.
 
@@ -130,28 +147,18 @@ def like_blog_post(
         BlogLike obj and the `"objects_count"` represents the number 
         of BlogLike for the blog post
     """
-    blog_service = BlogService(db)
-
-    # get blog post
-    blog_p = blog_service.fetch(blog_id)
-
-    # confirm current user has NOT liked before
-    blog_service.check_user_already_liked_blog(blog_p, current_user)
-
-    # check for BlogDislike by current user and delete it
-    blog_service.delete_opposite_blog_like_or_dislike(blog_p, current_user, "like")
-
-    # update likes
-    new_like = blog_service.create_blog_like(
-        db, blog_p.id, current_user.id, ip_address=get_ip_address(request))
+    # record the like, removing a dislike by the current user
+    result = BlogService(db).react(
+        blog_id, current_user.id, BlogLike, ip_address=get_ip_address(request)
+    )
 
     # Return success response
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Like recorded successfully.",
         data={
-            'object': new_like.to_dict(), 
-            'objects_count': blog_service.num_of_likes(blog_id)
+            'object': result.created,
+            'objects_count': result.likes
         },
     )
 
@@ -176,28 +183,18 @@ def dislike_blog_post(
         BlogDislike obj and the `"objects_count"` represents the number 
         of BlogDislike for the blog post
     """
-    blog_service = BlogService(db)
-
-    # get blog post
-    blog_p = blog_service.fetch(blog_id)
-
-    # confirm current user has NOT disliked before
-    blog_service.check_user_already_disliked_blog(blog_p, current_user)
-
-    # check for BlogLike by current user and delete it
-    blog_service.delete_opposite_blog_like_or_dislike(blog_p, current_user, "dislike")
-
-    # update disikes
-    new_dislike = blog_service.create_blog_dislike(
-        db, blog_p.id, current_user.id, ip_address=get_ip_address(request))
+    # record the dislike, removing a like by the current user
+    result = BlogService(db).react(
+        blog_id, current_user.id, BlogDislike, ip_address=get_ip_address(request)
+    )
 
     # Return success response
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Dislike recorded successfully.",
         data={
-            'object': new_dislike.to_dict(), 
-            'objects_count': blog_service.num_of_dislikes(blog_id)
+            'object': result.created,
+            'objects_count': result.dislikes
         },
     )
 
@@ -4,6 +4,7 @@ from api.db.database import get_db
 from api.utils.send_mail import send_contact_mail
 from typing import Annotated
 from api.core.responses import SUCCESS
+from api.utils.serializers import serializers
 from api.utils.success_response import success_response
 from api.v1.services.contact_us import contact_us_service
 from api.v1.schemas.contact_us import CreateContactUs
@@ -69,13 +70,12 @@ def retrieve_contact_us(
     """
 
     all_submissions = contact_us_service.fetch_all(db)
-    submissions_filtered = list(
-        map(lambda x: ContactUsResponseSchema.model_validate(x), all_submissions)
-    )
-    if len(submissions_filtered) == 0:
-        submissions_filtered = [{}]
+    if all_submissions:
+        return serializers.success_response(
+            ContactUsResponseSchema, all_submissions, message="Submissions retrieved successfully"
+        )
     return success_response(
         message="Submissions retrieved successfully",
         status_code=200,
-        data=jsonable_encoder(submissions_filtered),
+        data=[{}],
     )
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, status
-from api.db.database import get_db
+from api.db.database import get_read_db
 from sqlalchemy.orm import Session
 
 from api.v1.models.user import User
 from api.v1.services.user import user_service
 from api.v1.services.product import product_service
+from api.utils.streaming import StreamQuery, streaming_response
 from api.utils.success_response import success_response
 from api.v1.schemas.dashboard import (
     DashboardProductCountResponse,
@@ -14,7 +15,7 @@ from api.v1.schemas.dashboard import (
 from typing import Annotated
 from fastapi.security import OAuth2
 from datetime import datetime, timedelta
-from api.v1.services.user import oauth2_scheme
+from api.v1.services.user import AuthContext
 from api.v1.services.analytics import analytics_service, AnalyticsServices
 
 
@@ -31,38 +32,46 @@ def get_current_month_date_range():
 
 @dashboard.get("/products/count", response_model=DashboardProductCountResponse)
 async def get_products_count(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(user_service.get_current_super_admin)
 ):
-    products = product_service.fetch_all(db)
-
     return success_response(
         status_code=200,
         message="Products count fetched successfully",
-        data={"count": len(products)}
+        data={"count": product_service.count(db)}
     )
 
 
+def _dashboard_product(prod) -> dict:
+    return {
+        "name": prod.name,
+        "description": prod.description,
+        "price": str(prod.price),
+        "category": prod.category.name,
+        "quantity": prod.quantity,
+        "image_url": prod.image_url,
+        "archived": prod.archived,
+        "created_at": prod.created_at.isoformat(),
+    }
+
+
 @dashboard.get("/products", response_model=DashboardProductListResponse)
 async def get_products(
     current_user: User = Depends(user_service.get_current_super_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db),
+    stream: StreamQuery = None,
 ):
+    if stream:
+        return streaming_response(
+            product_service.stream_all(db),
+            stream,
+            message="Products fetched successfully",
+            encode=_dashboard_product,
+        )
+
     products = product_service.fetch_all(db)
 
-    payment_data = [
-        {
-            "name": prod.name,
-            "description": prod.description,
-            "price": str(prod.price),
-            "category": prod.category.name,
-            "quantity": prod.quantity,
-            "image_url": prod.image_url,
-            "archived": prod.archived,
-            "created_at": prod.created_at.isoformat(),
-        }
-        for prod in products
-    ]
+    payment_data = [_dashboard_product(prod) for prod in products]
 
     return success_response(
         status_code=200,
@@ -75,7 +84,7 @@ async def get_products(
 async def get_product(
     product_id: str,
     current_user: User = Depends(user_service.get_current_super_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     prod = product_service.fetch(db, product_id)
 
@@ -97,8 +106,8 @@ async def get_product(
 
 @dashboard.get('/statistics', status_code=status.HTTP_200_OK)
 async def get_analytics_summary(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: Annotated[Session, Depends(get_db)],
+    auth: Annotated[AuthContext, Depends(user_service.get_auth_context)],
+    db: Annotated[Session, Depends(get_read_db)],
     analytics_service: Annotated[AnalyticsServices, Depends()],
     start_date: datetime = None,
     end_date: datetime = None
@@ -106,7 +115,7 @@ async def get_analytics_summary(
     """
     Retrieves analytics summary data for an organisation or super admin.
     Args:
-        token: access_token
+        auth: auth context of the current user
         db: database Session object
         start_date: start date for filtering
         end_date: end date for filtering
@@ -115,4 +124,4 @@ async def get_analytics_summary(
     """
     if not start_date or not end_date:
         start_date, end_date = get_current_month_date_range()
-    return analytics_service.get_analytics_summary(token=token, db=db, start_date=start_date, end_date=end_date)
+    return analytics_service.get_analytics_summary(auth=auth, db=db, start_date=start_date, end_date=end_date)
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, status
+
+from api.db.database import engine, async_engine
+from api.db.pool import pool_status
+from api.db.slow_queries import slow_query_recorder
+from api.utils.jwt_cache import token_claims
+from api.utils.success_response import success_response
+from api.utils.totals import total_counter
+from api.v1.models.user import User
+from api.v1.services.principal_cache import principal_cache
+from api.v1.services.service_cache import service_cache
+from api.v1.services.user import user_service
+
+database = APIRouter(prefix="/database", tags=["Database"])
+
+
+@database.get("/pool", status_code=status.HTTP_200_OK)
+def get_connection_pool_status(
+    current_user: User = Depends(user_service.get_current_super_admin),
+):
+    """Endpoint to get the connection pool status. Only accessible to superadmin"""
+
+    pools = {"primary": pool_status(engine.pool)}
+
+    if async_engine is not None:
+        pools["async"] = pool_status(async_engine.pool)
+
+    return success_response(
+        status_code=200,
+        message="Connection pool status fetched successfully",
+        data=pools,
+    )
+
+
+@database.get("/slow-queries", status_code=status.HTTP_200_OK)
+def get_slow_queries(
+    current_user: User = Depends(user_service.get_current_super_admin),
+):
+    """Endpoint to get the most recent slow queries and their captured query plans.
+    Only accessible to superadmin
+    """
+
+    return success_response(
+        status_code=200,
+        message="Slow queries fetched successfully",
+        data=slow_query_recorder.snapshot(),
+    )
+
+
+@database.get("/caches", status_code=status.HTTP_200_OK)
+def get_cache_stats(
+    current_user: User = Depends(user_service.get_current_super_admin),
+):
+    """Endpoint to get the hit and miss counts of the application caches.
+    Only accessible to superadmin
+    """
+
+    return success_response(
+        status_code=200,
+        message="Cache statistics fetched successfully",
+        data={
+            "principals": principal_cache.stats(),
+            "services": service_cache.stats(),
+            "tokens": token_claims.stats(),
+            "totals": total_counter.stats(),
+        },
+    )
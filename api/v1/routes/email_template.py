@@ -3,7 +3,7 @@ from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from api.db.database import get_db
-from api.utils.pagination import paginated_response
+from api.utils.pagination import CursorQuery, IncludeTotalQuery, paginated_response
 from api.utils.success_response import success_response
 from api.v1.models.email_template import EmailTemplate
 from api.v1.models.user import User
@@ -19,6 +19,8 @@ async def get_all_email_templates(
     db: Session = Depends(get_db),
     limit: int = 10,
     skip: int = 0,
+    cursor: CursorQuery = None,
+    include_total: IncludeTotalQuery = True,
     current_user: User = Depends(user_service.get_current_super_admin)
 ):
     """Endpoint to get all email templates"""
@@ -28,6 +30,8 @@ async def get_all_email_templates(
         model=EmailTemplate,
         limit=limit,
         skip=skip,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
@@ -4,7 +4,9 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from api.db.database import get_db
+from api.utils.conditional import ConditionalGet
 from api.utils.pagination import paginated_response
+from api.utils.streaming import StreamQuery, streaming_response
 from api.utils.success_response import success_response
 from api.v1.models.faq import FAQ
 from api.v1.models.user import User
@@ -18,15 +20,27 @@ faq = APIRouter(prefix="/faqs", tags=["Frequently Asked Questions"])
 @faq.get("", response_model=success_response, status_code=200)
 async def get_all_faqs(
     db: Session = Depends(get_db),
-    keyword: Optional[str] = Query(None, min_length=1)
+    keyword: Optional[str] = Query(None, min_length=1),
+    stream: StreamQuery = None,
+    _: None = Depends(ConditionalGet(FAQ, policy="faqs")),
 ):
-    """Endpoint to get all FAQs or search by keyword in both question and answer"""
+    """Endpoint to get all FAQs or search by keyword in both question and answer.
+    Streamed FAQs are ordered by category instead of grouped
+    """
 
     query_params = {}
     if keyword:
         query_params["question"] = keyword
         query_params["answer"] = keyword
 
+    if stream:
+        return streaming_response(
+            faq_service.stream_all_by_category(db=db, **query_params),
+            stream,
+            message="FAQs retrieved successfully",
+            encode=lambda faq: faq._asdict(),
+        )
+
     grouped_faqs = faq_service.fetch_all_grouped_by_category(
         db=db, **query_params)
 
@@ -15,6 +15,7 @@ from api.v1.models.user import User
 from api.v1.models.job import Job, JobApplication
 from api.v1.services.jobs import job_service
 from api.v1.services.job_application import job_application_service, UpdateJobApplication
+from api.utils.fieldsets import FieldsQuery, parse_fields, project
 from api.utils.pagination import paginated_response
 from api.utils.db_validators import check_model_existence
 import uuid
@@ -86,6 +87,7 @@ async def get_job(
 @jobs.get("")
 async def fetch_all_jobs(
     db: Session = Depends(get_db),
+    fields: FieldsQuery = None,
 ):
     """
         Description
@@ -93,14 +95,16 @@ async def fetch_all_jobs(
 
         Args:
                 db: the database session object
+                fields: comma separated job fields to return, all when missing
 
         Returns:
                 Response: a response object containing details if successful or appropriate errors if not
     """
-    jobs = job_service.fetch_all(db)
+    fields = parse_fields(Job, fields)
+    jobs = job_service.fetch_all(db, fields=fields)
     return success_response(
        status_code=status.HTTP_200_OK,
-       data=jsonable_encoder(jobs),
+       data=jsonable_encoder(project(jobs, fields)),
        message="Jobs Successfully Fetched!"
     )
 
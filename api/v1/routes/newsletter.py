@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, status, Query, BackgroundTasks
 from typing import Annotated
 from sqlalchemy.orm import Session
+from api.utils.serializers import serializers
+from api.utils.streaming import StreamQuery, streaming_response
 from api.utils.success_response import success_response
 from api.v1.schemas.newsletter import (
     EmailSchema,
@@ -17,7 +19,7 @@ from api.core.dependencies.email_sender import send_email
 
 newsletter = APIRouter(prefix="/newsletters", tags=["Newsletter"])
 news_sub = APIRouter(prefix="/newsletter-subscription", tags=["Newsletter"])
-from api.utils.pagination import paginated_response
+from api.utils.pagination import CursorQuery, IncludeTotalQuery, paginated_response
 
 
 @news_sub.post("")
@@ -65,23 +67,30 @@ async def sub_newsletter(
 def retrieve_subscribers(
     db: Session = Depends(get_db),
     admin: User = Depends(user_service.get_current_super_admin),
+    stream: StreamQuery = None,
 ):
     """
     Retrieve all newsletter subscription from database
     """
 
-    subscriptions = NewsletterService.fetch_all(db)
-    subs_filtered = list(
-        map(lambda x: EmailRetrieveSchema.model_validate(x), subscriptions)
-    )
+    if stream:
+        return streaming_response(
+            NewsletterService.stream_all(db),
+            stream,
+            message="Subscriptions retrieved successfully",
+            encode=lambda x: EmailRetrieveSchema.model_validate(x).model_dump(),
+        )
 
-    if len(subs_filtered) == 0:
-        subs_filtered = [{}]
+    subscriptions = NewsletterService.fetch_all(db)
+    if subscriptions:
+        return serializers.success_response(
+            EmailRetrieveSchema, subscriptions, message="Subscriptions retrieved successfully"
+        )
 
     return success_response(
         message="Subscriptions retrieved successfully",
         status_code=200,
-        data=jsonable_encoder(subs_filtered),
+        data=[{}],
     )
 
 
@@ -136,12 +145,21 @@ def get_all_newsletters(
         int, Query(ge=1, description="Number of products per page")
     ] = 10,
     page: Annotated[int, Query(ge=1, description="Page number (starts from 1)")] = 0,
+    cursor: CursorQuery = None,
+    include_total: IncludeTotalQuery = True,
 ):
     """
     Retrieving all newsletters
     """
 
-    return paginated_response(db=db, skip=page, limit=page_size, model=Newsletter)
+    return paginated_response(
+        db=db,
+        skip=page,
+        limit=page_size,
+        model=Newsletter,
+        cursor=cursor,
+        include_total=include_total,
+    )
 
 
 @newsletter.post("/unsubscribe")
@@ -1,5 +1,7 @@
 from fastapi import Depends, status, APIRouter, Path, HTTPException
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
+from api.utils.streaming import StreamQuery, streaming_response
 from api.utils.success_response import success_response
 from api.v1.models import User
 from typing import Annotated
@@ -86,7 +88,16 @@ def get_notification_by_id(
 )
 def get_all_notifications(
     db: Session = Depends(get_db),
+    stream: StreamQuery = None,
 ):
+    if stream:
+        return streaming_response(
+            notification_service.stream_all_notifications(db=db),
+            stream,
+            message="All notifications fetched successfully",
+            encode=lambda notification: jsonable_encoder(notification.to_dict()),
+        )
+
     notifications = notification_service.fetch_all_notifications(db=db)
     return success_response(
         status_code=200,
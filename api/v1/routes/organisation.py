@@ -1,9 +1,14 @@
 import time
-from fastapi import Depends, APIRouter, status, HTTPException
+from fastapi import Depends, APIRouter, Request, status, HTTPException
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from api.utils.fieldsets import FieldsQuery, parse_fields, project
+from api.utils.pagination import CursorQuery, IncludeTotalQuery
+from api.utils.rate_limit import limiter, organisation_key
+from api.utils.settings import settings
 from api.utils.success_response import success_response
+from api.v1.models.organisation import Organisation
 from api.v1.models.user import User
 from api.v1.schemas.organisation import (
     CreateUpdateOrganisation,
@@ -50,20 +55,28 @@ def create_organisation(
     response_model=success_response,
     status_code=status.HTTP_200_OK,
 )
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def get_organisation_users(
+    request: Request,
     org_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(user_service.get_current_user),
     skip: int = 1,
     limit: int = 10,
+    cursor: CursorQuery = None,
+    include_total: IncludeTotalQuery = True,
 ):
     """Endpoint to fetch all users in an organisation"""
 
-    return organisation_service.paginate_users_in_organisation(db, org_id, skip, limit)
+    return organisation_service.paginate_users_in_organisation(
+        db, org_id, skip, limit, cursor=cursor, include_total=include_total
+    )
 
 
 @organisation.get("/{org_id}/users/export", status_code=200)
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def export_organisation_member_data_to_csv(
+    request: Request,
     org_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(user_service.get_current_super_admin),
@@ -83,7 +96,9 @@ async def export_organisation_member_data_to_csv(
 
 
 @organisation.patch("/{org_id}", response_model=success_response, status_code=200)
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def update_organisation(
+    request: Request,
     org_id: str,
     schema: CreateUpdateOrganisation,
     db: Session = Depends(get_db),
@@ -104,17 +119,21 @@ async def update_organisation(
 def get_all_organisations(
     super_admin: Annotated[User, Depends(user_service.get_current_super_admin)],
     db: Session = Depends(get_db),
+    fields: FieldsQuery = None,
 ):
-    orgs = organisation_service.fetch_all(db)
+    fields = parse_fields(Organisation, fields)
+    orgs = organisation_service.fetch_all(db, fields=fields)
     return success_response(
         status_code=status.HTTP_200_OK,
         message="Retrived all organisations information Successfully",
-        data=jsonable_encoder(orgs),
+        data=jsonable_encoder(project(orgs, fields)),
     )
 
 
 @organisation.delete("/{org_id}")
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def delete_organisation(
+    request: Request,
     org_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(user_service.get_current_super_admin),
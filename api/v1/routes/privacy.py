@@ -9,6 +9,8 @@ from api.v1.schemas.privacy_policies import (
     PrivacyPolicyCreate, PrivacyPolicyResponse, PrivacyPolicyUpdate
 )
 from api.db.database import get_db
+from api.utils.conditional import ConditionalGet
+from api.v1.models.privacy import PrivacyPolicy
 from api.v1.services.privacy_policies import privacy_service
 from api.v1.services.user import user_service
 
@@ -29,7 +31,10 @@ def create_privacy(privacy: PrivacyPolicyCreate, db: Session = Depends(get_db),
 
 
 @privacies.get("", response_model=List[PrivacyPolicyResponse])
-def get_privacies(db: Session = Depends(get_db)):
+def get_privacies(
+    db: Session = Depends(get_db),
+    _: None = Depends(ConditionalGet(PrivacyPolicy, policy="privacy")),
+):
     """Get All Privacies"""
     privacy_items = privacy_service.fetch_all(db)
     
@@ -41,7 +46,11 @@ def get_privacies(db: Session = Depends(get_db)):
 
 
 @privacies.get("/{privacy_id}", response_model=PrivacyPolicyResponse)
-def get_privacy(privacy_id: str, db: Session = Depends(get_db)):
+def get_privacy(
+    privacy_id: str,
+    db: Session = Depends(get_db),
+    _: None = Depends(ConditionalGet(PrivacyPolicy, by="privacy_id", policy="privacy")),
+):
     privacy = privacy_service.fetch(db, privacy_id)
     
     return success_response (
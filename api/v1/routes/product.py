@@ -1,13 +1,18 @@
-from fastapi import Depends, APIRouter, status, Query, HTTPException
+from fastapi import Depends, APIRouter, Request, status, Query, HTTPException
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import Annotated
 from typing import List, Optional
 
-from api.utils.pagination import paginated_response
+from api.utils.fieldsets import FieldsQuery, parse_fields
+from api.utils.pagination import CursorQuery, IncludeTotalQuery, paginated_response, paginated_response_async
+from api.utils.rate_limit import limiter, organisation_key
+from api.utils.serializers import serializers
+from api.utils.settings import settings
 from api.utils.success_response import success_response
-from api.db.database import get_db
+from api.db.database import get_db, get_async_db
 from api.v1.models.product import Product, ProductFilterStatusEnum, ProductStatusEnum
 from api.v1.services.product import product_service, ProductCategoryService
 from api.v1.schemas.product import (
@@ -32,16 +37,27 @@ non_organisation_product = APIRouter(prefix="/products", tags=["Products"])
 
 @non_organisation_product.get("", response_model=success_response, status_code=200)
 async def get_all_products(
-    current_user: Annotated[User, Depends(user_service.get_current_super_admin)],
+    current_user: Annotated[User, Depends(user_service.get_current_super_admin_async)],
     limit: Annotated[int, Query(
         ge=1, description="Number of products per page")] = 10,
     skip: Annotated[int, Query(
         ge=1, description="Page number (starts from 1)")] = 0,
-    db: Session = Depends(get_db),
+    cursor: CursorQuery = None,
+    include_total: IncludeTotalQuery = True,
+    fields: FieldsQuery = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Endpoint to get all products. Only accessible to superadmin"""
 
-    return paginated_response(db=db, model=Product, limit=limit, skip=skip)
+    return await paginated_response_async(
+        db=db,
+        model=Product,
+        limit=limit,
+        skip=skip,
+        cursor=cursor,
+        include_total=include_total,
+        fields=parse_fields(Product, fields),
+    )
 
 
 # categories
@@ -87,17 +103,15 @@ def retrieve_categories(
 
     categories = ProductCategoryService.fetch_all(db)
 
-    categories_filtered = list(
-        map(lambda x: ProductCategoryRetrieve.model_validate(x), categories)
-    )
-
-    if len(categories_filtered) == 0:
-        categories_filtered = [{}]
+    if categories:
+        return serializers.success_response(
+            ProductCategoryRetrieve, categories, message="Categories retrieved successfully"
+        )
 
     return success_response(
         message="Categories retrieved successfully",
         status_code=200,
-        data=jsonable_encoder(categories_filtered),
+        data=[{}],
     )
 
 
@@ -107,7 +121,9 @@ product = APIRouter(
 
 # create
 @product.post("", status_code=status.HTTP_201_CREATED)
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 def product_create(
+    request: Request,
     org_id: str,
     product: ProductCreate,
     current_user: Annotated[User, Depends(user_service.get_current_user)],
@@ -131,7 +147,9 @@ def product_create(
     summary="Get product detail",
     description="Endpoint to get detail about the product with the given `id`",
 )
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def get_product_detail(
+    request: Request,
     org_id: str,
     product_id: str,
     db: Session = Depends(get_db),
@@ -169,7 +187,9 @@ async def get_product_detail(
 
 # Update
 @product.put("/{product_id}", response_model=ResponseModel)
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def update_product(
+    request: Request,
     org_id: str,
     product_id: str,
     product_update: ProductUpdate,
@@ -222,7 +242,9 @@ async def update_product(
 
 # delete
 @product.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 def delete_product(
+    request: Request,
     org_id: str,
     product_id: str,
     current_user: User = Depends(user_service.get_current_user),
@@ -250,7 +272,9 @@ def delete_product(
     status_code=status.HTTP_200_OK,
     response_model=ProductList,
 )
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 def get_organisation_products(
+    request: Request,
     org_id: str,
     current_user: Annotated[User, Depends(user_service.get_current_user)],
     limit: Annotated[int, Query(
@@ -279,7 +303,9 @@ def get_organisation_products(
 
 
 @product.get("/{product_id}/stock", response_model=ResponseModel)
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def get_product_stock(
+    request: Request,
     product_id: str,
     org_id: str,
     current_user: Annotated[User, Depends(user_service.get_current_user)],
@@ -317,7 +343,9 @@ async def get_product_stock(
     response_model=SuccessResponse[List[ProductFilterResponse]],
     status_code=200,
 )
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def get_products_by_filter_status(
+    request: Request,
     org_id: str,
     filter_status: ProductFilterStatusEnum = Query(...),
     db: Session = Depends(get_db),
@@ -328,8 +356,11 @@ async def get_products_by_filter_status(
         products = product_service.fetch_by_filter_status(
             db=db, org_id=org_id, filter_status=filter_status
         )
-        return SuccessResponse(
-            message="Products retrieved successfully", status_code=200, data=products
+        return serializers.response(
+            SuccessResponse[List[ProductFilterResponse]],
+            SuccessResponse(
+                message="Products retrieved successfully", status_code=200, data=products
+            ),
         )
     except Exception as e:
         raise HTTPException(
@@ -341,7 +372,9 @@ async def get_products_by_filter_status(
     response_model=SuccessResponse[List[ProductFilterResponse]],
     status_code=200,
 )
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 async def get_products_by_status(
+    request: Request,
     org_id: str,
     status: ProductStatusEnum = Query(...),
     db: Session = Depends(get_db),
@@ -351,8 +384,11 @@ async def get_products_by_status(
     try:
         products = product_service.fetch_by_status(
             db=db, org_id=org_id, status=status)
-        return SuccessResponse(
-            message="Products retrieved successfully", status_code=200, data=products
+        return serializers.response(
+            SuccessResponse[List[ProductFilterResponse]],
+            SuccessResponse(
+                message="Products retrieved successfully", status_code=200, data=products
+            ),
         )
     except Exception as e:
         raise HTTPException(
@@ -360,7 +396,9 @@ async def get_products_by_status(
 
 
 @product.get("/search", status_code=status.HTTP_200_OK, response_model=ProductList)
+@limiter.limit(settings.RATE_LIMIT_ORGANISATION, key_func=organisation_key)
 def search_products(
+    request: Request,
     org_id: str,
     name: Optional[str] = Query(None, description="Search by product name"),
     category: Optional[str] = Query(None, description="Filter by category"),
@@ -8,8 +8,10 @@ from sqlalchemy.orm.session import Session
 from starlette import status
 
 from api.db.database import get_db
+from api.utils.conditional import ConditionalGet
 from api.utils.logger import logger
 from api.utils.success_response import success_response
+from api.v1.models.team import TeamMember
 from api.v1.models.user import User
 from api.v1.schemas.team import (PostTeamMemberSchema,
                                  TeamMemberCreateResponseSchema,
@@ -27,7 +29,8 @@ team = APIRouter(prefix="/teams", tags=["Teams"])
 )
 def get_all_team_members(
     db: Session = Depends(get_db),
-    su: User = Depends(user_service.get_current_super_admin)
+    su: User = Depends(user_service.get_current_super_admin),
+    _: None = Depends(ConditionalGet(TeamMember, policy="team", cache_control="private, no-cache")),
 ):
     '''Endpoint to fetch all team members'''
     team_members = team_service.fetch_all(db)
@@ -53,7 +56,10 @@ def get_all_team_members(
 def get_team_member_by_id(
     team_id: Annotated[str, Path(description="Team Member ID")],
     db: Session = Depends(get_db),
-    su: User = Depends(user_service.get_current_super_admin)
+    su: User = Depends(user_service.get_current_super_admin),
+    _: None = Depends(ConditionalGet(
+        TeamMember, by="team_id", policy="team", cache_control="private, no-cache"
+    )),
 ):
     """Endpoint to fetch a team by id
     Args:
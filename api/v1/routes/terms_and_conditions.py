@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.orm import Session
 from api.db.database import get_db
+from api.utils.conditional import ConditionalGet
 from api.utils.success_response import success_response
 from api.v1.services.terms_and_conditions import terms_and_conditions_service
 from api.v1.schemas.terms_and_conditions import DeleteResponseModel, UpdateTermsAndConditions
@@ -14,7 +15,8 @@ terms_and_conditions = APIRouter(
 @terms_and_conditions.get("/{id}", response_model=success_response, status_code=200)
 async def get_terms_and_conditions(
     id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    _: None = Depends(ConditionalGet(TermsAndConditions, by="id", policy="terms")),
 ):
     """Endpoint to get term and condition based on id"""
     tc = terms_and_conditions_service.fetch(db, id)
@@ -24,7 +26,7 @@ async def get_terms_and_conditions(
             status_code=status.HTTP_404_NOT_FOUND,
         )
     return success_response(
-        data=tc.to_dict(),
+        data=tc,
         message="success",
         status_code=status.HTTP_200_OK
     )
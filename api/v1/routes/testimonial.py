@@ -4,6 +4,7 @@ Module contains CRUD routes for testimonial
 """
 from fastapi.encoders import jsonable_encoder
 from api.db.database import get_db
+from api.utils.conditional import ConditionalGet
 from sqlalchemy.orm import Session
 from api.v1.models.user import User
 from fastapi import Depends, APIRouter, status,Query
@@ -13,7 +14,7 @@ from api.v1.services.user import user_service
 from api.v1.schemas.testimonial import CreateTestimonial
 from api.core.responses import SUCCESS
 from typing import Annotated
-from api.utils.pagination import paginated_response
+from api.utils.pagination import CursorQuery, IncludeTotalQuery, paginated_response
 from api.v1.models.testimonial import Testimonial
 
 testimonial = APIRouter(prefix="/testimonials", tags=['Testimonial'])
@@ -23,7 +24,10 @@ testimonial = APIRouter(prefix="/testimonials", tags=['Testimonial'])
 def get_testimonials(
     page_size: Annotated[int, Query(ge=1, description="Number of products per page")] = 10,
     page: Annotated[int, Query(ge=1, description="Page number (starts from 1)")] = 0,
+    cursor: CursorQuery = None,
+    include_total: IncludeTotalQuery = True,
     db: Session = Depends(get_db),
+    _: None = Depends(ConditionalGet(Testimonial, policy="testimonials")),
 ):
     """End point to Query Testimonials with pagination"""
 
@@ -32,6 +36,8 @@ def get_testimonials(
         model=Testimonial,
         limit=page_size,
         skip=max(page,0),
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
@@ -40,6 +46,9 @@ def get_testimonial(
     testimonial_id: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(user_service.get_current_user),
+    _: None = Depends(ConditionalGet(
+        Testimonial, by="testimonial_id", policy="testimonials", cache_control="private, no-cache"
+    )),
 ):
     """Endpoint to get testimonial by id"""
 
@@ -3,25 +3,28 @@ from fastapi import Depends, APIRouter, Request, status, Query, HTTPException
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
+from api.utils.fieldsets import FieldsQuery, parse_fields
+from api.utils.pagination import IncludeTotalQuery
+from api.utils.serializers import serializers
 from api.utils.success_response import success_response
 from api.v1.models.user import User
 from api.v1.schemas.user import (
     AllUsersResponse, UserUpdate,
     AdminCreateUserResponse, AdminCreateUser
 )
-from api.db.database import get_db
-from api.v1.services.user import user_service
+from api.db.database import get_db, get_read_db
+from api.v1.services.user import AuthContext, user_service
 
 
 user_router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @user_router.get('/delete', status_code=200)
-async def delete_account(request: Request, db: Session = Depends(get_db), current_user: User = Depends(user_service.get_current_user)):
+async def delete_account(request: Request, db: Session = Depends(get_db), auth: AuthContext = Depends(user_service.get_auth_context)):
     '''Endpoint to delete a user account'''
 
     # Delete current user
-    user_service.delete(db=db)
+    user_service.delete(db=db, auth=auth)
 
     return success_response(
         status_code=200,
@@ -94,12 +97,14 @@ def delete_user(
 @user_router.get('', status_code=status.HTTP_200_OK, response_model=AllUsersResponse)
 async def get_users(
     current_user: Annotated[User, Depends(user_service.get_current_super_admin)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     page: int = 1, per_page: int = 10,
     is_active: Optional[bool] = Query(None),
     is_deleted: Optional[bool] = Query(None),
     is_verified: Optional[bool] = Query(None),
-    is_superadmin: Optional[bool] = Query(None)
+    is_superadmin: Optional[bool] = Query(None),
+    include_total: IncludeTotalQuery = True,
+    fields: FieldsQuery = None,
 ):
     """
     Retrieves all users.
@@ -112,6 +117,8 @@ async def get_users(
         is_deleted: boolean to filter deleted users
         is_verified: boolean to filter verified users
         is_superadmin: boolean to filter users that are super admin
+        include_total: whether to count the users matching the filters
+        fields: comma separated user fields to return, all when missing
     Returns:
         UserData
     """
@@ -121,7 +128,10 @@ async def get_users(
         'is_verified': is_verified,
         'is_superadmin': is_superadmin,
     }
-    return user_service.fetch_all(db, page, per_page, **query_params)
+    users = user_service.fetch_all(
+        db, page, per_page, include_total, parse_fields(User, fields), **query_params
+    )
+    return serializers.response(AllUsersResponse, users)
 
 @user_router.post("", status_code=status.HTTP_201_CREATED, response_model=AdminCreateUserResponse)
 def admin_registers_user(
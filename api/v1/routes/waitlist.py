@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 from api.utils.dependencies import get_super_admin
+from api.utils.streaming import StreamQuery, streaming_response
 from api.utils.success_response import success_response
 from api.v1.schemas.waitlist import WaitlistAddUserSchema
 from api.utils.json_response import JsonResponseDict
@@ -158,8 +159,19 @@ def admin_add_user_to_waitlist(
 
 @waitlist.get("/users", response_model=success_response, status_code=200)
 async def get_all_waitlist_emails(
-    request: Request, db: Session = Depends(get_db), admin=Depends(get_super_admin)
+    request: Request,
+    db: Session = Depends(get_db),
+    admin=Depends(get_super_admin),
+    stream: StreamQuery = None,
 ):
+    if stream:
+        return streaming_response(
+            waitlist_service.stream_all(db),
+            stream,
+            message="Waitlist retrieved successfully",
+            encode=lambda user: {"email": user.email, "full_name": user.full_name},
+        )
+
     waitlist_users = waitlist_service.fetch_all(db)
     emails = [
         {"email": user.email, "full_name": user.full_name} for user in waitlist_users
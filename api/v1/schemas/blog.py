@@ -33,6 +33,8 @@ class BlogResponse(BaseModel):
     tags: Optional[List[str]]
     is_deleted: bool
     excerpt: Optional[str]
+    likes_count: int = 0
+    dislikes_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -49,6 +51,8 @@ class BlogPostResponse(BaseModel):
     is_deleted: bool
     excerpt: Optional[str]
     tags: Optional[str]
+    likes_count: int = 0
+    dislikes_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -12,6 +12,8 @@ class CommentData(BaseModel):
     user_id: str
     blog_id: str
     content: str
+    likes_count: int = 0
+    dislikes_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -1,7 +1,7 @@
 from email_validator import validate_email, EmailNotValidError
 import dns.resolver
 from datetime import datetime
-from typing import (Optional, Union,
+from typing import (Any, Optional, Union,
                     List, Annotated, Dict,
                     Literal)
 
@@ -135,8 +135,9 @@ class ProfileData(BaseModel):
     """
     Pydantic model for a profile.
     """
-    id: str
-    created_at: datetime
+    # None until the user first updates their profile
+    id: Optional[str] = None
+    created_at: Optional[datetime] = None
     pronouns: Optional[str] = None
     job_title: Optional[str] = None
     department: Optional[str] = None
@@ -184,8 +185,9 @@ class AllUsersResponse(BaseModel):
     status: str
     page: int
     per_page: int
-    total: int
-    data: Union[List[UserData], List[None]]    
+    total: Optional[int]
+    total_exact: bool = True
+    data: Union[List[UserData], List[Dict[str, Any]], List[None]]
 
 class AdminCreateUser(BaseModel):
     """
@@ -3,6 +3,8 @@ from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 from api.v1.models.activity_logs import ActivityLog
 from typing import Optional, Any
+from api.utils.filters import apply_filters
+from api.utils.streaming import stream_rows
 
 
 
@@ -24,14 +26,16 @@ class ActivityLogService:
         query = db.query(ActivityLog)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(ActivityLog, column) and value:
-                    query = query.filter(
-                        getattr(ActivityLog, column).ilike(f"%{value}%")
-                    )
+        query = apply_filters(query, ActivityLog, query_params)
         
         return query.all()
+
+    def stream_all(self, db: Session, **query_params: Optional[Any]):
+        """Streaming version of `fetch_all` reading the logs in batches"""
+
+        query = apply_filters(db.query(ActivityLog), ActivityLog, query_params)
+
+        return stream_rows(query)
     
     def delete_activity_log_by_id(self, db: Session, log_id: str):
         log = db.query(ActivityLog).filter(ActivityLog.id == log_id).first()
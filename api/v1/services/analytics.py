@@ -1,15 +1,12 @@
 from fastapi import Depends, HTTPException
-from fastapi.security import OAuth2
 from sqlalchemy.orm import Session
 from sqlalchemy import cast, extract, Integer, func, and_
 from typing import Annotated, List, Union
 import calendar
 from datetime import datetime, timedelta
 from api.db.database import get_db
-from api.v1.services.user import user_service
+from api.v1.services.user import AuthContext
 from api.core.base.services import Service
-from api.v1.services.user import oauth2_scheme
-from api.v1.models.user import user_organisation_association
 from api.v1.models.sales import Sales
 from api.v1.models.product import Product
 from api.v1.models.user import User
@@ -28,25 +25,21 @@ class AnalyticsServices(Service):
     Handles services related to analytis
     """
 
-    def get_analytics_line_chart(self, token: Annotated[OAuth2, Depends(oauth2_scheme)],
+    def get_analytics_line_chart(self, auth: AuthContext,
                                  db: Annotated[Session, Depends(get_db)]) -> AnalyticsChartsResponse:
         """
         Get analytics data for the line chart.
 
 
         Args:
-            token: access_token from header
+            auth: auth context of the current user
             db: database Session object
         Retuns:
             AnalyticsChartsResponse: reponse object to the user
         """
-        user: object = user_service.get_current_user(access_token=token, db=db)
-
         # check if the analytics-line-data is for org admin
-        if not user.is_superadmin:
-            user_organisation: object = (db.query(user_organisation_association)
-                                         .filter_by(user_id=user.id).first())
-            if not user_organisation:
+        if not auth.is_superadmin:
+            if not auth.organisation_ids:
                 return AnalyticsChartsResponse(
                     message='User is not part of Any organisation yet.',
                     status='success',
@@ -54,11 +47,11 @@ class AnalyticsServices(Service):
                     data={month: 0 for month in DATA.values()}
                 )
             data = self.get_line_chart_data(db, super_admin=False,
-                                            org_id=user_organisation.organisation_id)
+                                            org_id=auth.organisation_ids[0])
             message: str = 'Successfully retrieved line-charts'
 
         # check if user is a super admin
-        elif user.is_superadmin:
+        elif auth.is_superadmin:
             data = self.get_line_chart_data(db)
             message: str = 'Successfully retrieved line-charts for super_admin'
 
@@ -124,7 +117,7 @@ class AnalyticsServices(Service):
 
         return revenue_result
 
-    def get_analytics_summary(self, token: Annotated[OAuth2, Depends(oauth2_scheme)],
+    def get_analytics_summary(self, auth: AuthContext,
                               db: Annotated[Session, Depends(get_db)],
                               start_date: datetime,
                               end_date: datetime) -> AnalyticsSummaryResponse:
@@ -132,22 +125,18 @@ class AnalyticsServices(Service):
         Get analytics summary data.
 
         Args:
-            token: access_token from header
+            auth: auth context of the current user
             db: database Session object
             start_date: start date for filtering
             end_date: end date for filtering
         Returns:
             AnalyticsSummaryResponse: response object to the user
         """
-        user: object = user_service.get_current_user(access_token=token, db=db)
-
-        if user.is_superadmin:
+        if auth.is_superadmin:
             data = self.get_summary_data_super_admin(db, start_date, end_date)
             message = "Admin Statistics Fetched"
         else:
-            user_organisation = db.query(
-                user_organisation_association).filter_by(user_id=user.id).first()
-            if not user_organisation:
+            if not auth.organisation_ids:
                 data = {
                     "revenue": {
                         "current_month": 0,
@@ -172,7 +161,7 @@ class AnalyticsServices(Service):
                 message = "User is not part of any organisation"
             else:
                 data = self.get_summary_data_organisation(
-                    db, user_organisation.organisation_id, start_date, end_date)
+                    db, auth.organisation_ids[0], start_date, end_date)
                 message = "User Statistics Fetched"
 
         return AnalyticsSummaryResponse(
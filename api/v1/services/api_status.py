@@ -4,6 +4,9 @@ from sqlalchemy.orm import Session
 from api.v1.models.api_status import APIStatus
 from api.v1.schemas.api_status import APIStatusPost
 from fastapi import HTTPException
+from api.utils.filters import apply_filters
+from api.v1.services.service_cache import service_cache
+from fastapi.encoders import jsonable_encoder
 
 
 class APIStatusService(Service):
@@ -21,14 +24,12 @@ class APIStatusService(Service):
         return status
     
     @staticmethod
-    def fetch_all(db: Session, **query_params: Optional[Any]) -> List[APIStatus]:
+    @service_cache.cached("api_status", dump=jsonable_encoder)
+    def fetch_all(db: Session, **query_params: Optional[Any]) -> List[dict]:
         query = db.query(APIStatus)
 
         #  Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(APIStatus, column) and value:
-                    query = query.filter(getattr(APIStatus, column).ilike(f"%{value}%"))
+        query = apply_filters(query, APIStatus, query_params)
 
         return query.all()
 
@@ -5,7 +5,10 @@ from typing import Any, Optional
 from api.core.base.services import Service
 from api.v1.schemas.plans import CreateBillingPlanSchema
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
 from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from api.v1.services.service_cache import service_cache
 
 
 class BillingPlanService(Service):
@@ -115,18 +118,14 @@ class BillingPlanService(Service):
 
         return plan
 
+    @service_cache.cached("org:{organisation_id}", dump=jsonable_encoder)
     def fetch_all(self, db: Session, **query_params: Optional[Any]):
         """Fetch all products with option tto search using query parameters"""
 
         query = db.query(BillingPlan)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(BillingPlan, column) and value:
-                    query = query.filter(
-                        getattr(BillingPlan, column).ilike(f"%{value}%")
-                    )
+        query = apply_filters(query, BillingPlan, query_params)
 
         return query.all()
 
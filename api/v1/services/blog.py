@@ -9,6 +9,7 @@ from api.v1.models.blog import Blog, BlogDislike, BlogLike
 from api.v1.models.comment import Comment
 from api.v1.models.user import User
 from api.v1.schemas.blog import BlogCreate
+from api.v1.services.reaction_counts import Reaction, reaction_counts
 
 
 class BlogService:
@@ -76,29 +77,24 @@ class BlogService:
 
         return blog_post
 
-    def create_blog_like(
-        self, db: Session, blog_id: str, user_id: str, ip_address: str = None
-    ):
-        """Create new blog like."""
-        blog_like = BlogLike(
-            blog_id=blog_id, user_id=user_id, ip_address=ip_address
-        )
-        db.add(blog_like)
-        db.commit()
-        db.refresh(blog_like)
-        return blog_like
-
-    def create_blog_dislike(
-        self, db: Session, blog_id: str, user_id: str, ip_address: str = None
-    ):
-        """Create new blog dislike."""
-        blog_dislike = BlogDislike(
-            blog_id=blog_id, user_id=user_id, ip_address=ip_address
+    def react(
+        self, blog_id: str, user_id: str, reaction, ip_address: str = None
+    ) -> Reaction:
+        """Records a `BlogLike` or `BlogDislike` by the user, removing their
+        opposite reaction, and returns the new counts of the blog post
+        """
+        result = reaction_counts.react(
+            self.db, reaction, blog_id, user_id, ip_address=ip_address
         )
-        db.add(blog_dislike)
-        db.commit()
-        db.refresh(blog_dislike)
-        return blog_dislike
+        if result is None:
+            raise HTTPException(status_code=404, detail="Post not found")
+        if result.created is None:
+            action = "liked" if reaction is BlogLike else "disliked"
+            raise HTTPException(
+                detail=f"You have already {action} this blog post",
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+        return result
 
     def fetch_blog_like(self, blog_id: str, user_id: str):
         """Fetch a blog like by blog ID & ID of user who liked it"""
@@ -118,56 +114,13 @@ class BlogService:
         )
         return blog_dislike
     
-    def check_user_already_liked_blog(self, blog: Blog, user: User):
-        existing_like = self.fetch_blog_like(blog.id, user.id)
-        if isinstance(existing_like, BlogLike):
-            raise HTTPException(
-                detail="You have already liked this blog post",
-                status_code=status.HTTP_403_FORBIDDEN,
-            )
-    
-    def check_user_already_disliked_blog(self, blog: Blog, user: User):
-        existing_dislike = self.fetch_blog_dislike(blog.id, user.id)
-        if isinstance(existing_dislike, BlogDislike):
-            raise HTTPException(
-                detail="You have already disliked this blog post",
-                status_code=status.HTTP_403_FORBIDDEN,
-            )
-    
-    def delete_opposite_blog_like_or_dislike(self, blog: Blog, user: User, creating: str):
-        """
-        This method checks if there's a BlogLike by `user` on `blog` when a BlogDislike 
-        is being created and deletes the BlogLike. The same for BlogLike creation. \n
-
-        :param blog: `Blog` The blog being liked or disliked
-        :param user: `User` The user liking or disliking the blog
-        :param creating: `str` The operation being performed by the user. One of "like", "dislike"
-        """
-        if creating == "like":
-            existing_dislike = self.fetch_blog_dislike(blog.id, user.id)
-            if existing_dislike:
-                # delete, but do not commit yet. Allow everything 
-                # to be commited after the actual like is created
-                self.db.delete(existing_dislike)
-        elif creating == "dislike":
-            existing_like = self.fetch_blog_like(blog.id, user.id)
-            if existing_like:
-                # delete, but do not commit yet. Allow everything 
-                # to be commited after the actual dislike is created
-                self.db.delete(existing_like)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid `creating` value for blog like/dislike"
-            )
-
     def num_of_likes(self, blog_id: str) -> int:
         """Get the number of likes a blog post has"""
-        return self.db.query(BlogLike).filter_by(blog_id=blog_id).count()
+        return reaction_counts.counts(self.db, Blog, blog_id)[0]
 
     def num_of_dislikes(self, blog_id: str) -> int:
         """Get the number of dislikes a blog post has"""
-        return self.db.query(BlogDislike).filter_by(blog_id=blog_id).count()
+        return reaction_counts.counts(self.db, Blog, blog_id)[1]
 
     def delete(self, blog_id: str):
         post = self.fetch(blog_id=blog_id)
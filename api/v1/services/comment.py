@@ -7,6 +7,8 @@ from sqlalchemy import desc
 from api.db.database import get_db
 from sqlalchemy.orm import Session
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
+from api.utils.serializers import serializers
 from api.v1.models.blog import Blog
 from api.v1.schemas.comment import CommentsSchema, CommentsResponse
 
@@ -32,10 +34,7 @@ class CommentService(Service):
         query = db.query(Comment)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Comment, column) and value:
-                    query = query.filter(getattr(Comment, column).ilike(f"%{value}%"))
+        query = apply_filters(query, Comment, query_params)
 
         return query.all()
 
@@ -101,9 +100,7 @@ class CommentService(Service):
                 return CommentsResponse()
             total_comments = db.query(Comment).filter_by(blog_id=blog_id).count()
 
-            comment_schema: list = [
-                CommentsSchema.model_validate(comment) for comment in comments
-            ]
+            comment_schema: list = serializers.validate_list(CommentsSchema, comments)
             return CommentsResponse(
                 page=page, per_page=per_page, total=total_comments, data=comment_schema
             )
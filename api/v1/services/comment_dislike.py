@@ -1,9 +1,11 @@
 from typing import Any, Optional
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from api.core.base.services import Service
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
 from api.v1.models import Comment, CommentDislike
 from api.v1.models.comment import Comment
 
@@ -28,7 +30,15 @@ class CommentDislikeService(Service):
             comment_id=comment_id, user_id=user_id, ip_address=client_ip
         )
         db.add(new_dislike)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # a concurrent request disliked it first
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You can only dislike once",
+            )
         db.refresh(new_dislike)
         return new_dislike
 
@@ -38,12 +48,7 @@ class CommentDislikeService(Service):
         query = db.query(CommentDislike)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(CommentDislike, column) and value:
-                    query = query.filter(
-                        getattr(CommentDislike, column).ilike(f"%{value}%")
-                    )
+        query = apply_filters(query, CommentDislike, query_params)
 
         return query.all()
 
@@ -1,8 +1,10 @@
 from typing import Any, Optional
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from api.core.base.services import Service
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
 from api.v1.models import Comment, CommentLike
 from api.v1.models.comment import Comment
 
@@ -24,7 +26,15 @@ class CommentLikeService(Service):
             comment_id=comment_id, user_id=user_id, ip_address=client_ip
         )
         db.add(new_like)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # a concurrent request liked it first
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_200_OK,
+                detail="You've already liked this comment",
+            )
         db.refresh(new_like)
         return new_like
 
@@ -33,12 +43,7 @@ class CommentLikeService(Service):
 
         query = db.query(CommentLike)
 
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(CommentLike, column) and value:
-                    query = query.filter(
-                        getattr(CommentLike, column).ilike(f"%{value}%")
-                    )
+        query = apply_filters(query, CommentLike, query_params)
 
         return query.all()
 
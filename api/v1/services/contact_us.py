@@ -5,6 +5,7 @@ from api.core.base.services import Service
 from api.v1.routes.contact_us import get_db
 from api.v1.schemas.contact_us import CreateContactUs
 from api.v1.models import ContactUs
+from api.utils.filters import apply_filters
 
 
 class ContactUsService(Service):
@@ -43,10 +44,7 @@ class ContactUsService(Service):
         query = db.query(ContactUs)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(ContactUs, column) and value:
-                    query = query.filter(getattr(ContactUs, column).ilike(f"%{value}%"))
+        query = apply_filters(query, ContactUs, query_params)
 
         return query.all()
 
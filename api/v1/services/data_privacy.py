@@ -4,6 +4,7 @@ from api.core.base.services import Service
 from api.v1.models.user import User
 from api.v1.models.data_privacy import DataPrivacySetting
 from api.utils.db_validators import check_model_existence
+from api.utils.default_rows import default_row
 
 
 class DataPrivacyService(Service):
@@ -22,10 +23,10 @@ class DataPrivacyService(Service):
         pass
 
     def fetch(self, db: Session, user: User):
-        # * for users create before this update
+        # the setting is only saved once the user changes it
 
         if not user.data_privacy_setting:
-            self.create(user, db)
+            return default_row(DataPrivacySetting, user_id=user.id)
 
         return user.data_privacy_setting
 
@@ -33,6 +34,8 @@ class DataPrivacyService(Service):
         """Updates the user privacy settings"""
 
         data_privacy_setting = self.fetch(db=db, user=user)
+        if not user.data_privacy_setting:
+            db.add(data_privacy_setting)
 
         # Update the fields with the provided schema data
         update_data = schema.dict(exclude_unset=True)
@@ -4,6 +4,7 @@ from api.core.base.services import Service
 from api.v1.models.email_template import EmailTemplate
 from api.v1.schemas.email_template import EmailTemplateSchema
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
 import logging
 import time
 
@@ -26,10 +27,7 @@ class EmailTemplateService(Service):
         query = db.query(EmailTemplate)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(EmailTemplate, column) and value:
-                    query = query.filter(getattr(EmailTemplate, column).ilike(f"%{value}%"))
+        query = apply_filters(query, EmailTemplate, query_params)
 
         return query.all()
 
@@ -4,6 +4,9 @@ from api.core.base.services import Service
 from api.v1.models.faq import FAQ
 from api.v1.schemas.faq import CreateFAQ, UpdateFAQ
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
+from api.utils.streaming import stream_rows
+from api.v1.services.service_cache import service_cache
 
 
 class FAQService(Service):
@@ -19,15 +22,12 @@ class FAQService(Service):
 
         return new_faq
 
+    @service_cache.cached("faq")
     def fetch_all_grouped_by_category(self, db: Session, **query_params: Optional[Any]):
         """Fetch all FAQs grouped by category"""
         query = db.query(FAQ.category, FAQ.question, FAQ.answer)
 
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(FAQ, column) and value:
-                    query = query.filter(
-                        getattr(FAQ, column).ilike(f"%{value}%"))
+        query = apply_filters(query, FAQ, query_params)
         faqs = query.order_by(FAQ.category).all()
 
         grouped_faqs = {}
@@ -45,14 +45,20 @@ class FAQService(Service):
         query = db.query(FAQ)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(FAQ, column) and value:
-                    query = query.filter(
-                        getattr(FAQ, column).ilike(f"%{value}%"))
+        query = apply_filters(query, FAQ, query_params)
 
         return query.all()
 
+    def stream_all_by_category(self, db: Session, **query_params: Optional[Any]):
+        """Streaming version of `fetch_all_grouped_by_category` reading the
+        FAQs in batches ordered by category instead of grouping them
+        """
+
+        query = db.query(FAQ.category, FAQ.question, FAQ.answer)
+        query = apply_filters(query, FAQ, query_params).order_by(FAQ.category)
+
+        return stream_rows(query)
+
     def fetch(self, db: Session, faq_id: str):
         """Fetches a, FAQ by id"""
 
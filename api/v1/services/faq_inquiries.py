@@ -5,6 +5,7 @@ from api.v1.schemas.faq_inquiries import CreateFAQInquiry
 from sqlalchemy.orm import Session
 from typing import Annotated, Optional, Any
 from api.v1.routes.faq_inquiries import get_db
+from api.utils.filters import apply_filters
 
 
 class FAQInquiryService(Service):
@@ -39,10 +40,7 @@ class FAQInquiryService(Service):
         query = db.query(FAQInquiries)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(FAQInquiries, column) and value:
-                    query = query.filter(getattr(FAQInquiries, column).ilike(f"%{value}%"))
+        query = apply_filters(query, FAQInquiries, query_params)
 
         return query.all()
 
@@ -1,10 +1,11 @@
 from fastapi import BackgroundTasks, Depends, HTTPException
 from datetime import datetime, timezone
+from uuid_extensions import uuid7
 from api.core.dependencies.email_sender import send_email
 from api.db.database import get_db
 from api.v1.models.organisation import Organisation
 from api.v1.models.oauth import OAuth
-from api.v1.models import User, DataPrivacySetting, Region, NewsletterSubscriber
+from api.v1.models import User
 from api.v1.models.profile import Profile
 from api.core.base.services import Service
 from sqlalchemy.orm import Session
@@ -17,8 +18,6 @@ from api.v1.models.permissions.role_permissions import role_permissions
 from api.v1.models.permissions.permissions import Permission
 from api.v1.models.permissions.role import Role
 from api.v1.models.permissions.user_org_role import user_organisation_roles
-from api.v1.services.notification_settings import notification_setting_service
-from api.v1.services.newsletter import NewsletterService, EmailSchema
 
 
 class GoogleOauthServices(Service): 
@@ -194,69 +193,38 @@ class GoogleOauthServices(Service):
             False: If an error occured
         """
         try:
-            new_user = User(
-                first_name=google_response.get("given_name"),
-                last_name=google_response.get("family_name"),
-                email=google_response.get("email"),
-                avatar_url=google_response.get("picture")
+            new_user = user_service.add_new_user(
+                db=db,
+                new_user=User(
+                    first_name=google_response.get("given_name"),
+                    last_name=google_response.get("family_name"),
+                    email=google_response.get("email"),
+                    avatar_url=google_response.get("picture")
+                ),
+                profile=Profile(avatar_url=google_response.get("picture")),
             )
-            db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
-
-            profile = Profile(user_id=new_user.id,
-                              avatar_url=google_response.get("picture"))
-            db.add(profile)
-            db.commit()
-            db.refresh(profile)
 
             oauth_data = OAuth(
                 provider="google",
                 user_id=new_user.id,
                 sub=google_response.get("sub")
             )
-            db.add(oauth_data)
-            db.commit()
-            db.refresh(oauth_data)
-
             organisation = Organisation(
+                id=str(uuid7()),
                 name = f'{new_user.email} {new_user.last_name} Organisation'
             )
+            db.add_all([oauth_data, organisation])
 
-            db.add(organisation)
-            db.commit()
-            db.refresh(organisation)
-            
-            region = Region(
-                user_id=new_user.id,
-                region='Empty'
-            )
-            db.add(region)
-            db.commit()
-            db.refresh(region)
-
-            # Create notification settings directly for the user
-            notification_setting_service.create(db=db, user=new_user)
-            
-            
-            # create data privacy setting
-            data_privacy = DataPrivacySetting(user_id=new_user.id)
-            db.add(data_privacy)
-            db.commit()
-            db.refresh(data_privacy)
-            #db.add_all([profile, oauth_data, organisation, region, data_privacy])
+            # insert the user and organisation rows before their association
+            db.flush()
 
-            news_letter = db.query(NewsletterSubscriber).filter_by(email=new_user.email)
-            if not news_letter:
-                news_letter = NewsletterService.create(db, EmailSchema(email=new_user.email))
-            
             # TODO: Ensure to update this later
             stmt = user_organisation_association.insert().values(
                 user_id=new_user.id, organisation_id=organisation.id, role="owner"
             )
             db.execute(stmt)
-            db.commit()         
+            db.commit()
             return new_user
-        
+
         except Exception as e:
             raise HTTPException(status_code=500, detail=f'Error {e}')
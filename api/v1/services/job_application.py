@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from api.utils.db_validators import check_model_existence
 from api.utils.pagination import paginated_response
 from api.v1.models.job import Job, JobApplication
+from api.utils.serializers import serializers
 from api.utils.success_response import success_response
 from api.v1.schemas.job_application import (SingleJobAppResponse,
                                             JobApplicationBase,
@@ -93,9 +94,7 @@ class JobApplicationService(Service):
         # Total pages: integer division with ceiling for remaining items
         total_pages = int(total_applications / per_page) + (total_applications % per_page > 0)
 
-        application_schema: list = [
-            JobApplicationBase.model_validate(application) for application in applications
-        ]
+        application_schema: list = serializers.validate_list(JobApplicationBase, applications)
         application_data = JobApplicationResponseData(
             page=page, per_page=per_page, total_pages=total_pages, applications=application_schema
         )
@@ -1,9 +1,11 @@
-from typing import Any, Optional
+from typing import Any, List, Optional
 from sqlalchemy.orm import Session
 
 from api.core.base.services import Service
 from api.v1.models.job import Job
 from fastapi import HTTPException
+from api.utils.fieldsets import load_fields
+from api.utils.filters import apply_filters
 
 
 class JobService(Service):
@@ -19,16 +21,17 @@ class JobService(Service):
 
         return new_job
 
-    def fetch_all(self, db: Session, **query_params: Optional[Any]):
-        """Fetch all jobs with option to search using query parameters"""
+    def fetch_all(
+        self, db: Session, fields: Optional[List[str]] = None, **query_params: Optional[Any]
+    ):
+        """Fetch all jobs with option to search using query parameters,
+        loading only `fields` when given
+        """
 
-        query = db.query(Job)
+        query = load_fields(db.query(Job), Job, fields)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Job, column) and value:
-                    query = query.filter(getattr(Job, column).ilike(f"%{value}%"))
+        query = apply_filters(query, Job, query_params)
 
         return query.all()
 
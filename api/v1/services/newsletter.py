@@ -7,6 +7,8 @@ from api.v1.models.newsletter import NewsletterSubscriber, Newsletter
 from typing import Optional, Any, Annotated
 from api.utils.db_validators import check_model_existence
 from api.utils.success_response import success_response
+from api.utils.filters import apply_filters
+from api.utils.streaming import stream_rows
 from api.v1.schemas.newsletter import SingleNewsletterResponse
 
 class NewsletterService(Service):
@@ -51,15 +53,18 @@ class NewsletterService(Service):
         query = db.query(NewsletterSubscriber)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(NewsletterSubscriber, column) and value:
-                    query = query.filter(
-                        getattr(NewsletterSubscriber, column).ilike(f"%{value}%")
-                    )
+        query = apply_filters(query, NewsletterSubscriber, query_params)
 
         return query.all()
 
+    @staticmethod
+    def stream_all(db: Session, **query_params: Optional[Any]):
+        """Streaming version of `fetch_all` reading the subscriptions in batches"""
+
+        query = apply_filters(db.query(NewsletterSubscriber), NewsletterSubscriber, query_params)
+
+        return stream_rows(query)
+
     @staticmethod
     def unsubscribe(db: Session, request: EmailSchema) -> None:
         '''Unsubscribe a user from the newsletter'''
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from api.core.base.services import Service
 from api.db.database import get_db
+from api.utils.streaming import stream_rows
 from api.v1.models.notifications import Notification
 from api.v1.models.user import User
 
@@ -90,6 +91,13 @@ class NotificationService(Service):
         notifications = db.query(Notification).all()
         return [notification.to_dict() for notification in notifications]
 
+    def stream_all_notifications(self, db: Session):
+        """Streaming version of `fetch_all_notifications` reading the
+        notifications in batches
+        """
+
+        return stream_rows(db.query(Notification))
+
     def create(self):
         super().create()
 
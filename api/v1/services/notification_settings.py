@@ -5,6 +5,8 @@ from api.v1.models.notifications import NotificationSetting
 from api.v1.models.user import User
 from api.v1.schemas.notification_settings import NotificationSettingsBase
 from api.utils.db_validators import check_model_existence
+from api.utils.default_rows import fetch_or_create, fetch_or_default
+from api.utils.filters import apply_filters
 
 
 class NotificationSettingService(Service):
@@ -27,10 +29,7 @@ class NotificationSettingService(Service):
         query = db.query(NotificationSetting)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(NotificationSetting, column) and value:
-                    query = query.filter(getattr(NotificationSetting, column).ilike(f'%{value}%'))
+        query = apply_filters(query, NotificationSetting, query_params)
 
         return query.all()
 
@@ -43,15 +42,16 @@ class NotificationSettingService(Service):
     
 
     def fetch_by_user_id(self, db: Session, user_id: str):
-        '''Fetches a notification service by the user id of the user'''
+        '''Fetches the notification settings of a user, or the defaults if the
+        user has not changed them yet'''
 
-        return db.query(NotificationSetting).filter(NotificationSetting.user_id == user_id).first()
+        return fetch_or_default(db, NotificationSetting, user_id)
     
 
     def update(self, db: Session, user_id: str, schema: NotificationSettingsBase):
         '''Updates an notification service'''
 
-        notification_setting = self.fetch_by_user_id(db=db, user_id=user_id)
+        notification_setting = fetch_or_create(db, NotificationSetting, user_id)
         
         # Update the fields with the provided schema data
         update_data = schema.dict(exclude_unset=True)
@@ -1,15 +1,19 @@
 import csv
 from io import StringIO
 import logging
-from typing import Any, Optional, Annotated
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Annotated
 from fastapi import HTTPException, Depends, status
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 from fastapi import HTTPException, status
 from sqlalchemy import select
+from uuid_extensions import uuid7
 from api.core.base.services import Service
 from api.utils.db_validators import check_model_existence, check_user_in_org
 from api.utils.pagination import paginated_response
+from api.utils.fieldsets import load_fields
+from api.utils.filters import apply_filters
 from api.v1.models.permissions.role import Role
 from api.v1.models.product import Product
 from api.v1.models.permissions.role_permissions import role_permissions
@@ -44,58 +48,90 @@ class OrganisationService(Service):
     def create(self, db: Session, schema: CreateUpdateOrganisation, user: User):
         """Create a new product"""
 
-        # Create a new organisation
-        new_organisation = Organisation(**schema.model_dump())
-        
-        email = schema.model_dump()["email"]
-        self.check_by_email(db, email)
-
-        db.add(new_organisation)
+        new_organisation, _ = self.add_owned_organisation(db=db, schema=schema, user=user)
         db.commit()
         db.refresh(new_organisation)
 
-        # Add user as owner to the new organisation
-        stmt = user_organisation_association.insert().values(
-            user_id=user.id, 
-            organisation_id=new_organisation.id, 
-            role='owner'
+        return new_organisation
+
+    def add_owned_organisation(
+        self, db: Session, schema: CreateUpdateOrganisation, user: User
+    ):
+        """Adds an organisation owned by `user`, with the user as its admin,
+        to the current transaction without committing it.
+
+        Returns:
+            tuple: the new organisation and its `OrganisationData` as
+            returned by `retrieve_user_organizations`
+        """
+
+        # keep the pending user rows out of the lookups so everything is
+        # inserted by the single flush below
+        with db.no_autoflush:
+            self.check_by_email(db, schema.email)
+            builtin_roles = db.query(Role).filter(Role.is_builtin == True).all()
+
+        now = datetime.now(timezone.utc)
+        new_organisation = Organisation(
+            **schema.model_dump(), id=str(uuid7()), created_at=now, updated_at=now
         )
-        db.execute(stmt)
-        db.commit()
-        admin_role = db.query(Role).filter_by(name="admin").first()
+        db.add(new_organisation)
+
+        admin_role = next((role for role in builtin_roles if role.name == "admin"), None)
         if not admin_role:
             admin_role = Role(
+                id=str(uuid7()),
                 name="admin",
                 description="Organization Admin",
                 is_builtin=True
                 )
             db.add(admin_role)
-            db.commit()
-        else:
-            user_role_stmt = user_organisation_roles.insert().values(
-                user_id=user.id,
-                organisation_id=new_organisation.id,
-                role_id=admin_role.id,
-                is_owner=True,
-            )
-            db.execute(user_role_stmt)
-            db.commit()
+            builtin_roles = [*builtin_roles, admin_role]
 
-        return new_organisation
+        # insert the user, organisation and role rows before their associations
+        db.flush()
+
+        # Add user as owner and admin of the new organisation
+        db.execute(user_organisation_association.insert().values(
+            user_id=user.id,
+            organisation_id=new_organisation.id,
+            role='owner'
+        ))
+        db.execute(user_organisation_roles.insert().values(
+            user_id=user.id,
+            organisation_id=new_organisation.id,
+            role_id=admin_role.id,
+            is_owner=True,
+        ))
+
+        return new_organisation, OrganisationData(
+            id=new_organisation.id,
+            created_at=now,
+            updated_at=now,
+            name=new_organisation.name,
+            email=new_organisation.email,
+            industry=new_organisation.industry,
+            user_role=[role.name for role in builtin_roles],
+            type=new_organisation.type,
+            country=new_organisation.country,
+            state=new_organisation.state,
+            address=new_organisation.address,
+            description=new_organisation.description,
+            organisation_id=new_organisation.id
+        )
 
 
-    def fetch_all(self, db: Session, **query_params: Optional[Any]):
-        """Fetch all products with option tto search using query parameters"""
+    def fetch_all(
+        self, db: Session, fields: Optional[List[str]] = None, **query_params: Optional[Any]
+    ):
+        """Fetch all organisations with option to search using query parameters,
+        loading only `fields` when given
+        """
 
-        query = db.query(Organisation)
+        query = load_fields(db.query(Organisation), Organisation, fields)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Organisation, column) and value:
-                    query = query.filter(
-                        getattr(Organisation, column).ilike(f"%{value}%")
-                    )
+        query = apply_filters(query, Organisation, query_params)
 
         return query.all()
 
@@ -251,7 +287,9 @@ class OrganisationService(Service):
             db: Session,
             org_id: str,
             page: int,
-            per_page: int
+            per_page: int,
+            cursor: Optional[str] = None,
+            include_total: bool = True,
     ):
         '''Fetches all users in an organisation'''
 
@@ -263,7 +301,9 @@ class OrganisationService(Service):
             skip=page,
             join=user_organisation_association,
             filters={'organisation_id': org_id},
-            limit=per_page
+            limit=per_page,
+            cursor=cursor,
+            include_total=include_total,
         )
 
 
@@ -4,6 +4,7 @@ from fastapi import HTTPException
 from api.v1.models import User
 from api.v1.models.payment import Payment
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
 
 
 class PaymentService:
@@ -25,10 +26,7 @@ class PaymentService:
         query = db.query(Payment)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Payment, column) and value:
-                    query = query.filter(getattr(Payment, column).ilike(f"%{value}%"))
+        query = apply_filters(query, Payment, query_params)
 
         return query.all()
 
@@ -0,0 +1,129 @@
+""" Cross-request cache of authenticated users
+
+Committed changes to a user invalidate its entry. With the default local
+backend that only reaches the process that made the change: other workers
+keep serving a deactivated, deleted or demoted user until the entry
+expires, which is why local entries live `LOCAL_CACHE_MAX_TTL` seconds at
+most when `WEB_CONCURRENCY` is above one. Set `AUTH_PRINCIPAL_CACHE_URL`
+to a redis:// store to invalidate every worker at once.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from api.db.database import SessionLocal
+from api.utils.cache import CacheMetrics, create_cache
+from api.utils.settings import settings
+from api.v1.models.user import User
+
+# never written to the cache, loaded from the database when accessed
+UNCACHED_COLUMNS = ("password",)
+
+
+class PrincipalCache:
+    """Caches the columns of authenticated users by id so `get_current_user`
+    does not query the user on every request.
+
+    Cached users are merged into the request's session without a query, so
+    routes can still modify them and load their relationships.
+    """
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.metrics = CacheMetrics()
+        self._columns = [
+            column for column in User.__table__.columns
+            if column.key not in UNCACHED_COLUMNS
+        ]
+
+    def get(self, db: Session, user_id: str) -> Optional[User]:
+        """Returns the cached user attached to `db`, or None on a miss"""
+
+        if not self.enabled:
+            return None
+
+        values = self.backend.get(str(user_id))
+        if values is None:
+            self.metrics.record_miss()
+            return None
+
+        self.metrics.record_hit()
+        return db.merge(self._load(values), load=False)
+
+    def set(self, user: Optional[User]):
+        if self.enabled and isinstance(user, User):
+            self.backend.set(str(user.id), self._dump(user))
+
+    def invalidate(self, user_id: str):
+        if self.enabled:
+            self.backend.delete(str(user_id))
+            self.metrics.record_invalidation()
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            **self.metrics.to_dict(),
+        }
+
+    def _dump(self, user: User) -> dict:
+        values = {}
+        for column in self._columns:
+            value = getattr(user, column.key)
+            values[column.key] = value.isoformat() if isinstance(value, datetime) else value
+        return values
+
+    def _load(self, values: dict) -> User:
+        values = dict(values)
+        for column in self._columns:
+            if isinstance(column.type, DateTime) and values.get(column.key):
+                values[column.key] = datetime.fromisoformat(values[column.key])
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+
+principal_cache = PrincipalCache(
+    backend=create_cache(
+        settings.AUTH_PRINCIPAL_CACHE_URL,
+        prefix="principal",
+        maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+        ttl=settings.AUTH_PRINCIPAL_CACHE_TTL,
+        workers=settings.WEB_CONCURRENCY,
+        max_local_ttl=settings.LOCAL_CACHE_MAX_TTL,
+    ),
+    enabled=settings.AUTH_PRINCIPAL_CACHE_TTL > 0,
+)
+
+
+def invalidate_changed_principals(session_factory, cache: PrincipalCache = principal_cache):
+    """Invalidates cached users updated or deleted through `session_factory`
+    once the transaction commits, covering writes made outside `UserService`
+    """
+
+    @event.listens_for(session_factory, "after_flush")
+    def _collect_changed_users(session, flush_context):
+        changed = session.info.setdefault("changed_principals", set())
+        for obj in (*session.dirty, *session.deleted):
+            if isinstance(obj, User):
+                changed.add(obj.id)
+
+    @event.listens_for(session_factory, "after_commit")
+    def _invalidate_changed_users(session):
+        for user_id in session.info.pop("changed_principals", ()):
+            cache.invalidate(user_id)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def _discard_changed_users(session):
+        session.info.pop("changed_principals", None)
+
+
+invalidate_changed_principals(SessionLocal)
@@ -4,6 +4,7 @@ from api.core.base.services import Service
 from api.v1.models.privacy import PrivacyPolicy
 from api.v1.schemas.privacy_policies import PrivacyPolicyCreate, PrivacyPolicyUpdate
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
 
 
 class PrivacyService(Service):
@@ -26,10 +27,7 @@ class PrivacyService(Service):
         query = db.query(PrivacyPolicy)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(PrivacyPolicy, column) and value:
-                    query = query.filter(getattr(PrivacyPolicy, column).ilike(f'%{value}%'))
+        query = apply_filters(query, PrivacyPolicy, query_params)
 
         return query.all()
 
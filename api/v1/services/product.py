@@ -1,8 +1,9 @@
 from typing import Any, Optional
 import sqlalchemy
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
 
 
 from api.core.base.services import Service
@@ -17,6 +18,10 @@ from api.v1.models.user import User
 from api.v1.models import Organisation
 from api.v1.schemas.product import ProductCategoryCreate, ProductCreate
 from api.utils.db_validators import check_user_in_org
+from api.utils.filters import apply_filters
+from api.utils.serializers import serializers
+from api.utils.streaming import stream_rows
+from api.v1.services.service_cache import service_cache
 from api.v1.schemas.product import ProductFilterResponse
 
 
@@ -131,14 +136,25 @@ class ProductService(Service):
         query = db.query(Product)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Product, column) and value:
-                    query = query.filter(
-                        getattr(Product, column).ilike(f"%{value}%"))
+        query = apply_filters(query, Product, query_params)
 
         return query.all()
 
+    def stream_all(self, db: Session, **query_params: Optional[Any]):
+        """Streaming version of `fetch_all` reading the products in batches,
+        with their category
+        """
+
+        query = db.query(Product).options(joinedload(Product.category))
+        query = apply_filters(query, Product, query_params)
+
+        return stream_rows(query)
+
+    def count(self, db: Session) -> int:
+        """Counts all products"""
+
+        return db.query(Product).count()
+
     def fetch(self, db: Session, id: str) -> Product:
         """Fetches a product by id"""
 
@@ -179,7 +195,7 @@ class ProductService(Service):
                 .filter(Product.filter_status == filter_status.value)
                 .all()
             )
-            return [ProductFilterResponse.from_orm(product) for product in products]
+            return serializers.validate_list(ProductFilterResponse, products)
         except Exception as e:
             raise
 
@@ -192,10 +208,7 @@ class ProductService(Service):
                 .filter(Product.status == status.value)
                 .all()
             )
-            response_data = [
-                ProductFilterResponse.from_orm(product) for product in products
-            ]
-            return response_data
+            return serializers.validate_list(ProductFilterResponse, products)
         except Exception as e:
             raise
 
@@ -216,6 +229,7 @@ class ProductService(Service):
         }
 
     def search_products(
+            self,
             db: Session,
             org_id: str,
             name: Optional[str] = None,
@@ -227,16 +241,15 @@ class ProductService(Service):
     ):
 
         query = db.query(Product).filter(Product.org_id == org_id)
-
-        if name:
-            query = query.filter(Product.name.ilike(f"%{name}%"))
+        query = apply_filters(query, Product, {
+            "name__prefix": name,
+            "price__gte": min_price,
+            "price__lte": max_price,
+        })
         if category:
-            query = query.filter(Product.category.ilike(f"%{category}%"))
-
-        if min_price is not None:
-            query = query.filter(Product.price >= min_price)
-        if max_price is not None:
-            query = query.filter(Product.price <= max_price)
+            query = apply_filters(
+                query.join(Product.category), ProductCategory, {"name__ieq": category}
+            )
 
         offset = (page - 1) * limit
         products = query.offset(offset).limit(limit).all()
@@ -267,18 +280,14 @@ class ProductCategoryService(Service):
         return new_category
 
     @staticmethod
+    @service_cache.cached("product_category", dump=jsonable_encoder)
     def fetch_all(db: Session, **query_params: Optional[Any]):
         """Fetch all newsletter subscriptions with option to search using query parameters"""
 
         query = db.query(ProductCategory)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(ProductCategory, column) and value:
-                    query = query.filter(
-                        getattr(ProductCategory, column).ilike(f"%{value}%")
-                    )
+        query = apply_filters(query, ProductCategory, query_params)
 
         return query.all()
 
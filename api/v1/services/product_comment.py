@@ -7,6 +7,8 @@ from sqlalchemy import desc
 from api.db.database import get_db
 from sqlalchemy.orm import Session
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
+from api.utils.serializers import serializers
 from api.v1.models.product import Product, ProductComment
 from api.v1.schemas.comment import CommentsSchema, CommentsResponse
 
@@ -32,10 +34,7 @@ class ProductCommentService(Service):
         query = db.query(ProductComment)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(ProductComment, column) and value:
-                    query = query.filter(getattr(ProductComment, column).ilike(f"%{value}%"))
+        query = apply_filters(query, ProductComment, query_params)
 
         return query.all()
 
@@ -101,9 +100,7 @@ class ProductCommentService(Service):
                 return CommentsResponse()
             total_comments = db.query(ProductComment).filter_by(product_id=product_id).count()
 
-            comment_schema: list = [
-                CommentsSchema.model_validate(comment) for comment in comments
-            ]
+            comment_schema: list = serializers.validate_list(CommentsSchema, comments)
             return CommentsResponse(
                 page=page, per_page=per_page, total=total_comments, data=comment_schema
             )
@@ -3,10 +3,12 @@ from typing import Any, Optional
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from typing import Annotated
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, BackgroundTasks, Depends, status
 from api.core.base.services import Service
 from api.utils.db_validators import check_model_existence
+from api.utils.default_rows import fetch_or_create, fetch_or_default
 from api.v1.models import Profile, User
 from api.v1.schemas.profile import (ProfileCreateUpdate,
                                     ProfileUpdateResponse,
@@ -15,6 +17,7 @@ from api.v1.schemas.profile import (ProfileCreateUpdate,
                                     Token)
 from api.core.dependencies.email_sender import send_email
 from api.utils.settings import settings
+from api.utils.filters import apply_filters
 from api.db.database import get_db
 
 
@@ -41,10 +44,7 @@ class ProfileService(Service):
         query = db.query(Profile)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Profile, column) and value:
-                    query = query.filter(getattr(Profile, column).ilike(f"%{value}%"))
+        query = apply_filters(query, Profile, query_params)
 
         return query.all()
 
@@ -55,11 +55,11 @@ class ProfileService(Service):
         return profile
 
     def fetch_by_user_id(self, db: Session, user_id: str):
-        """Fetches a user by their id"""
-
-        profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+        """Fetches the profile of a user, or an empty profile if the user has
+        not filled it in yet"""
 
-        if not profile:
+        profile = fetch_or_default(db, Profile, user_id)
+        if inspect(profile).transient and db.get(User, user_id) is None:
             raise HTTPException(status_code=404, detail="User profile not found")
 
         return profile
@@ -70,9 +70,7 @@ class ProfileService(Service):
         Updates a user's profile data.
         """
         message = 'Profile updated successfully.'
-        profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-        if not profile:
-            raise HTTPException(status_code=404, detail="User profile not found")
+        profile = fetch_or_create(db, Profile, user.id)
 
         # Update only the fields that are provided in the schema
         for field, value in schema.model_dump().items():
@@ -135,10 +133,7 @@ class ProfileService(Service):
         if payload.get("email") != user.email:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail='Invalid user email')
-        profile = db.query(Profile).filter_by(user_id=user.id).first()
-        if not profile:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                                detail="User profile not found")
+        profile = fetch_or_create(db, Profile, user.id)
         profile.recovery_email = payload.get("recovery_email")
         db.commit()
                                     
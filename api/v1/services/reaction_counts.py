@@ -0,0 +1,238 @@
+""" Stored like and dislike counts of blogs and comments
+
+`Blog` and `Comment` keep `likes_count` and `dislikes_count` columns so
+feeds and reaction endpoints read counts without aggregating the reaction
+tables. When a session flushes new or deleted reactions, the counts of
+their parents are changed with `UPDATE ... SET n = n + delta` in the same
+transaction, whichever service, route or cascade wrote them. Counting a
+reaction is not an edit, so these updates leave `updated_at` as it is.
+
+`reaction_counts.react` records a reaction and removes the opposite one
+of the same user, adjusting both counts, in a single statement on
+postgresql. The unique `(parent, user)` constraints of the reaction tables
+make repeated or concurrent reactions insert nothing.
+
+Bulk `delete()` of reactions and writes made outside the registered
+sessions are not counted; `reaction_counts.reconcile` rebuilds the counts
+from the reaction tables and is run by `scripts/reconcile_reaction_counts.py`.
+"""
+from collections import Counter
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import (
+    String, delete, event, func, literal, or_, select, true, update
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from uuid_extensions import uuid7
+
+from api.db.database import SessionLocal
+from api.db.replicas import mark_request_write
+from api.v1.models.blog import Blog, BlogDislike, BlogLike
+from api.v1.models.comment import Comment, CommentDislike, CommentLike
+
+# reaction model: (parent model, parent foreign key, parent count column)
+COUNTERS = {
+    BlogLike: (Blog, "blog_id", "likes_count"),
+    BlogDislike: (Blog, "blog_id", "dislikes_count"),
+    CommentLike: (Comment, "comment_id", "likes_count"),
+    CommentDislike: (Comment, "comment_id", "dislikes_count"),
+}
+
+OPPOSITES = {
+    BlogLike: BlogDislike,
+    BlogDislike: BlogLike,
+    CommentLike: CommentDislike,
+    CommentDislike: CommentLike,
+}
+
+# dialects with INSERT ... ON CONFLICT DO NOTHING
+INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+class Reaction(NamedTuple):
+    """The outcome of `ReactionCounts.react`"""
+
+    created: Optional[dict]  # the new reaction row, None if it existed
+    likes: int
+    dislikes: int
+
+
+class ReactionCounts:
+    """Keeps and reads the stored reaction counts of blogs and comments"""
+
+    def adjust(self, db: Session, reaction, parent_id: str, delta: int) -> Optional[int]:
+        """Adds `delta` to the count kept for `reaction` on `parent_id` and
+        returns the new count, or None when the parent does not exist
+        """
+
+        parent, _, column = COUNTERS[reaction]
+        table = parent.__table__
+        count = db.connection().execute(
+            update(table)
+            .where(table.c.id == parent_id)
+            # counts are not edits, keep `updated_at` from its onupdate
+            .values({column: table.c[column] + delta, "updated_at": table.c.updated_at})
+            .returning(table.c[column])
+        ).scalar()
+
+        # keep a loaded parent current without reading it again
+        loaded = db.identity_map.get(db.identity_key(parent, parent_id))
+        if loaded is not None and count is not None:
+            set_committed_value(loaded, column, count)
+        return count
+
+    def react(
+        self,
+        db: Session,
+        reaction,
+        parent_id: str,
+        user_id: str,
+        ip_address: Optional[str] = None,
+    ) -> Optional[Reaction]:
+        """Records `reaction` by `user_id` on `parent_id`, removing the
+        opposite reaction of the user, and commits.
+
+        Returns the new counts of the parent, or None when the parent does
+        not exist. `created` is None when the user had already reacted so,
+        concurrently or not.
+        """
+
+        parent, foreign_key, column = COUNTERS[reaction]
+        opposite = OPPOSITES[reaction]
+        opposite_column = COUNTERS[opposite][2]
+        parents, reactions, opposites = (
+            parent.__table__, reaction.__table__, opposite.__table__
+        )
+        dialect = db.get_bind().dialect.name
+
+        # inserting from the parent row makes a missing parent insert nothing
+        inserted = (
+            INSERTS[dialect](reactions)
+            .from_select(
+                ["id", foreign_key, "user_id", "ip_address"],
+                select(
+                    literal(str(uuid7())),
+                    parents.c.id,
+                    literal(user_id),
+                    literal(ip_address, String),
+                ).where(parents.c.id == parent_id),
+            )
+            .on_conflict_do_nothing(index_elements=[foreign_key, "user_id"])
+            .returning(*reactions.c)
+        )
+        removed = (
+            delete(opposites)
+            .where(opposites.c[foreign_key] == parent_id, opposites.c.user_id == user_id)
+            .returning(opposites.c.id)
+        )
+
+        def counted(created, deleted):
+            return (
+                update(parents)
+                .where(parents.c.id == parent_id)
+                .values({
+                    column: parents.c[column] + created,
+                    opposite_column: parents.c[opposite_column] - deleted,
+                    "updated_at": parents.c.updated_at,
+                })
+                .returning(parents.c.likes_count, parents.c.dislikes_count)
+            )
+
+        stored = select(parents.c.likes_count, parents.c.dislikes_count).where(
+            parents.c.id == parent_id
+        )
+
+        if dialect == "postgresql":
+            inserted, removed = inserted.cte("inserted"), removed.cte("removed")
+            created = select(func.count()).select_from(inserted).scalar_subquery()
+            deleted = select(func.count()).select_from(removed).scalar_subquery()
+            # a repeated reaction changes nothing and leaves the parent alone
+            counts = counted(created, deleted).where(created + deleted > 0).cte("counts")
+            row = db.execute(
+                select(
+                    func.coalesce(counts.c.likes_count, parents.c.likes_count).label("likes_count"),
+                    func.coalesce(counts.c.dislikes_count, parents.c.dislikes_count).label("dislikes_count"),
+                    inserted,
+                )
+                .select_from(
+                    parents.outerjoin(counts, true()).outerjoin(inserted, true())
+                )
+                .where(parents.c.id == parent_id)
+            ).mappings().first()
+            created = dict(row) if row is not None and row["id"] is not None else None
+        else:
+            deleted = len(db.execute(removed).all())
+            created = db.execute(inserted).mappings().first()
+            created = dict(created) if created is not None else None
+            if created is not None or deleted:
+                row = db.execute(counted(int(created is not None), deleted)).mappings().first()
+            else:
+                row = db.execute(stored).mappings().first()
+        mark_request_write()
+        db.commit()
+
+        if row is None:
+            return None
+        if created is not None:
+            created = {name: created[name] for name in reactions.c.keys()}
+        return Reaction(created, row["likes_count"], row["dislikes_count"])
+
+    def counts(self, db: Session, parent, parent_id: str) -> Tuple[int, int]:
+        """Returns the stored `(likes, dislikes)` of a blog or comment"""
+
+        row = db.execute(
+            select(parent.likes_count, parent.dislikes_count).where(parent.id == parent_id)
+        ).first()
+        return tuple(row) if row is not None else (0, 0)
+
+    def reconcile(self, db: Session) -> Dict[str, int]:
+        """Rebuilds the stored counts from the reaction tables and returns
+        how many rows of each parent table were corrected
+        """
+
+        corrected = {}
+        parents = {parent for parent, _, _ in COUNTERS.values()}
+        for parent in sorted(parents, key=lambda model: model.__tablename__):
+            counts = {
+                column: select(func.count())
+                .where(getattr(reaction, foreign_key) == parent.id)
+                .scalar_subquery()
+                for reaction, (model, foreign_key, column) in COUNTERS.items()
+                if model is parent
+            }
+            result = db.execute(
+                update(parent)
+                .where(or_(*(getattr(parent, column) != count for column, count in counts.items())))
+                .values({**counts, "updated_at": parent.updated_at})
+                .execution_options(synchronize_session=False)
+            )
+            corrected[parent.__tablename__] = result.rowcount
+        db.commit()
+        return corrected
+
+
+reaction_counts = ReactionCounts()
+
+
+def count_reactions(session_factory, counts: ReactionCounts = reaction_counts):
+    """Adjusts the stored counts for reactions flushed through
+    `session_factory`
+    """
+
+    @event.listens_for(session_factory, "after_flush")
+    def _count_flushed_reactions(session, flush_context):
+        deltas = Counter()
+        for objects, delta in ((session.new, 1), (session.deleted, -1)):
+            for obj in objects:
+                counter = COUNTERS.get(type(obj))
+                if counter is not None:
+                    deltas[type(obj), getattr(obj, counter[1])] += delta
+
+        for (reaction, parent_id), delta in deltas.items():
+            if delta:
+                counts.adjust(session, reaction, parent_id, delta)
+
+
+count_reactions(SessionLocal)
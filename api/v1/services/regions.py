@@ -4,8 +4,10 @@ from api.core.base.services import Service
 from api.v1.models.regions import Region
 from api.v1.schemas.regions import RegionUpdate, RegionCreate
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters
 from sqlalchemy import distinct
 from fastapi import HTTPException
+from api.v1.services.service_cache import service_cache
 class RegionService(Service):
     """Region Services"""
 
@@ -28,10 +30,7 @@ class RegionService(Service):
         query = db.query(Region)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Region, column) and value:
-                    query = query.filter(getattr(Region, column).ilike(f'%{value}%'))
+        query = apply_filters(query, Region, query_params)
 
         return query.all()
 
@@ -66,6 +65,7 @@ class RegionService(Service):
         db.commit()
         
         
+    @service_cache.cached("region")
     def fetch_unique_timezones(self, db: Session):
         '''Fetch unique time zones without duplicates'''
         timezones = db.query(distinct(Region.timezone)).filter(Region.timezone.isnot(None)).all()
@@ -0,0 +1,268 @@
+""" Cross-request cache of service read paths
+
+`service_cache.cached(*tags)` caches the return value of a service method
+whose data changes rarely, keyed by its arguments other than `self` and the
+session:
+
+    @service_cache.cached("org:{organisation_id}", dump=jsonable_encoder)
+    def fetch_all(self, db, **query_params): ...
+
+Tags name what an entry was built from. `{name}` is filled from the
+arguments of the call, calls without one of them are not cached, and
+`org:*` covers every `org:` tag. Each tag has a
+version in the backend and the versions of an entry's tags are part of its
+key, so invalidating a tag is a single write and entries built from older
+versions are never read again.
+
+Writes invalidate tags on their own: `WRITE_TAGS` lists the tags of each
+table, which are invalidated when a session that added, changed or deleted
+its rows commits, or ran a bulk `update()`/`delete()` on it.
+
+Tag versions live in the cache backend, so invalidations reach every
+worker only when it is shared (`SERVICE_CACHE_URL`, or the
+`AUTH_PRINCIPAL_CACHE_URL` store when that is empty). With the default
+per-process backend a write invalidates the writing process only, and
+other workers serve the previous results until they expire; entries then
+live `LOCAL_CACHE_MAX_TTL` seconds at most when `WEB_CONCURRENCY` is
+above one.
+
+Concurrent misses of one key in a process wait for the first of them
+instead of all querying the database. Values are stored as returned, after
+`dump`, are shared by every caller, so they must not be modified, and must
+be JSON serializable when the backend is shared.
+"""
+import hashlib
+import inspect
+import itertools
+import threading
+from functools import wraps
+from string import Formatter
+from typing import Callable, Iterable, Optional
+from uuid import uuid4
+
+from sqlalchemy import event, inspect as inspect_instance
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from api.db.database import SessionLocal
+from api.utils.cache import CacheMetrics, create_cache
+from api.utils.settings import settings
+
+# tags invalidated by writes to each table
+WRITE_TAGS = {
+    "api_status": ("api_status",),
+    "billing_plans": ("billing_plan", "org:{organisation_id}"),
+    "faqs": ("faq",),
+    "organisations": ("org:{id}",),
+    "product_categories": ("product_category", "product_category:{id}"),
+    "regions": ("region",),
+    "terms_and_conditions": ("terms", "terms:{id}"),
+}
+
+LOCK_STRIPES = 64
+
+
+def _fields(tag: str):
+    return [name for _, name, _, _ in Formatter().parse(tag) if name]
+
+
+class ServiceCache:
+    """Caches service results under tags invalidated by writes"""
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.metrics = CacheMetrics()
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._versions_lock = threading.Lock()
+
+    def cached(self, *tags: str, dump: Optional[Callable] = None):
+        """Decorates a service function whose results are cached under `tags`.
+
+        `dump` converts the result, e.g. ORM rows with `jsonable_encoder`,
+        and is applied whether or not the result comes from the cache.
+        """
+
+        def decorator(func):
+            name = f"{func.__module__}.{func.__qualname__}"
+            signature = inspect.signature(func)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return self._call(func, dump, args, kwargs)
+
+                arguments = self._arguments(signature, args, kwargs)
+                try:
+                    entry_tags = [tag.format(**arguments) for tag in tags]
+                except KeyError:
+                    # called without an argument of its tags
+                    return self._call(func, dump, args, kwargs)
+                key = self._key(name, arguments, entry_tags)
+
+                cached = self.backend.get(key)
+                if cached is None:
+                    with self._locks[hash(key) % LOCK_STRIPES]:
+                        cached = self.backend.get(key)
+                        if cached is None:
+                            self.metrics.record_miss()
+                            cached = [self._call(func, dump, args, kwargs)]
+                            self.backend.set(key, cached)
+                            return cached[0]
+
+                self.metrics.record_hit()
+                return cached[0]
+
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, *tags: str):
+        """Invalidates the entries of `tags`, `name:*` invalidating every
+        tag starting with `name:`
+        """
+
+        if not self.enabled:
+            return
+        for tag in tags:
+            self.backend.set(self._version_key(tag), uuid4().hex)
+            self.metrics.record_invalidation()
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "size": self.backend.size(),
+            **self.metrics.to_dict(),
+        }
+
+    @staticmethod
+    def _call(func, dump, args, kwargs):
+        result = func(*args, **kwargs)
+        return dump(result) if dump is not None else result
+
+    @staticmethod
+    def _arguments(signature: inspect.Signature, args, kwargs) -> dict:
+        """Returns the arguments identifying a call by name, leaving out the
+        service instance and the session
+        """
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        arguments = {}
+        for name, value in bound.arguments.items():
+            kind = signature.parameters[name].kind
+            if kind is inspect.Parameter.VAR_KEYWORD:
+                arguments.update(value)
+            elif name not in ("self", "cls") and not isinstance(value, (Session, AsyncSession)):
+                arguments[name] = value
+        return arguments
+
+    def _key(self, name: str, arguments: dict, tags: Iterable[str]) -> str:
+        versions = [(tag, self._version(tag)) for tag in tags]
+        versions.extend(
+            (f"{tag.split(':')[0]}:*", self._version(f"{tag.split(':')[0]}:*"))
+            for tag in tags if ":" in tag
+        )
+        digest = hashlib.blake2b(
+            repr((sorted(arguments.items()), versions)).encode(), digest_size=16
+        ).hexdigest()
+        return f"{name}:{digest}"
+
+    def _version(self, tag: str) -> str:
+        key = self._version_key(tag)
+        version = self.backend.get(key)
+        if version is None:
+            with self._versions_lock:
+                version = self.backend.get(key)
+                if version is None:
+                    version = uuid4().hex
+                    self.backend.set(key, version)
+        return version
+
+    @staticmethod
+    def _version_key(tag: str) -> str:
+        return f"tag:{tag}"
+
+
+def write_tags(obj) -> set:
+    """Returns the tags of `WRITE_TAGS` for a changed instance, covering the
+    previous values of the attributes the tags are built from
+    """
+
+    tags = set()
+    state = inspect_instance(obj)
+    for tag in WRITE_TAGS.get(obj.__tablename__, ()):
+        names = _fields(tag)
+        if not names:
+            tags.add(tag)
+            continue
+        values = [
+            {getattr(obj, name), *state.attrs[name].history.deleted} - {None}
+            for name in names
+        ]
+        for combination in itertools.product(*values):
+            tags.add(tag.format(**dict(zip(names, combination))))
+    return tags
+
+
+def table_tags(table_name: str) -> set:
+    """Returns the tags invalidated by a bulk write to a table, which cover
+    every value of the attributes the tags are built from
+    """
+
+    return {
+        f"{tag.split(':')[0]}:*" if _fields(tag) else tag
+        for tag in WRITE_TAGS.get(table_name, ())
+    }
+
+
+service_cache = ServiceCache(
+    backend=create_cache(
+        settings.SERVICE_CACHE_URL,
+        prefix="service",
+        maxsize=settings.SERVICE_CACHE_SIZE,
+        ttl=settings.SERVICE_CACHE_TTL,
+        workers=settings.WEB_CONCURRENCY,
+        max_local_ttl=settings.LOCAL_CACHE_MAX_TTL,
+    ),
+    enabled=settings.SERVICE_CACHE_TTL > 0,
+)
+
+
+def invalidate_written_tags(session_factory, cache: ServiceCache = service_cache):
+    """Invalidates the tags of rows written through `session_factory` once
+    the transaction commits
+    """
+
+    @event.listens_for(session_factory, "after_flush")
+    def _collect_written_rows(session, flush_context):
+        tags = session.info.setdefault("written_cache_tags", set())
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            if getattr(obj, "__tablename__", None) in WRITE_TAGS:
+                tags.update(write_tags(obj))
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def _collect_bulk_writes(orm_execute_state):
+        if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.local_table.name in WRITE_TAGS:
+            orm_execute_state.session.info.setdefault("written_cache_tags", set()).update(
+                table_tags(mapper.local_table.name)
+            )
+
+    @event.listens_for(session_factory, "after_commit")
+    def _invalidate_written_tags(session):
+        cache.invalidate(*session.info.pop("written_cache_tags", ()))
+
+    @event.listens_for(session_factory, "after_rollback")
+    def _discard_written_tags(session):
+        session.info.pop("written_cache_tags", None)
+
+
+invalidate_written_tags(SessionLocal)
@@ -9,6 +9,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import select, join
 from fastapi.encoders import jsonable_encoder
 from api.utils.success_response import success_response, fail_response
+from api.v1.services.service_cache import service_cache
 import os
 from sqlalchemy import cast, DateTime
 from fastapi import HTTPException, status, Request
@@ -74,12 +75,20 @@ def calculate_prorated_amount(db: Session, user_id: str, plan_id: str):
     return prorated_amount
 
 
+@service_cache.cached("billing_plan", dump=jsonable_encoder)
+def fetch_all_plans(db: Session):
+    """
+    Retrieve the details of every billing plan.
+    """
+    return db.query(BillingPlan).all()
+
+
 def get_all_plans(db: Session):
     """
     Retrieve all billing plan details.
     """
     try:
-        data = db.query(BillingPlan).all()
+        data = fetch_all_plans(db)
         if not data:
             raise HTTPException(status_code=404, detail="No billing plans found")
         return success_response(status_code=status.HTTP_200_OK, message="Plans successfully retrieved", data=data)
@@ -4,6 +4,7 @@ from api.v1.models.terms import TermsAndConditions
 from api.v1.schemas.terms_and_conditions import UpdateTermsAndConditions
 from fastapi import HTTPException
 from api.v1.models.user import User
+from api.v1.services.service_cache import service_cache
 
 class TermsAndConditionsService(Service):
     """Terms And conditions service."""
@@ -11,7 +12,9 @@ class TermsAndConditionsService(Service):
     def create(self):
         return super().create()
 
+    @service_cache.cached("terms:{id}", dump=lambda tc: tc.to_dict() if tc else None)
     def fetch(self, db: Session, id: str):
+        """Fetch terms and conditions by id as a dict"""
         tc = db.query(TermsAndConditions).filter(TermsAndConditions.id == id).first()
         if not tc:
             return None
@@ -0,0 +1,183 @@
+""" Revocation of access and refresh tokens before they expire
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from jose import JWTError
+from sqlalchemy.orm import Session
+
+from api.db.database import SessionLocal
+from api.utils.bloom_filter import BloomFilter
+from api.utils.cache import LocalCache
+from api.utils.jwt_cache import token_claims
+from api.utils.logger import logger
+from api.utils.settings import settings
+from api.v1.models.revoked_token import RevokedToken
+
+# revocations committed by other workers this long before the last sync
+# are fetched again, in case their transactions were still open
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class TokenRevocationList:
+    """Token ids (`jti` claims) revoked before their expiry.
+
+    Revocations are stored in the `revoked_tokens` table until the token
+    expires. Each worker keeps every id in a Bloom filter, so checking a
+    token that was not revoked, the common case, does not touch the
+    database. Filter hits are confirmed against the table since the filter
+    has false positives.
+
+    `start` builds the filter from the table and polls it every
+    `sync_interval` seconds for revocations made by other workers.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        sync_interval: float = 5,
+    ):
+        self.session_factory = session_factory
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.filter = BloomFilter(capacity, error_rate)
+        # confirmed revocations, so a revoked token being retried costs one query
+        self._revoked = LocalCache(maxsize=10000, ttl=sync_interval * 60)
+        self._lock = threading.Lock()
+        self._last_sync: Optional[datetime] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime, user_id: str = None):
+        """Revokes the token with id `jti` until `expires_at`"""
+
+        if not jti:
+            return
+
+        if not db.query(RevokedToken).filter(RevokedToken.jti == jti).first():
+            db.add(
+                RevokedToken(
+                    jti=jti,
+                    user_id=user_id,
+                    expires_at=expires_at,
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+            db.commit()
+
+        self.filter.add(jti)
+        self._revoked.set(jti, True)
+
+    def revoke_token(self, db: Session, token: Optional[str]):
+        """Revokes an encoded token, ignoring tokens that are invalid or expired"""
+
+        if not token:
+            return
+
+        try:
+            payload = token_claims.decode(token)
+        except JWTError:
+            return
+
+        self.revoke(
+            db,
+            jti=payload.get("jti"),
+            expires_at=datetime.fromtimestamp(payload["exp"], timezone.utc),
+            user_id=payload.get("user_id"),
+        )
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        # tokens issued before jti claims were added cannot be revoked
+        if not jti or jti not in self.filter:
+            return False
+
+        if self._revoked.get(jti):
+            return True
+
+        with self.session_factory() as db:
+            revoked = (
+                db.query(RevokedToken.id).filter(RevokedToken.jti == jti).first()
+                is not None
+            )
+        if revoked:
+            self._revoked.set(jti, True)
+        return revoked
+
+    def rebuild(self):
+        """Rebuilds the filter from the unexpired revocations, deleting the
+        expired ones so they drop out of the filter
+        """
+
+        started = datetime.now(timezone.utc)
+        with self.session_factory() as db:
+            db.query(RevokedToken).filter(RevokedToken.expires_at <= started).delete()
+            db.commit()
+            jtis = [jti for (jti,) in db.query(RevokedToken.jti)]
+
+        new_filter = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+        for jti in jtis:
+            new_filter.add(jti)
+
+        with self._lock:
+            # revocations added while rebuilding are fetched by the next sync
+            self.filter = new_filter
+            self._last_sync = started
+
+    def sync(self):
+        """Adds the revocations made by other workers since the last sync"""
+
+        if self._last_sync is None or len(self.filter) > self.filter.capacity:
+            self.rebuild()
+            return
+
+        started = datetime.now(timezone.utc)
+        with self.session_factory() as db:
+            jtis = (
+                db.query(RevokedToken.jti)
+                .filter(RevokedToken.created_at >= self._last_sync - SYNC_OVERLAP)
+                .all()
+            )
+
+        with self._lock:
+            for (jti,) in jtis:
+                self.filter.add(jti)
+            self._last_sync = started
+
+    def start(self):
+        """Builds the filter and keeps it in sync in a background thread"""
+
+        if self._thread is not None:
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="token-revocation-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.sync()
+            except Exception as exc:
+                logger.exception(f"Could not sync revoked tokens; {exc}")
+            if self._stopped.wait(self.sync_interval):
+                return
+
+
+token_revocations = TokenRevocationList(
+    SessionLocal,
+    capacity=settings.TOKEN_REVOCATION_FILTER_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_FILTER_ERROR_RATE,
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_INTERVAL,
+)
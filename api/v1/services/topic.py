@@ -1,8 +1,10 @@
 from typing import Any, Optional, List
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from api.core.base.services import Service
 from api.utils.db_validators import check_model_existence
+from api.utils.filters import apply_filters, filter_predicates
 from api.v1.models.topic import Topic
 from api.v1.schemas.topic import TopicUpdateSchema
 
@@ -28,10 +30,7 @@ class TopicService(Service):
 
         query = db.query(Topic)
 
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Topic, column) and value:
-                    query = query.filter(getattr(Topic, column).ilike(f'%{value}%'))
+        query = apply_filters(query, Topic, query_params)
 
         return query.all()
 
@@ -65,10 +64,15 @@ class TopicService(Service):
         """
         Search for topics based on title, content, tags, or topic IDs.
         """
-        query = db.query(Topic).filter(
-            (Topic.title.ilike(f'%{title_query}%')) |
-            (Topic.content.ilike(f'%{content_query}%'))
-        )
+        # keyword search matches either field, so the predicates are OR-ed;
+        # substring matches scan the table, which only holds help articles
+        predicates = filter_predicates(Topic, {
+            "title__contains": title_query,
+            "content__contains": content_query,
+        })
+        query = db.query(Topic)
+        if predicates:
+            query = query.filter(or_(*predicates))
         return query.all()
 
 
@@ -1,39 +1,127 @@
 import random
 import string
-from typing import Any, Optional, Annotated
+from functools import cached_property
+from typing import Any, Callable, Optional, Annotated, List
 import datetime as dt
 from fastapi import status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from passlib.context import CryptContext
+from sqlalchemy import desc, select
+from uuid_extensions import uuid7
 from datetime import datetime, timedelta
 
 from api.core.base.services import Service
 from api.core.dependencies.email_sender import send_email
-from api.db.database import get_db
+from api.db.database import get_db, get_async_db
+from api.utils.password_hashing import password_hasher
 from api.utils.settings import settings
+from api.utils.fieldsets import load_fields, project
+from api.utils.serializers import serializers
 from api.utils.db_validators import check_model_existence
+from api.utils.jwt_cache import token_claims
+from api.utils.totals import total_counter
 from api.v1.models.associations import user_organisation_association
-from api.v1.models import User, Profile, Region, NewsletterSubscriber
-from api.v1.models.data_privacy import DataPrivacySetting
+from api.v1.models.permissions.role import Role
+from api.v1.models.permissions.user_org_role import user_organisation_roles
+from api.v1.models import User, Profile
 from api.v1.models.token_login import TokenLogin
 from api.v1.schemas import user
 from api.v1.schemas import token
-from api.v1.services.notification_settings import notification_setting_service
-from api.v1.services.newsletter import NewsletterService, EmailSchema
+from api.v1.schemas.organisation import CreateUpdateOrganisation
+from api.v1.services.organisation import organisation_service
+from api.v1.services.principal_cache import principal_cache
+from api.v1.services.token_revocation import token_revocations
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class AuthContext:
+    """The authenticated principal of a request.
+
+    The user, their organisation memberships and their organisation roles
+    are each resolved at most once, on first access, and shared by every
+    dependency and service of the request.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        access_token: Optional[str] = None,
+        user_loader: Optional[Callable[..., User]] = None,
+        user: Optional[User] = None,
+        memberships: Optional[dict] = None,
+        roles: Optional[dict] = None,
+    ):
+        self.db = db
+        self.access_token = access_token
+        self.user_loader = user_loader
+        # pre-resolved values, e.g. when the caller already loaded the user
+        if user is not None:
+            self.__dict__["user"] = user
+        if memberships is not None:
+            self.__dict__["memberships"] = memberships
+        if roles is not None:
+            self.__dict__["roles"] = roles
+
+    @cached_property
+    def user(self) -> User:
+        return self.user_loader(access_token=self.access_token, db=self.db)
+
+    @property
+    def is_superadmin(self) -> bool:
+        return bool(self.user.is_superadmin)
+
+    @cached_property
+    def memberships(self) -> dict:
+        """Maps the id of each organisation of the user to their membership
+        role in it (owner, admin, user, ...)"""
+
+        rows = self.db.execute(
+            select(
+                user_organisation_association.c.organisation_id,
+                user_organisation_association.c.role,
+            ).where(user_organisation_association.c.user_id == self.user.id)
+        ).all()
+        return {organisation_id: role for organisation_id, role in rows}
+
+    @cached_property
+    def roles(self) -> dict:
+        """Maps the id of each organisation of the user to the names of the
+        roles the user holds in it"""
+
+        rows = self.db.execute(
+            select(user_organisation_roles.c.organisation_id, Role.name)
+            .join(Role, Role.id == user_organisation_roles.c.role_id)
+            .where(user_organisation_roles.c.user_id == self.user.id)
+        ).all()
+        roles = {}
+        for organisation_id, name in rows:
+            roles.setdefault(organisation_id, []).append(name)
+        return roles
+
+    @property
+    def organisation_ids(self) -> List[str]:
+        return list(self.memberships)
+
+    def is_member(self, organisation_id: str) -> bool:
+        return organisation_id in self.memberships
 
 
 class UserService(Service):
     """User service"""
 
     def fetch_all(
-        self, db: Session, page: int, per_page: int, **query_params: Optional[Any]
+        self,
+        db: Session,
+        page: int,
+        per_page: int,
+        include_total: bool = True,
+        fields: Optional[List[str]] = None,
+        **query_params: Optional[Any],
     ):
         """
         Fetch all users
@@ -41,6 +129,8 @@ class UserService(Service):
             db: database Session object
             page: page number
             per_page: max number of users in a page
+            include_total: whether to count the users matching the filters
+            fields: the only user fields to load and return, all when None
             query_params: params to filter by
         """
         per_page = min(per_page, 10)
@@ -60,28 +150,41 @@ class UserService(Service):
                 if hasattr(User, param):
                     filters.append(getattr(User, param) == value)
         query = db.query(User)
-        total_users = query.count()
         if filters:
             query = query.filter(*filters)
-            total_users = query.count()
+
+        total_users, total_exact = (
+            total_counter.count(db, query, User) if include_total else (None, False)
+        )
 
         all_users: list = (
-            query.order_by(desc(User.created_at))
+            load_fields(query, User, fields)
+            .order_by(desc(User.created_at))
             .limit(per_page)
             .offset((page - 1) * per_page)
             .all()
         )
 
-        return self.all_users_response(all_users, total_users, page, per_page)
+        return self.all_users_response(
+            all_users, total_users, page, per_page, total_exact, fields
+        )
 
     def all_users_response(
-        self, users: list, total_users: int, page: int, per_page: int
+        self,
+        users: list,
+        total_users: Optional[int],
+        page: int,
+        per_page: int,
+        total_exact: bool = True,
+        fields: Optional[List[str]] = None,
     ):
         """
         Generates a response for all users
         Args:
             users: a list containing user objects
-            total_users: total number of users
+            total_users: total number of users, None when not counted
+            total_exact: whether total_users is an exact count
+            fields: the user fields to return, all when None
         """
         if not users or len(users) == 0:
             return user.AllUsersResponse(
@@ -91,11 +194,13 @@ class UserService(Service):
                 page=page,
                 per_page=per_page,
                 total=0,
+                total_exact=True,
                 data=[],
             )
-        all_users = [
-            user.UserData.model_validate(usr, from_attributes=True) for usr in users
-        ]
+        all_users = (
+            project(users, fields) if fields is not None
+            else serializers.validate_list(user.UserData, users)
+        )
         return user.AllUsersResponse(
             message="Users successfully retrieved",
             status="success",
@@ -103,6 +208,7 @@ class UserService(Service):
             page=page,
             per_page=per_page,
             total=total_users,
+            total_exact=total_exact,
             data=all_users,
         )
 
@@ -153,6 +259,14 @@ class UserService(Service):
     def create(self, db: Session, schema: user.UserCreate):
         """Creates a new user"""
 
+        new_user = self.add_new_user(db=db, new_user=self.build_user(db, schema))
+        db.commit()
+
+        return new_user
+
+    def build_user(self, db: Session, schema: user.UserCreate, is_superadmin: bool = False):
+        """Builds an unsaved user with a hashed password after checking the email is free"""
+
         if db.query(User).filter(User.email == schema.email).first():
             raise HTTPException(
                 status_code=400,
@@ -163,33 +277,63 @@ class UserService(Service):
         schema.password = self.hash_password(password=schema.password)
 
         # Create user object with hashed password and other attributes from schema
-        user = User(**schema.model_dump())
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        return User(**schema.model_dump(), is_superadmin=is_superadmin)
+
+    def add_new_user(self, db: Session, new_user: User, profile: Optional[Profile] = None):
+        """Adds a new user to the session without committing.
+
+        Ids, timestamps and flags are set up front so the user can be
+        serialized without being refreshed from the database. Settings rows
+        are created on first update (see `api.utils.default_rows`); only a
+        profile holding non-default data is added here.
+        """
+
+        now = datetime.now(dt.timezone.utc)
+        new_user.id = new_user.id or str(uuid7())
+        new_user.created_at = new_user.updated_at = now
+        for column, default in (
+            ("is_active", True),
+            ("is_superadmin", False),
+            ("is_deleted", False),
+            ("is_verified", False),
+        ):
+            if getattr(new_user, column) is None:
+                setattr(new_user, column, default)
 
-        # # Create notification settings directly for the user
-        notification_setting_service.create(db=db, user=user)
+        db.add(new_user)
+        if profile is not None:
+            profile.user_id = new_user.id
+            db.add(profile)
 
-        # create data privacy setting
-        data_privacy = DataPrivacySetting(user_id=user.id)
-        profile = Profile(
-            user_id=user.id
+        return new_user
+
+    def register(self, db: Session, schema: user.UserCreate, is_superadmin: bool = False):
+        """Creates a user together with their organisation in a single transaction.
+
+        Returns:
+            tuple: the serialized user and the list of `OrganisationData` of the user
+        """
+
+        new_user = self.add_new_user(
+            db=db, new_user=self.build_user(db, schema, is_superadmin=is_superadmin)
         )
-        region = Region(
-            user_id=user.id,
-            region='Empty'
+        _, organisation = organisation_service.add_owned_organisation(
+            db=db,
+            schema=CreateUpdateOrganisation(
+                name=f"{new_user.email}'s Organisation",
+                email=new_user.email
+            ),
+            user=new_user,
         )
-        
-        news_letter = db.query(NewsletterSubscriber).filter_by(email=user.email)
-        if not news_letter:
-            news_letter = NewsletterService.create(db, EmailSchema(email=user.email))
 
-        db.add_all([data_privacy, profile, region])
+        # serialize before committing, which expires every loaded attribute
+        user_data = jsonable_encoder(
+            {column.key: getattr(new_user, column.key) for column in User.__table__.columns},
+            exclude=['password', 'is_deleted', 'is_verified', 'updated_at']
+        )
         db.commit()
-        db.refresh(data_privacy)
 
-        return user
+        return user_data, [organisation]
 
     def super_admin_create_user(
         self,
@@ -219,22 +363,6 @@ class UserService(Service):
             db.add(new_user)
             db.commit()
             db.refresh(new_user)
-            
-            # Create notification settings directly for the user
-            notification_setting_service.create(db=db, user=new_user)
-
-            # create data privacy setting
-            data_privacy = DataPrivacySetting(user_id=new_user.id)
-            profile = Profile(
-                user_id=new_user.id
-            )
-            region = Region(
-                user_id=new_user.id,
-                region='Empty'
-            )
-
-            db.add_all([data_privacy, profile, region])
-            db.commit()
 
             user_schema = user.UserData.model_validate(new_user, from_attributes=True)
             return user.AdminCreateUserResponse(
@@ -250,41 +378,12 @@ class UserService(Service):
     def create_admin(self, db: Session, schema: user.UserCreate):
         """Creates a new admin"""
 
-        if db.query(User).filter(User.email == schema.email).first():
-            raise HTTPException(
-                status_code=400,
-                detail="User with this email already exists",
-            )
-
-        # Hash password
-        schema.password = self.hash_password(password=schema.password)
-
-        # Create user object with hashed password and other attributes from schema
-        user = User(**schema.model_dump())
-
-        user.is_superadmin = True
-        db.add(user)
-        db.commit()
-
-        # # Create notification settings directly for the user
-        notification_setting_service.create(db=db, user=user)
-
-        # create data privacy setting
-        data_privacy = DataPrivacySetting(user_id=user.id)
-        profile = Profile(
-            user_id=user.id
+        new_user = self.add_new_user(
+            db=db, new_user=self.build_user(db, schema, is_superadmin=True)
         )
-        region = Region(
-            user_id=user.id,
-            region='Empty'
-        )
-
-        db.add_all([data_privacy, profile, region])
         db.commit()
 
-        db.refresh(user)
-
-        return user
+        return new_user
 
     def update(self, db: Session, current_user: User, schema: user.UserUpdate, id=None):
         """Function to update a User"""
@@ -301,21 +400,19 @@ class UserService(Service):
                 continue
             setattr(user, key, value)
         db.commit()
+        principal_cache.invalidate(user.id)
         db.refresh(user)
         return user
 
-    def delete(self, db: Session, id=None, access_token: str = Depends(oauth2_scheme)):
+    def delete(self, db: Session, id=None, auth: Optional[AuthContext] = None):
         """Function to soft delete a user"""
 
-        # Get user from access token if provided, otherwise fetch user by id
-        user = (
-            self.get_current_user(access_token, db)
-            if id is None
-            else check_model_existence(db, User, id)
-        )
+        # Get the authenticated user if no id is provided, otherwise fetch user by id
+        user = auth.user if id is None else check_model_existence(db, User, id)
 
         user.is_deleted = True
         db.commit()
+        principal_cache.invalidate(user.id)
 
         return super().delete()
 
@@ -327,9 +424,35 @@ class UserService(Service):
         if not user:
             raise HTTPException(status_code=400, detail="Invalid user credentials")
 
-        if not self.verify_password(password, user.password):
+        verified, new_hash = password_hasher.verify_and_update(password, user.password)
+        if not verified:
+            raise HTTPException(status_code=400, detail="Invalid user credentials")
+
+        if new_hash:
+            # hashed with an older work factor, upgrade it while we have the password
+            user.password = new_hash
+            db.commit()
+
+        return user
+
+    async def authenticate_user_async(self, db: AsyncSession, email: str, password: str):
+        """Async version of `authenticate_user` for `async def` routes"""
+
+        user = await db.run_sync(self.get_user_by_email, email)
+
+        if not user:
+            raise HTTPException(status_code=400, detail="Invalid user credentials")
+
+        verified, new_hash = await password_hasher.verify_and_update_async(
+            password, user.password
+        )
+        if not verified:
             raise HTTPException(status_code=400, detail="Invalid user credentials")
 
+        if new_hash:
+            user.password = new_hash
+            await db.commit()
+
         return user
 
     def perform_user_check(self, user: User):
@@ -341,13 +464,12 @@ class UserService(Service):
     def hash_password(self, password: str) -> str:
         """Function to hash a password"""
 
-        hashed_password = pwd_context.hash(secret=password)
-        return hashed_password
+        return password_hasher.hash(password)
 
     def verify_password(self, password: str, hash: str) -> bool:
         """Function to verify a hashed password"""
 
-        return pwd_context.verify(secret=password, hash=hash)
+        return password_hasher.verify(password, hash)
 
     def create_access_token(self, user_id: str) -> str:
         """Function to create access token"""
@@ -355,7 +477,7 @@ class UserService(Service):
         expires = dt.datetime.now(dt.timezone.utc) + dt.timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-        data = {"user_id": user_id, "exp": expires, "type": "access"}
+        data = {"user_id": user_id, "exp": expires, "type": "access", "jti": str(uuid7())}
         encoded_jwt = jwt.encode(data, settings.SECRET_KEY, settings.ALGORITHM)
         return encoded_jwt
 
@@ -365,7 +487,7 @@ class UserService(Service):
         expires = dt.datetime.now(dt.timezone.utc) + dt.timedelta(
             days=settings.JWT_REFRESH_EXPIRY
         )
-        data = {"user_id": user_id, "exp": expires, "type": "refresh"}
+        data = {"user_id": user_id, "exp": expires, "type": "refresh", "jti": str(uuid7())}
         encoded_jwt = jwt.encode(data, settings.SECRET_KEY, settings.ALGORITHM)
         return encoded_jwt
 
@@ -373,9 +495,7 @@ class UserService(Service):
         """Funtcion to decode and verify access token"""
 
         try:
-            payload = jwt.decode(
-                access_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
+            payload = token_claims.decode(access_token)
             user_id = payload.get("user_id")
             token_type = payload.get("type")
 
@@ -385,6 +505,9 @@ class UserService(Service):
             if token_type == "refresh":
                 raise HTTPException(detail="Refresh token not allowed", status_code=400)
 
+            if token_revocations.is_revoked(payload.get("jti")):
+                raise credentials_exception
+
             token_data = user.TokenData(id=user_id)
 
         except JWTError as err:
@@ -397,9 +520,7 @@ class UserService(Service):
         """Funtcion to decode and verify refresh token"""
 
         try:
-            payload = jwt.decode(
-                refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
+            payload = token_claims.decode(refresh_token)
             user_id = payload.get("user_id")
             token_type = payload.get("type")
 
@@ -409,6 +530,9 @@ class UserService(Service):
             if token_type == "access":
                 raise HTTPException(detail="Access token not allowed", status_code=400)
 
+            if token_revocations.is_revoked(payload.get("jti")):
+                raise credentials_exception
+
             token_data = user.TokenData(id=user_id)
 
         except JWTError:
@@ -431,11 +555,68 @@ class UserService(Service):
 
             return access, refresh
 
+    def revoke_tokens(self, db: Session, *tokens: Optional[str]):
+        """Revokes access or refresh tokens before they expire"""
+
+        for token in tokens:
+            token_revocations.revoke_token(db, token)
+
+    def get_auth_context(
+        self,
+        request: Request,
+        access_token: str = Depends(oauth2_scheme),
+        db: Session = Depends(get_db),
+    ) -> AuthContext:
+        """Returns the auth context of the request, creating it on first use"""
+
+        context = getattr(request.state, "auth_context", None)
+        if context is None or context.access_token != access_token:
+            context = AuthContext(
+                db=db, access_token=access_token, user_loader=self.get_current_user
+            )
+            request.state.auth_context = context
+
+        return context
+
     def get_current_user(
-        self, access_token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+        self,
+        access_token: str = Depends(oauth2_scheme),
+        db: Session = Depends(get_db),
+        request: Request = None,
     ) -> User:
         """Function to get current logged in user"""
 
+        if request is not None:
+            # resolved once per request, whichever dependency asks first
+            return self.get_auth_context(request, access_token, db).user
+
+        credentials_exception = HTTPException(
+            status_code=401,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+        token = self.verify_access_token(access_token, credentials_exception)
+        user = principal_cache.get(db, token.id)
+        if user is None:
+            user = db.query(User).filter(User.id == token.id).first()
+            principal_cache.set(user)
+
+        return user
+
+    async def get_current_user_async(
+        self,
+        access_token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_async_db),
+    ) -> User:
+        """Async version of `get_current_user` for `async def` routes.
+
+        The principal cache is not read here: cached users leave out the
+        password hash, and an AsyncSession cannot lazy load it on access.
+        The user is loaded with every column instead, then cached for the
+        sync routes.
+        """
+
         credentials_exception = HTTPException(
             status_code=401,
             detail="Could not validate credentials",
@@ -443,7 +624,8 @@ class UserService(Service):
         )
 
         token = self.verify_access_token(access_token, credentials_exception)
-        user = db.query(User).filter(User.id == token.id).first()
+        user = await db.scalar(select(User).where(User.id == token.id))
+        principal_cache.set(user)
 
         return user
 
@@ -476,6 +658,7 @@ class UserService(Service):
         # )
 
         db.commit()
+        principal_cache.invalidate(user.id)
 
         return reactivation_link
 
@@ -503,6 +686,7 @@ class UserService(Service):
         user.is_active = True
 
         db.commit()
+        principal_cache.invalidate(user.id)
 
     def change_password(
         self,
@@ -519,6 +703,7 @@ class UserService(Service):
             if user.password is None:
                 user.password = self.hash_password(new_password)
                 db.commit()
+                principal_cache.invalidate(user.id)
                 return
             else:
                 raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -528,12 +713,40 @@ class UserService(Service):
         else:
             user.password = self.hash_password(new_password)
             db.commit()
+            principal_cache.invalidate(user.id)
+
+    async def change_password_async(
+        self,
+        new_password: str,
+        user: User,
+        db: Session,
+        old_password: Optional[str] = None
+    ):
+        """Async version of `change_password`, awaiting the password hasher
+        instead of blocking the event loop on it
+        """
+        if old_password == new_password:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                                detail="Old Password and New Password cannot be the same")
+        if old_password is None:
+            if user.password is not None:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                                    detail="Old Password must not be empty, unless setting password for the first time.")
+        elif not await password_hasher.verify_async(old_password, user.password):
+            raise HTTPException(status_code=400, detail="Incorrect old password")
+
+        user.password = await password_hasher.hash_async(new_password)
+        db.commit()
+        principal_cache.invalidate(user.id)
 
     def get_current_super_admin(
-        self, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+        self,
+        db: Session = Depends(get_db),
+        token: str = Depends(oauth2_scheme),
+        request: Request = None,
     ):
         """Get the current super admin"""
-        user = self.get_current_user(db=db, access_token=token)
+        user = self.get_current_user(db=db, access_token=token, request=request)
         if not user.is_superadmin:
             raise HTTPException(
                 status_code=403,
@@ -541,6 +754,20 @@ class UserService(Service):
             )
         return user
 
+    async def get_current_super_admin_async(
+        self,
+        db: AsyncSession = Depends(get_async_db),
+        token: str = Depends(oauth2_scheme),
+    ):
+        """Async version of `get_current_super_admin`"""
+        user = await self.get_current_user_async(db=db, access_token=token)
+        if not user or not user.is_superadmin:
+            raise HTTPException(
+                status_code=403,
+                detail="You do not have permission to access this resource",
+            )
+        return user
+
     def save_login_token(
         self, db: Session, user: User, token: str, expiration: datetime
     ):
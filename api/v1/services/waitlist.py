@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 from api.core.base.services import Service
 from api.v1.models.waitlist import Waitlist
 from pydantic import BaseModel
+from api.utils.filters import apply_filters
+from api.utils.streaming import stream_rows
 
 
 class WaitListService(Service):
@@ -26,13 +28,17 @@ class WaitListService(Service):
         query = db.query(Waitlist)
 
         # Enable filter by query parameter
-        if query_params:
-            for column, value in query_params.items():
-                if hasattr(Waitlist, column) and value:
-                    query = query.filter(getattr(Waitlist, column).ilike(f"%{value}%"))
+        query = apply_filters(query, Waitlist, query_params)
 
         return query.all()
 
+    def stream_all(self, db: Session, **query_params: Optional[Any]):
+        """Streaming version of `fetch_all` reading the users in batches"""
+
+        query = apply_filters(db.query(Waitlist), Waitlist, query_params)
+
+        return stream_rows(query)
+
     def fetch(self, db: Session, id: str):
         """Fetches a waitlist user by their id"""
 
@@ -3,8 +3,6 @@ from fastapi.staticfiles import StaticFiles
 import uvicorn, os
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from fastapi.templating import Jinja2Templates
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -15,9 +13,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.requests import Request
 from starlette.middleware.sessions import SessionMiddleware  # required by google oauth
 
-from api.utils.json_response import JsonResponseDict
+from api.db.database import replica_router
+from api.db.instrumentation import QueryStatsMiddleware
+from api.db.replicas import ReadYourWritesMiddleware
+from api.utils.compression import CompressionMiddleware
+from api.utils.conditional import ConditionalGetMiddleware, NotModified, not_modified_response
+from api.utils.json_response import FastJSONResponse, JsonResponseDict
 from api.utils.logger import logger
+from api.utils.password_hashing import password_hasher
+from api.utils.rate_limit import RateLimitHeadersMiddleware, limiter
 from api.v1.routes import api_version_one
+from api.v1.services.token_revocation import token_revocations
 from api.utils.settings import settings
 from scripts.populate_db import populate_roles_and_permissions
 
@@ -26,7 +32,10 @@ from scripts.populate_db import populate_roles_and_permissions
 async def lifespan(app: FastAPI):
     '''Lifespan function'''
 
+    token_revocations.start()
     yield
+    token_revocations.stop()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
@@ -34,11 +43,11 @@ app = FastAPI(
     title="HNG Boilerplate",
     description="A boilerplate for creating an API using FastAPI and SQLAlchemy",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
 )
 
 
-# Initialize the rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Share the rate limiter of the routes
 app.state.limiter = limiter
 
 # Set up email templates and css static files
@@ -59,6 +68,7 @@ origins = [
 ]
 
 
+app.add_middleware(ReadYourWritesMiddleware, router=replica_router)
 app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
 app.add_middleware(
     CORSMiddleware,
@@ -66,7 +76,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag",
+        *(["Server-Timing", "X-DB-Queries"] if settings.DB_QUERY_STATS_HEADERS else []),
+        "RateLimit-Limit",
+        "RateLimit-Remaining",
+        "RateLimit-Reset",
+        "RateLimit-Policy",
+        "Retry-After",
+    ],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(RateLimitHeadersMiddleware)
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(api_version_one)
 
@@ -97,6 +120,13 @@ async def http_exception(request: Request, exc: HTTPException):
     )
 
 
+@app.exception_handler(NotModified)
+async def not_modified(request: Request, exc: NotModified):
+    """Answers a conditional GET whose validator still matches"""
+
+    return not_modified_response(exc)
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception(request: Request, exc: RequestValidationError):
     """Validation exception handler"""
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+""" Measures the overhead of verifying a reused bearer token in the auth
+dependency with and without the verified claims cache
+
+usage: python scripts/bench_auth_dependency.py [--requests 20000]
+"""
+import sys, os
+import argparse
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import HTTPException
+from unittest.mock import patch
+
+from api.utils.jwt_cache import TokenClaimsCache
+from api.utils.settings import settings
+from api.v1.services.user import user_service
+
+credentials_exception = HTTPException(status_code=401, detail="Could not validate credentials")
+
+
+def run(label: str, cache: TokenClaimsCache, tokens: list, requests: int):
+    with patch("api.v1.services.user.token_claims", cache):
+        start = time.perf_counter()
+        for i in range(requests):
+            user_service.verify_access_token(tokens[i % len(tokens)], credentials_exception)
+        elapsed = time.perf_counter() - start
+
+    print(f"{label:<10} {elapsed / requests * 1e6:8.2f} us/request  {cache.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=100, help="distinct tokens in use")
+    args = parser.parse_args()
+
+    tokens = [user_service.create_access_token(user_id=f"user-{i}") for i in range(args.users)]
+
+    for label, maxsize in (("uncached", 0), ("cached", 10000)):
+        cache = TokenClaimsCache(maxsize, settings.SECRET_KEY, settings.ALGORITHM)
+        run(label, cache, tokens, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+""" Measures rendering a large paginated listing with the previous response
+path, which ran `jsonable_encoder` three times before the stdlib `json`,
+against the single orjson pass of `FastJSONResponse`
+
+usage: python scripts/bench_json_response.py [--items 5000] [--repeat 5]
+"""
+import sys, os
+import argparse
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from uuid_extensions import uuid7
+
+from api.utils.pagination import _paginated_success_response
+from api.v1.models.product import Product, ProductFilterStatusEnum, ProductStatusEnum
+
+EXCLUDE = {'password', 'is_superadmin', 'is_deleted', 'is_active'}
+
+
+def previous(rows, total: int, limit: int) -> bytes:
+    results = jsonable_encoder(rows)
+    data = {
+        "pages": total // limit, "total": total, "total_exact": True, "skip": 0,
+        "limit": limit, "items": jsonable_encoder(results, exclude=EXCLUDE),
+    }
+    content = {"status_code": 200, "success": True, "message": "Successfully fetched items", "data": data}
+    return JSONResponse(status_code=200, content=jsonable_encoder(content)).body
+
+
+def current(rows, total: int, limit: int) -> bytes:
+    return _paginated_success_response(rows, total, 0, limit).body
+
+
+def run(label: str, render, rows, repeat: int) -> bytes:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = render(rows, len(rows), len(rows))
+    elapsed = (time.perf_counter() - start) / repeat
+
+    print(f"{label:<10} {elapsed * 1000:8.2f} ms/response  {len(body) / 1024:.0f} KiB")
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        Product(
+            id=str(uuid7()), name=f"product {i}", description="description " * 20,
+            price=Decimal("19.99"), org_id=str(uuid7()), category_id=str(uuid7()),
+            quantity=i, image_url="https://example.com/image.png",
+            status=ProductStatusEnum.in_stock, archived=False,
+            filter_status=ProductFilterStatusEnum.active, created_at=now, updated_at=now,
+        )
+        for i in range(args.items)
+    ]
+
+    before = run("previous", previous, rows, args.repeat)
+    after = run("current", current, rows, args.repeat)
+    print("identical bytes:", before == after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+""" Measures login throughput with password verification run inline in
+the request threadpool versus on the dedicated password hashing pool
+
+usage: python scripts/bench_password_hashing.py [--logins 64] [--rounds 12]
+"""
+import sys, os
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.utils.password_hashing import PasswordHasher, _crypt_context
+
+
+def run(label: str, verify, hashed: str, logins: int, concurrency: int):
+    """Runs `logins` concurrent verifications from a pool of `concurrency`
+    threads, standing in for the request threadpool
+    """
+
+    latencies = []
+
+    def login():
+        start = time.perf_counter()
+        assert verify("Benchmark@123", hashed)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as request_pool:
+        for _ in range(logins):
+            request_pool.submit(login)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"{label:<16} {logins / elapsed:8.1f} logins/s  "
+        f"p50 {latencies[len(latencies) // 2] * 1000:7.1f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=40, help="request threadpool size")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    context = _crypt_context(args.rounds)
+    hashed = context.hash("Benchmark@123")
+
+    run("inline", lambda p, h: context.verify(p, h), hashed, args.logins, args.concurrency)
+
+    for use_processes in (False, True):
+        hasher = PasswordHasher(
+            rounds=args.rounds,
+            workers=args.workers,
+            max_pending=args.logins,
+            use_processes=use_processes,
+        )
+        hasher.verify("Benchmark@123", hashed)  # start the workers
+        label = "process pool" if use_processes else "thread pool"
+        run(label, hasher.verify, hashed, args.logins, args.concurrency)
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
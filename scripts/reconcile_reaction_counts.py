@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+""" Rebuilds the stored like and dislike counts of blogs and comments from
+the reaction tables, correcting counts that drifted through bulk deletes or
+writes made outside the application's sessions
+
+usage: python scripts/reconcile_reaction_counts.py
+"""
+import sys, os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.db.database import SessionLocal
+from api.v1.services.reaction_counts import reaction_counts
+
+
+def main():
+    with SessionLocal() as db:
+        corrected = reaction_counts.reconcile(db)
+
+    for table, rows in corrected.items():
+        print(f"{table:<10} {rows} rows corrected")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,21 @@ import sys, os
 import warnings
 from unittest.mock import patch
 import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
  
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "sqlite_tables(models): tables created in the `sqlite_engine` database"
+    )
+
+
 @pytest.fixture(scope='module')
 def mock_send_email():
     with patch("api.core.dependencies.email_sender.send_email") as mock_email_sending:
@@ -15,3 +24,91 @@ def mock_send_email():
             add_task_mock.side_effect = lambda func, *args, **kwargs: func(*args, **kwargs)
             
             yield mock_email_sending
+
+
+@pytest.fixture(autouse=True)
+def disable_principal_cache():
+    """Mocked sessions cannot attach cached users, so tests authenticate
+    through the database unless they enable the principal cache themselves
+    """
+    from api.v1.services.principal_cache import principal_cache
+
+    principal_cache.enabled = False
+    principal_cache.clear()
+    yield
+    principal_cache.enabled = False
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def disable_service_cache():
+    """Mocked sessions return different rows for the same service calls, so
+    tests read through the database unless they enable the cache themselves
+    """
+    from api.v1.services.service_cache import service_cache
+
+    service_cache.enabled = False
+    service_cache.clear()
+    yield
+    service_cache.enabled = False
+    service_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cached_totals():
+    """Cached listing totals are keyed by the SQL of the listing, so clear
+    them between tests that list different mocked rows
+    """
+    from api.utils.totals import total_counter
+
+    total_counter.clear()
+    yield
+    total_counter.clear()
+
+
+@pytest.fixture
+def sqlite_engine(request):
+    """In-memory sqlite database holding the tables of the models listed by the
+    `sqlite_tables` marker of the test or its module, shared by every thread
+    """
+    marker = request.node.get_closest_marker("sqlite_tables")
+    models = marker.args[0] if marker else []
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    if models:
+        models[0].metadata.create_all(bind=engine, tables=[model.__table__ for model in models])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(sqlite_engine):
+    return sessionmaker(bind=sqlite_engine)
+
+
+@pytest.fixture
+def record_statements(sqlite_engine):
+    """Returns `record(predicate)`, which starts collecting the SQL of the
+    statements run on `sqlite_engine` that `predicate` accepts into a list
+    """
+
+    def record(predicate=lambda statement: True, parameters=False):
+        statements = []
+
+        @event.listens_for(sqlite_engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, params, context, executemany):
+            if predicate(statement):
+                statements.append((statement, params) if parameters else statement)
+
+        return statements
+
+    return record
+
+
+@pytest.fixture
+def selects(record_statements):
+    """The SELECT statements run on `sqlite_engine`"""
+
+    return record_statements(lambda statement: statement.startswith("SELECT"))
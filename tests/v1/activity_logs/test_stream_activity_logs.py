@@ -0,0 +1,77 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from uuid_extensions import uuid7
+
+from main import app
+from api.db.database import SessionLocal, get_db
+from api.utils.streaming import streaming_response
+from api.v1.models.activity_logs import ActivityLog
+from api.v1.models.user import User
+from api.v1.services.user import user_service
+
+client = TestClient(app)
+
+pytestmark = pytest.mark.sqlite_tables([ActivityLog])
+
+
+@pytest.fixture
+def db(session_factory):
+    db = session_factory()
+    db.add_all(
+        ActivityLog(id=str(uuid7()), user_id=f"user-{i % 2}", action=f"action {i}")
+        for i in range(5)
+    )
+    db.commit()
+
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[user_service.get_current_super_admin] = lambda: User(id="admin")
+    yield db
+    app.dependency_overrides = {}
+
+
+def test_ndjson(db):
+    sessions = []
+
+    def session_local(**kwargs):
+        session = SessionLocal(**kwargs)
+        session.close = MagicMock(wraps=session.close)
+        sessions.append(session)
+        return session
+
+    with patch("api.utils.streaming.SessionLocal", side_effect=session_local):
+        response = client.get("/api/v1/activity-logs/user-0", params={"stream": "ndjson"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["action"] for line in lines] == ["action 0", "action 2", "action 4"]
+    # the rows are read through a session of their own, on the same engine
+    [session] = sessions
+    assert session is not db and session.get_bind() is db.get_bind()
+    session.close.assert_called_once()
+
+
+def test_json_array(db):
+    response = client.get("/api/v1/activity-logs", params={"stream": "json"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["message"] == "Activity logs retrieved successfully"
+    assert body["success"] is True
+    assert len(body["data"]) == 5
+
+
+def test_rows_are_written_in_batches():
+    rows = iter(range(5))
+    response = streaming_response(rows, "json", "ok", batch_size=2)
+
+    async def read():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(read())
+
+    assert chunks[1:] == [b"0,1", b",2,3", b",4", b"]}"]
+    assert json.loads(b"".join(chunks))["data"] == [0, 1, 2, 3, 4]
@@ -5,6 +5,7 @@ from fastapi.security import OAuth2PasswordBearer
 import calendar
 
 from api.v1.services.analytics import AnalyticsServices
+from api.v1.services.user import AuthContext
 from api.v1.schemas.analytics import AnalyticsChartsResponse
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -47,7 +48,8 @@ def test_get_analytics_line_chart_super_admin(mock_db, mock_user_service, mock_o
     analytics_service = AnalyticsServices()
 
     # Act
-    response = analytics_service.get_analytics_line_chart(token="test_token", db=mock_db)
+    auth = AuthContext(db=mock_db, user=mock_user, memberships={})
+    response = analytics_service.get_analytics_line_chart(auth=auth, db=mock_db)
 
     # Assert
     assert isinstance(response, AnalyticsChartsResponse)
@@ -69,7 +71,8 @@ def test_get_analytics_line_chart_non_super_admin(mock_db, mock_user_service, mo
     analytics_service = AnalyticsServices()
 
     # Act
-    response = analytics_service.get_analytics_line_chart(token="test_token", db=mock_db)
+    auth = AuthContext(db=mock_db, user=mock_user, memberships={"org_id": "owner"})
+    response = analytics_service.get_analytics_line_chart(auth=auth, db=mock_db)
 
     # Assert
     assert isinstance(response, AnalyticsChartsResponse)
@@ -90,7 +93,8 @@ def test_get_analytics_line_chart_no_org(mock_db, mock_user_service, mock_oauth2
     analytics_service = AnalyticsServices()
 
     # Act
-    response = analytics_service.get_analytics_line_chart(token="test_token", db=mock_db)
+    auth = AuthContext(db=mock_db, user=mock_user, memberships={})
+    response = analytics_service.get_analytics_line_chart(auth=auth, db=mock_db)
 
     # Assert
     assert isinstance(response, AnalyticsChartsResponse)
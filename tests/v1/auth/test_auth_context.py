@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from uuid_extensions import uuid7
+
+from api.db.database import get_db
+from api.v1.models.user import User
+from api.v1.services.user import AuthContext, user_service
+
+app = FastAPI()
+
+
+@app.get("/principal")
+def principal(
+    current_user: User = Depends(user_service.get_current_user),
+    super_admin: User = Depends(user_service.get_current_super_admin),
+    auth: AuthContext = Depends(user_service.get_auth_context),
+):
+    return {
+        "same_user": current_user is super_admin is auth.user,
+        "organisations": auth.organisation_ids,
+        "roles": auth.roles,
+    }
+
+
+client = TestClient(app)
+
+user_id = str(uuid7())
+
+
+@pytest.fixture
+def db_session_mock():
+    db_session = MagicMock(spec=Session)
+    db_session.query().filter().first.return_value = User(
+        id=user_id, email="admin@example.com", is_superadmin=True
+    )
+    db_session.query.reset_mock()
+    db_session.execute().all.side_effect = [
+        [("org-1", "owner"), ("org-2", "user")],
+        [("org-1", "admin"), ("org-1", "manager")],
+    ]
+    app.dependency_overrides[get_db] = lambda: db_session
+    yield db_session
+    app.dependency_overrides = {}
+
+
+def test_principal_resolved_once_per_request(db_session_mock):
+    token = user_service.create_access_token(user_id=user_id)
+
+    with patch.object(
+        user_service, "verify_access_token", wraps=user_service.verify_access_token
+    ) as verify:
+        response = client.get("/principal", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "same_user": True,
+        "organisations": ["org-1", "org-2"],
+        "roles": {"org-1": ["admin", "manager"]},
+    }
+    verify.assert_called_once()
+    db_session_mock.query.assert_called_once_with(User)
+
+
+def test_pre_resolved_context_does_not_query():
+    db = MagicMock(spec=Session)
+    user = User(id=user_id, is_superadmin=False)
+
+    auth = AuthContext(db=db, user=user, memberships={"org-1": "owner"})
+
+    assert auth.user is user
+    assert not auth.is_superadmin
+    assert auth.is_member("org-1")
+    assert not auth.is_member("org-2")
+    db.execute.assert_not_called()
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from api.db.async_session import SyncSessionAdapter
+from api.utils.password_hashing import PasswordHasher, _hash
+from api.v1.models.user import User
+from api.v1.services.user import user_service
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify(hasher):
+    hashed = hasher.hash("Testpassword@123")
+
+    assert hashed.startswith("$2b$04$")
+    assert hasher.verify("Testpassword@123", hashed)
+    assert not hasher.verify("Wrongpassword@123", hashed)
+
+
+def test_rejects_work_when_pool_is_full(hasher):
+    release = threading.Event()
+    hasher._submit(lambda rounds: release.wait())
+    hasher._submit(lambda rounds: release.wait())
+
+    with pytest.raises(HTTPException) as exc:
+        hasher.hash("Testpassword@123")
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers == {"Retry-After": "1"}
+
+    release.set()
+    hasher.shutdown()
+    assert hasher.verify("Testpassword@123", hasher.hash("Testpassword@123"))
+
+
+def test_process_pool():
+    hasher = PasswordHasher(rounds=4, workers=1, use_processes=True)
+    try:
+        assert hasher.verify("Testpassword@123", hasher.hash("Testpassword@123"))
+    finally:
+        hasher.shutdown()
+
+
+def test_login_rehashes_password_with_old_work_factor(hasher):
+    user = User(email="user@example.com", password=_hash(5, "Testpassword@123"))
+    db = MagicMock(spec=Session)
+    db.query().filter().first.return_value = user
+
+    with patch("api.v1.services.user.password_hasher", hasher):
+        authenticated = user_service.authenticate_user(
+            db, email="user@example.com", password="Testpassword@123"
+        )
+
+    assert authenticated is user
+    assert user.password.startswith("$2b$04$")
+    db.commit.assert_called_once()
+
+    db.commit.reset_mock()
+    with patch("api.v1.services.user.password_hasher", hasher):
+        user_service.authenticate_user(
+            db, email="user@example.com", password="Testpassword@123"
+        )
+
+    db.commit.assert_not_called()
+
+
+def test_async_login_rehashes_password(hasher):
+    user = User(email="user@example.com", password=_hash(5, "Testpassword@123"))
+    db = MagicMock(spec=Session)
+    db.query().filter().first.return_value = user
+
+    with patch("api.v1.services.user.password_hasher", hasher), \
+            patch.object(hasher, "verify_and_update", side_effect=AssertionError("blocking")):
+        authenticated = asyncio.run(user_service.authenticate_user_async(
+            SyncSessionAdapter(db), email="user@example.com", password="Testpassword@123"
+        ))
+
+    assert authenticated is user
+    assert user.password.startswith("$2b$04$")
+    db.commit.assert_called_once()
+
+
+def test_change_password_awaits_the_hasher(hasher):
+    user = User(id="user-1", password=_hash(4, "Oldpassword@123"))
+    db = MagicMock(spec=Session)
+
+    blocking = AssertionError("blocking")
+    with patch("api.v1.services.user.password_hasher", hasher), \
+            patch.object(hasher, "hash", side_effect=blocking), \
+            patch.object(hasher, "verify", side_effect=blocking):
+        asyncio.run(user_service.change_password_async(
+            "Newpassword@123", user, db, old_password="Oldpassword@123"
+        ))
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(user_service.change_password_async(
+                "Otherpassword@123", user, db, old_password="Oldpassword@123"
+            ))
+
+    assert exc.value.status_code == 400
+    assert hasher.verify("Newpassword@123", user.password)
+    db.commit.assert_called_once()
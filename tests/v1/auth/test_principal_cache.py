@@ -0,0 +1,143 @@
+import pytest
+from datetime import datetime, timezone
+from uuid_extensions import uuid7
+
+from api.utils.cache import LocalCache, LocalSharedStore, SharedCache, create_cache
+from api.v1.models.user import User
+from api.v1.services.principal_cache import (
+    PrincipalCache,
+    invalidate_changed_principals,
+    principal_cache,
+)
+from api.v1.services.user import user_service
+
+pytestmark = pytest.mark.sqlite_tables([User])
+
+
+@pytest.fixture
+def user(session_factory):
+    with session_factory() as db:
+        user = User(
+            id=str(uuid7()),
+            email="principal@example.com",
+            password=user_service.hash_password("Testpassword@123"),
+            first_name="Principal",
+            is_superadmin=False,
+            created_at=datetime.now(timezone.utc),
+        )
+        db.add(user)
+        db.commit()
+        return user.id
+
+
+@pytest.fixture
+def enabled_cache():
+    principal_cache.enabled = True
+    yield principal_cache
+
+
+def test_current_user_is_cached_across_requests(enabled_cache, session_factory, user, selects):
+    token = user_service.create_access_token(user_id=user)
+
+    with session_factory() as db:
+        first = user_service.get_current_user(access_token=token, db=db)
+    with session_factory() as db:
+        second = user_service.get_current_user(access_token=token, db=db)
+
+        assert second.id == first.id == user
+        assert second.email == "principal@example.com"
+        assert second in db
+        assert len(selects) == 1
+
+        # the password hash is not cached and is loaded on access
+        assert user_service.verify_password("Testpassword@123", second.password)
+        assert len(selects) == 2
+
+    stats = enabled_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cached_user_changes_are_saved(enabled_cache, session_factory, user):
+    token = user_service.create_access_token(user_id=user)
+
+    with session_factory() as db:
+        user_service.get_current_user(access_token=token, db=db)
+    with session_factory() as db:
+        cached = user_service.get_current_user(access_token=token, db=db)
+        user_service.change_password(
+            new_password="Newpassword@123",
+            old_password="Testpassword@123",
+            user=cached,
+            db=db,
+        )
+
+    assert enabled_cache.backend.get(user) is None
+    with session_factory() as db:
+        saved = db.get(User, user)
+        assert user_service.verify_password("Newpassword@123", saved.password)
+
+
+def test_commits_invalidate_changed_users(session_factory, user):
+    cache = PrincipalCache(LocalCache(maxsize=10, ttl=60))
+    invalidate_changed_principals(session_factory, cache)
+
+    with session_factory() as db:
+        cache.set(db.get(User, user))
+    assert cache.backend.get(user) is not None
+
+    with session_factory() as db:
+        db.get(User, user).is_superadmin = True
+        db.rollback()
+    assert cache.backend.get(user) is not None
+
+    with session_factory() as db:
+        db.get(User, user).is_superadmin = True
+        db.commit()
+    assert cache.backend.get(user) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_shared_backend_round_trip(session_factory, user):
+    cache = PrincipalCache(SharedCache(LocalSharedStore(), prefix="principal", ttl=60))
+
+    with session_factory() as db:
+        original = db.get(User, user)
+        cache.set(original)
+        created_at = original.created_at
+
+    with session_factory() as db:
+        cached = cache.get(db, user)
+        assert cached.email == "principal@example.com"
+        assert cached.created_at == created_at
+
+
+def test_local_backend_evicts_least_recently_used():
+    cache = LocalCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.size() == 2
+
+
+def test_disabled_cache_is_bypassed(session_factory, user):
+    cache = PrincipalCache(LocalCache(maxsize=10, ttl=60), enabled=False)
+
+    with session_factory() as db:
+        cache.set(db.get(User, user))
+        assert cache.get(db, user) is None
+    assert cache.stats()["misses"] == 0
+
+
+def test_local_backend_ttl_is_capped_with_several_workers():
+    single = create_cache("", prefix="principal", maxsize=10, ttl=60, workers=1, max_local_ttl=5)
+    several = create_cache("", prefix="principal", maxsize=10, ttl=60, workers=4, max_local_ttl=5)
+    shared = create_cache("memory://", prefix="principal", maxsize=10, ttl=60, workers=4, max_local_ttl=5)
+
+    assert single._entries.ttl == 60
+    assert several._entries.ttl == 5
+    assert shared.ttl == 60
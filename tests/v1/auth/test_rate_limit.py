@@ -0,0 +1,159 @@
+import uuid
+
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.storage import MemoryStorage, storage_from_string
+from limits.strategies import STRATEGIES
+
+from api.utils.rate_limit import (
+    BatchedStorage,
+    RateLimitHeadersMiddleware,
+    SlidingWindowCounterRateLimiter,
+    StrategyLimiter,
+    organisation_key,
+    user_key,
+)
+from api.db.database import get_db
+from api.v1.models.user import User
+from api.v1.services.user import user_service
+from main import app
+
+
+def make_request(headers=None, path_params=None):
+    request = MagicMock(spec=Request)
+    request.headers = headers or {}
+    request.path_params = path_params or {}
+    request.query_params = {}
+    request.client.host = "203.0.113.7"
+    return request
+
+
+def test_sliding_window_counts_previous_window():
+    limiter = SlidingWindowCounterRateLimiter(MemoryStorage())
+    item = parse("4/minute")
+
+    with patch("api.utils.rate_limit.time.time", return_value=6000.0):
+        assert all(limiter.hit(item, "user:1") for _ in range(4))
+        assert not limiter.hit(item, "user:1")
+
+    # a quarter into the next window 3/4 of the previous window still counts
+    with patch("api.utils.rate_limit.time.time", return_value=6075.0):
+        assert limiter.get_window_stats(item, "user:1").remaining == 0
+        assert not limiter.test(item, "user:1")
+
+    with patch("api.utils.rate_limit.time.time", return_value=6105.0):
+        assert limiter.get_window_stats(item, "user:1").remaining == 2
+        assert limiter.hit(item, "user:1")
+
+
+def test_batched_storage_sends_hits_in_batches():
+    storage = storage_from_string("batched+memory://", batch_size=3, flush_interval=60)
+    assert isinstance(storage, BatchedStorage)
+
+    # the first hit is sent to learn the shared count
+    assert storage.incr("key", 60) == 1
+    assert storage.shared.get("key") == 1
+
+    assert storage.incr("key", 60) == 2
+    assert storage.incr("key", 60) == 3
+    assert storage.shared.get("key") == 1
+
+    storage.shared.incr("key", 60, amount=10)  # hits from another worker
+    assert storage.incr("key", 60) == 14
+    assert storage.shared.get("key") == 14
+
+
+def test_batched_storage_reads_previous_window_of_other_workers():
+    storage = storage_from_string("batched+memory://", batch_size=3, flush_interval=60)
+    other_worker = SlidingWindowCounterRateLimiter(storage.shared)
+    limiter = SlidingWindowCounterRateLimiter(storage)
+    item = parse("4/minute")
+
+    with patch("api.utils.rate_limit.time.time", return_value=6000.0):
+        assert all(other_worker.hit(item, "user:1") for _ in range(4))
+
+    with patch("api.utils.rate_limit.time.time", return_value=6075.0):
+        assert limiter.get_window_stats(item, "user:1").remaining == 1
+        assert limiter.hit(item, "user:1")
+        assert not limiter.hit(item, "user:1")
+
+
+def test_keys_by_user_then_ip():
+    token = user_service.create_access_token(user_id="user-1")
+    refresh = user_service.create_refresh_token(user_id="user-1")
+
+    assert user_key(make_request({"Authorization": f"Bearer {token}"})) == "user:user-1"
+    assert user_key(make_request({"Authorization": f"Bearer {refresh}"})) == "ip:203.0.113.7"
+    assert user_key(make_request({"Authorization": "Bearer invalid"})) == "ip:203.0.113.7"
+    assert organisation_key(make_request(path_params={"org_id": "org-1"})) == "org:org-1"
+
+
+def test_org_routes_share_a_limit_across_members():
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    app.dependency_overrides[user_service.get_current_user] = lambda: User(id="user-1")
+    org_id = str(uuid.uuid4())
+    remaining = []
+
+    with patch("api.v1.routes.product.product_service.search_products", return_value=[]):
+        for user_id in ("user-1", "user-2"):
+            token = user_service.create_access_token(user_id=user_id)
+            response = TestClient(app).get(
+                f"/api/v1/organisations/{org_id}/products/search",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            remaining.append(int(response.headers["RateLimit-Remaining"]))
+    app.dependency_overrides = {}
+
+    assert remaining[1] == remaining[0] - 1
+
+
+def test_limiter_uses_local_strategies():
+    limiter = StrategyLimiter(
+        key_func=user_key, strategy="sliding-window-counter", in_memory_fallback_enabled=True
+    )
+
+    assert isinstance(limiter.limiter, SlidingWindowCounterRateLimiter)
+    assert isinstance(limiter._fallback_limiter, SlidingWindowCounterRateLimiter)
+    assert "sliding-window-counter" not in STRATEGIES
+    assert type(StrategyLimiter(key_func=user_key, strategy="moving-window").limiter) is (
+        STRATEGIES["moving-window"]
+    )
+
+
+@pytest.fixture
+def client():
+    limiter = StrategyLimiter(key_func=user_key, strategy="sliding-window-counter")
+    app = FastAPI()
+    app.add_middleware(RateLimitHeadersMiddleware, limiter=limiter)
+
+    @app.exception_handler(HTTPException)
+    async def http_exception(request: Request, exc: HTTPException):
+        return JSONResponse(status_code=exc.status_code, content={"message": exc.detail})
+
+    @app.get("/limited")
+    @limiter.limit("2/minute")
+    def limited(request: Request):
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_rate_limit_headers(client):
+    response = client.get("/limited")
+
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "2"
+    assert response.headers["RateLimit-Remaining"] == "1"
+    assert 0 <= int(response.headers["RateLimit-Reset"]) <= 60
+    assert response.headers["RateLimit-Policy"] == "2;w=60"
+
+    client.get("/limited")
+    response = client.get("/limited")
+
+    assert response.status_code == 429
+    assert response.headers["RateLimit-Remaining"] == "0"
+    assert response.headers["Retry-After"] == response.headers["RateLimit-Reset"]
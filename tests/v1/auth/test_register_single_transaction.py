@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import MagicMock
+
+from api.v1.models import User, Profile, Region
+from api.v1.models.data_privacy import DataPrivacySetting
+from api.v1.models.notifications import NotificationSetting
+from api.v1.models.organisation import Organisation
+from api.v1.models.permissions.role import Role
+from api.v1.schemas.user import UserCreate
+from api.v1.services.user import user_service
+
+
+@pytest.fixture
+def db_session_mock():
+    db_session = MagicMock()
+    db_session.query().filter().first.return_value = None
+    db_session.query().filter().all.return_value = [
+        Role(id="role-admin", name="admin", is_builtin=True),
+        Role(id="role-user", name="user", is_builtin=True),
+    ]
+    return db_session
+
+
+def user_schema():
+    return UserCreate.model_construct(
+        first_name="Ada",
+        last_name="Lovelace",
+        email="ada@example.com",
+        password="Strin8Hsg263@",
+    )
+
+
+def added_objects(db_session_mock):
+    objects = []
+    for call in db_session_mock.add_all.call_args_list:
+        objects.extend(call.args[0])
+    objects.extend(call.args[0] for call in db_session_mock.add.call_args_list)
+    return objects
+
+
+def test_register_commits_once(db_session_mock):
+    """Registration writes every row in one flush and commits once"""
+
+    user_data, organisations = user_service.register(db=db_session_mock, schema=user_schema())
+
+    db_session_mock.commit.assert_called_once()
+    db_session_mock.flush.assert_called_once()
+    db_session_mock.refresh.assert_not_called()
+
+    added_types = {type(obj) for obj in added_objects(db_session_mock)}
+    assert {User, Organisation} <= added_types
+    # settings rows are created on first update
+    assert not added_types & {NotificationSetting, DataPrivacySetting, Profile, Region}
+
+    # owner association and admin role association
+    assert db_session_mock.execute.call_count == 2
+
+    assert user_data["email"] == "ada@example.com"
+    assert user_data["is_superadmin"] is False
+    assert "password" not in user_data
+
+    assert len(organisations) == 1
+    assert organisations[0].name == "ada@example.com's Organisation"
+    assert organisations[0].user_role == ["admin", "user"]
+
+
+def test_register_super_admin(db_session_mock):
+    user_data, _ = user_service.register(
+        db=db_session_mock, schema=user_schema(), is_superadmin=True
+    )
+
+    assert user_data["is_superadmin"] is True
+    db_session_mock.commit.assert_called_once()
+
+
+def test_register_creates_missing_admin_role(db_session_mock):
+    db_session_mock.query().filter().all.return_value = []
+
+    _, organisations = user_service.register(db=db_session_mock, schema=user_schema())
+
+    roles = [obj for obj in added_objects(db_session_mock) if isinstance(obj, Role)]
+    assert [role.name for role in roles] == ["admin"]
+    assert organisations[0].user_role == ["admin"]
+    db_session_mock.commit.assert_called_once()
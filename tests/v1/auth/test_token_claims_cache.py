@@ -0,0 +1,55 @@
+import pytest
+import time
+from unittest.mock import patch
+from jose import JWTError, jwt
+
+from api.utils.jwt_cache import TokenClaimsCache
+from api.utils.settings import settings
+from api.v1.services.user import user_service
+
+
+@pytest.fixture
+def cache():
+    return TokenClaimsCache(maxsize=2, secret_key=settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def test_claims_are_verified_once(cache):
+    token = user_service.create_access_token(user_id="user-1")
+
+    with patch("api.utils.jwt_cache.jwt.decode", wraps=jwt.decode) as decode:
+        assert cache.decode(token)["user_id"] == "user-1"
+        assert cache.decode(token)["user_id"] == "user-1"
+
+    decode.assert_called_once()
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_with_the_token(cache):
+    exp = int(time.time()) + 1
+    token = jwt.encode(
+        {"user_id": "user-1", "exp": exp, "type": "access"},
+        settings.SECRET_KEY,
+        settings.ALGORITHM,
+    )
+    cache.decode(token)
+
+    time.sleep(exp + 1.1 - time.time())
+    with pytest.raises(JWTError):
+        cache.decode(token)
+
+    assert cache.stats()["misses"] == 2
+
+
+def test_size_is_capped(cache):
+    for user_id in ("user-1", "user-2", "user-3"):
+        cache.decode(user_service.create_access_token(user_id=user_id))
+
+    assert cache.stats()["size"] == 2
+
+
+def test_invalid_tokens_are_not_cached(cache):
+    with pytest.raises(JWTError):
+        cache.decode("invalid")
+
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from fastapi import HTTPException
+from uuid_extensions import uuid7
+
+from api.utils.bloom_filter import BloomFilter
+from api.v1.models.revoked_token import RevokedToken
+from api.v1.services.token_revocation import TokenRevocationList
+from api.v1.services.user import user_service
+
+credentials_exception = HTTPException(status_code=401, detail="Could not validate credentials")
+
+pytestmark = pytest.mark.sqlite_tables([RevokedToken])
+
+
+@pytest.fixture
+def revocations(session_factory):
+    revocations = TokenRevocationList(session_factory, capacity=1000)
+    with patch("api.v1.services.user.token_revocations", revocations):
+        yield revocations
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    added = [str(uuid7()) for _ in range(1000)]
+    for item in added:
+        bloom.add(item)
+
+    assert all(item in bloom for item in added)
+    false_positives = sum(str(uuid7()) in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+def test_revoked_tokens_are_rejected(revocations, session_factory, record_statements):
+    access = user_service.create_access_token(user_id="user-1")
+    refresh = user_service.create_refresh_token(user_id="user-1")
+    other = user_service.create_access_token(user_id="user-1")
+
+    with session_factory() as db:
+        user_service.revoke_tokens(db, access, refresh)
+
+    with pytest.raises(HTTPException):
+        user_service.verify_access_token(access, credentials_exception)
+    with pytest.raises(HTTPException):
+        user_service.verify_refresh_token(refresh, credentials_exception)
+
+    queries = record_statements()
+
+    assert user_service.verify_access_token(other, credentials_exception).id == "user-1"
+    assert queries == []
+
+
+def test_sync_picks_up_revocations_of_other_workers(session_factory):
+    worker = TokenRevocationList(session_factory, capacity=1000)
+    other_worker = TokenRevocationList(session_factory, capacity=1000)
+    worker.rebuild()
+
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
+    with session_factory() as db:
+        other_worker.revoke(db, "jti-1", expires_at)
+
+    assert not worker.is_revoked("jti-1")
+    worker.sync()
+    assert worker.is_revoked("jti-1")
+
+
+def test_rebuild_drops_expired_revocations(session_factory):
+    revocations = TokenRevocationList(session_factory, capacity=1000)
+    now = datetime.now(timezone.utc)
+
+    with session_factory() as db:
+        revocations.revoke(db, "expired", now - timedelta(minutes=1))
+        revocations.revoke(db, "active", now + timedelta(minutes=10))
+
+    revocations.rebuild()
+
+    assert "expired" not in revocations.filter
+    assert revocations.is_revoked("active")
+    with session_factory() as db:
+        assert [jti for (jti,) in db.query(RevokedToken.jti)] == ["active"]
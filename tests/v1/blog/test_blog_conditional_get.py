@@ -0,0 +1,121 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from api.db.database import get_db
+from api.utils.conditional import etag_matches, parse_policies
+from api.v1.models.blog import Blog, BlogDislike, BlogLike
+from api.v1.models.user import User
+from api.v1.services.user import user_service
+
+client = TestClient(app)
+
+pytestmark = pytest.mark.sqlite_tables([Blog, BlogLike, BlogDislike])
+
+
+@pytest.fixture
+def db(session_factory):
+    db = session_factory()
+    db.add_all(
+        Blog(id=f"blog-{i}", author_id="author", title=f"blog {i}", content="content")
+        for i in range(3)
+    )
+    db.commit()
+
+    app.dependency_overrides[get_db] = lambda: db
+    yield db
+    app.dependency_overrides = {}
+
+
+def test_validators_are_sent(db):
+    response = client.get("/api/v1/blogs/blog-1")
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["cache-control"] == "public, no-cache"
+    assert "last-modified" in response.headers
+
+
+def test_matching_etag_skips_the_route(db, selects):
+    etag = client.get("/api/v1/blogs/blog-1").headers["etag"]
+    selects.clear()
+
+    response = client.get("/api/v1/blogs/blog-1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert len(selects) == 1
+    assert "max(blogs.updated_at)" in selects[0]
+
+
+def test_etag_changes_with_writes(db):
+    etag = client.get("/api/v1/blogs/").headers["etag"]
+
+    db.query(Blog).filter(Blog.id == "blog-2").delete()
+    db.commit()
+    response = client.get("/api/v1/blogs/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["data"]["total"] == 2
+
+
+def test_etag_depends_on_query_string(db):
+    first = client.get("/api/v1/blogs/", params={"limit": 1}).headers["etag"]
+
+    response = client.get("/api/v1/blogs/", params={"limit": 2}, headers={"If-None-Match": first})
+
+    assert response.status_code == 200
+
+
+def test_reactions_change_the_etag(db):
+    app.dependency_overrides[user_service.get_current_user] = lambda: User(id="user-1")
+    single = client.get("/api/v1/blogs/blog-1").headers["etag"]
+    listing = client.get("/api/v1/blogs/").headers["etag"]
+    other = client.get("/api/v1/blogs/blog-2").headers["etag"]
+
+    assert client.post("/api/v1/blogs/blog-1/like").status_code == 200
+
+    response = client.get("/api/v1/blogs/blog-1", headers={"If-None-Match": single})
+    assert response.status_code == 200
+    assert response.json()["data"]["likes_count"] == 1
+    assert client.get("/api/v1/blogs/", headers={"If-None-Match": listing}).status_code == 200
+    # reactions to other posts leave the tag of a post alone
+    assert client.get("/api/v1/blogs/blog-2", headers={"If-None-Match": other}).status_code == 304
+
+    single = response.headers["etag"]
+    assert client.post("/api/v1/blogs/blog-1/dislike").status_code == 200
+
+    response = client.get("/api/v1/blogs/blog-1", headers={"If-None-Match": single})
+    assert response.status_code == 200
+    assert response.json()["data"]["dislikes_count"] == 1
+
+
+def test_if_modified_since_ignores_removable_reactions(db):
+    last_modified = client.get("/api/v1/blogs/blog-1").headers["last-modified"]
+
+    # removing a reaction would not move Last-Modified
+    response = client.get("/api/v1/blogs/blog-1", headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == 200
+
+
+def test_missing_row_is_left_to_the_route(db):
+    response = client.get("/api/v1/blogs/missing", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+
+
+def test_etag_matches():
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('W/"abc"', 'W/"xyz", W/"abc"')
+    assert not etag_matches('W/"abc"', 'W/"xyz"')
+
+
+def test_parse_policies():
+    assert parse_policies("blogs=public, max-age=60; faqs=public, max-age=300;") == {
+        "blogs": "public, max-age=60",
+        "faqs": "public, max-age=300",
+    }
@@ -0,0 +1,55 @@
+import json
+import pytest
+from fastapi import HTTPException
+from uuid_extensions import uuid7
+
+from api.utils.fieldsets import parse_fields
+from api.utils.pagination import paginated_response
+from api.v1.models.blog import Blog
+
+pytestmark = pytest.mark.sqlite_tables([Blog])
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add_all(
+            Blog(id=str(uuid7()), author_id="author", title=f"blog {i}", content="x" * 10000)
+            for i in range(3)
+        )
+        db.commit()
+    return session_factory
+
+
+@pytest.fixture
+def selects(session_factory, record_statements):
+    return record_statements(lambda statement: "count(" not in statement.lower())
+
+
+def items(session_factory, **kwargs):
+    with session_factory() as db:
+        response = paginated_response(db=db, model=Blog, skip=0, limit=2, **kwargs)
+    return json.loads(response.body)["data"]["items"]
+
+
+def test_only_selected_columns_are_loaded(session_factory, selects):
+    fields = parse_fields(Blog, "title, excerpt")
+
+    assert [sorted(item) for item in items(session_factory, fields=fields)] == [["excerpt", "id", "title"]] * 2
+    assert "blogs.content" not in selects[0]
+
+    # the cursor columns are loaded but not returned
+    assert sorted(items(session_factory, fields=fields, cursor="")[0]) == ["excerpt", "id", "title"]
+
+
+def test_all_fields_without_fieldset(session_factory):
+    assert "content" in items(session_factory)[0]
+    assert parse_fields(Blog, "") is None
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as exc:
+        parse_fields(Blog, "title,author")
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail.startswith("Cannot select 'author', allowed: id, created_at")
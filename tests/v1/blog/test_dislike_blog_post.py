@@ -8,6 +8,7 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from api.v1.services.user import user_service
 from api.v1.models import User, Blog, BlogDislike
+from api.v1.services.reaction_counts import Reaction
 
 client = TestClient(app)
 
@@ -73,26 +74,24 @@ def make_request(blog_id, token):
     )
 
 
-@patch("api.v1.services.blog.BlogService.create_blog_dislike")
+@patch("api.v1.services.blog.reaction_counts.react")
 def test_successful_dislike(
-    mock_create_blog_dislike,
+    mock_react,
     mock_db_session, 
     test_user, 
     test_blog,
     test_blog_dislike,
     access_token_user
 ):
-    # mock current-user AND blog-post
-    mock_db_session.query().filter().first.side_effect = [test_user, test_blog]
-
-    # mock existing-blog-dislike AND new-blog-dislike
-    mock_db_session.query().filter_by().first.side_effect = None
-
-    # mock created-blog-dislike
-    mock_create_blog_dislike.return_value = test_blog_dislike
-
-    # mock dislike-count
-    mock_db_session.query().filter_by().count.return_value = 1
+    # mock current-user
+    mock_db_session.query().filter().first.return_value = test_user
+
+    # mock created-blog-dislike AND dislike-count
+    mock_react.return_value = Reaction(
+        {column: getattr(test_blog_dislike, column) for column in BlogDislike.__table__.c.keys()},
+        0,
+        1,
+    )
 
     resp = make_request(test_blog.id, access_token_user)
     resp_d = resp.json()
@@ -110,7 +109,9 @@ def test_successful_dislike(
 
 
 # Test for double dislike
+@patch("api.v1.services.blog.reaction_counts.react")
 def test_double_dislike(
+    mock_react,
     mock_db_session, 
     test_user, 
     test_blog, 
@@ -118,8 +119,8 @@ def test_double_dislike(
     access_token_user,
 ):
     mock_user_service.get_current_user = test_user
-    mock_db_session.query.return_value.filter.return_value.first.return_value = test_blog
-    mock_db_session.query.return_value.filter_by.return_value.first.return_value = test_blog_dislike
+    mock_db_session.query.return_value.filter.return_value.first.return_value = test_user
+    mock_react.return_value = Reaction(None, 0, 1)
 
     ### TEST ATTEMPT FOR MULTIPLE DISLIKING... ###
     resp = make_request(test_blog.id, access_token_user)
@@ -127,13 +128,15 @@ def test_double_dislike(
     assert resp.json()['message'] == "You have already disliked this blog post"
 
 # Test for wrong blog id
+@patch("api.v1.services.blog.reaction_counts.react")
 def test_wrong_blog_id(
+    mock_react,
     mock_db_session, 
     test_user,
     access_token_user,
 ):
     mock_user_service.get_current_user = test_user
-    mock_db_session.query().filter().first.return_value = None
+    mock_react.return_value = None
 
     ### TEST REQUEST WITH WRONG blog_id ###
     ### using random uuid instead of blog1.id  ###
@@ -9,6 +9,7 @@ from unittest.mock import patch, MagicMock
 from api.v1.services.blog import BlogService
 from api.v1.services.user import user_service
 from api.v1.models import User, Blog, BlogLike
+from api.v1.services.reaction_counts import Reaction
 
 client = TestClient(app)
 
@@ -74,26 +75,24 @@ def make_request(blog_id, token):
     )
 
 # Test for successful like
-@patch("api.v1.services.blog.BlogService.create_blog_like")
+@patch("api.v1.services.blog.reaction_counts.react")
 def test_successful_like(
-    mock_create_blog_like,
+    mock_react,
     mock_db_session, 
     test_user, 
     test_blog,
     test_blog_like,
     access_token_user
 ):
-    # mock current-user AND blog-post
-    mock_db_session.query().filter().first.side_effect = [test_user, test_blog]
-
-    # mock existing-blog-like
-    mock_db_session.query().filter_by().first.return_value = None
-
-    # mock created-blog-like
-    mock_create_blog_like.return_value = test_blog_like
-
-    # mock like-count
-    mock_db_session.query().filter_by().count.return_value = 1
+    # mock current-user
+    mock_db_session.query().filter().first.return_value = test_user
+
+    # mock created-blog-like AND like-count
+    mock_react.return_value = Reaction(
+        {column: getattr(test_blog_like, column) for column in BlogLike.__table__.c.keys()},
+        1,
+        0,
+    )
 
     resp = make_request(test_blog.id, access_token_user)
     resp_d = resp.json()
@@ -112,7 +111,9 @@ def test_successful_like(
 
 
 # Test for double like
+@patch("api.v1.services.blog.reaction_counts.react")
 def test_double_like(
+    mock_react,
     mock_db_session, 
     test_user, 
     test_blog, 
@@ -120,8 +121,8 @@ def test_double_like(
     access_token_user,
 ):
     mock_user_service.get_current_user = test_user
-    mock_db_session.query.return_value.filter.return_value.first.return_value = test_blog
-    mock_db_session.query.return_value.filter_by.return_value.first.return_value = test_blog_like
+    mock_db_session.query.return_value.filter.return_value.first.return_value = test_user
+    mock_react.return_value = Reaction(None, 1, 0)
 
     ### TEST ATTEMPT FOR MULTIPLE DISLIKING... ###
     resp = make_request(test_blog.id, access_token_user)
@@ -129,14 +130,16 @@ def test_double_like(
     assert resp.json()['message'] == "You have already liked this blog post"
 
 # Test for wrong blog id
+@patch("api.v1.services.blog.reaction_counts.react")
 def test_wrong_blog_id(
+    mock_react,
     # mock_fetch_blog,
     mock_db_session, 
     test_user,
     access_token_user,
 ):
     mock_user_service.get_current_user = test_user
-    mock_db_session.query().filter().first.return_value = None
+    mock_react.return_value = None
 
     ### TEST REQUEST WITH WRONG blog_id ###
     ### using random uuid instead of blog1.id  ###
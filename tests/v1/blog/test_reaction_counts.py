@@ -0,0 +1,161 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from api.v1.models.blog import Blog, BlogDislike, BlogLike
+from api.v1.models.comment import Comment, CommentDislike, CommentLike
+from api.v1.services.reaction_counts import count_reactions, reaction_counts
+
+EDITED_AT = datetime(2024, 1, 1)
+
+pytestmark = pytest.mark.sqlite_tables(
+    [Blog, BlogLike, BlogDislike, Comment, CommentLike, CommentDislike]
+)
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    count_reactions(session_factory)
+    with session_factory() as db:
+        db.add(Blog(
+            id="blog-1", author_id="author", title="Blog", content="content",
+            updated_at=EDITED_AT,
+        ))
+        db.add(Comment(
+            id="comment-1", user_id="author", blog_id="blog-1", content="comment",
+            updated_at=EDITED_AT,
+        ))
+        db.commit()
+    return session_factory
+
+
+def counts(session_factory, parent, parent_id):
+    with session_factory() as db:
+        return reaction_counts.counts(db, parent, parent_id)
+
+
+def test_reactions_adjust_counts(session_factory):
+    with session_factory() as db:
+        db.add_all(BlogLike(blog_id="blog-1", user_id=f"user-{i}") for i in range(3))
+        db.add(BlogDislike(blog_id="blog-1", user_id="user-3"))
+        db.add(CommentLike(comment_id="comment-1", user_id="user-1"))
+        db.commit()
+
+    assert counts(session_factory, Blog, "blog-1") == (3, 1)
+    assert counts(session_factory, Comment, "comment-1") == (1, 0)
+
+    with session_factory() as db:
+        db.delete(db.query(BlogLike).first())
+        db.delete(db.query(BlogDislike).first())
+        db.commit()
+
+    assert counts(session_factory, Blog, "blog-1") == (2, 0)
+
+
+def test_counts_are_not_edits(session_factory):
+    with session_factory() as db:
+        db.add(BlogLike(blog_id="blog-1", user_id="user-1"))
+        db.add(CommentDislike(comment_id="comment-1", user_id="user-1"))
+        db.commit()
+
+        # bulk deletes bypass the session's reaction tracking
+        db.query(BlogLike).delete()
+        db.commit()
+        reaction_counts.reconcile(db)
+
+        assert db.get(Blog, "blog-1").updated_at == EDITED_AT
+        assert db.get(Comment, "comment-1").updated_at == EDITED_AT
+
+
+def test_rollback_discards_counts(session_factory):
+    with session_factory() as db:
+        db.add(BlogLike(blog_id="blog-1", user_id="user-1"))
+        db.flush()
+        db.rollback()
+
+    assert counts(session_factory, Blog, "blog-1") == (0, 0)
+
+
+def test_loaded_parent_is_kept_current(session_factory, selects):
+    with session_factory() as db:
+        blog = db.get(Blog, "blog-1")
+        selects.clear()
+
+        db.add(BlogLike(blog_id="blog-1", user_id="user-1"))
+        db.flush()
+
+        assert blog.likes_count == 1
+        assert selects == []
+
+
+def test_cascaded_deletes_are_counted(session_factory):
+    with session_factory() as db:
+        comment = db.get(Comment, "comment-1")
+        second = Comment(id="comment-2", user_id="author", blog_id="blog-1", content="comment")
+        db.add(second)
+        second.likes.append(CommentLike(user_id="user-1"))
+        comment.dislikes.append(CommentDislike(user_id="user-1"))
+        db.commit()
+
+        db.delete(comment)
+        db.commit()
+
+    assert counts(session_factory, Comment, "comment-2") == (1, 0)
+
+
+def test_reconcile_rebuilds_counts(session_factory):
+    with session_factory() as db:
+        db.add_all(BlogLike(blog_id="blog-1", user_id=f"user-{i}") for i in range(3))
+        db.commit()
+
+        # bulk deletes bypass the session's reaction tracking
+        db.query(BlogLike).filter(BlogLike.user_id == "user-0").delete()
+        db.commit()
+        assert reaction_counts.counts(db, Blog, "blog-1") == (3, 0)
+
+        assert reaction_counts.reconcile(db) == {"blogs": 1, "comments": 0}
+        assert reaction_counts.counts(db, Blog, "blog-1") == (2, 0)
+        assert reaction_counts.reconcile(db) == {"blogs": 0, "comments": 0}
+
+
+def test_react_flips_reactions(session_factory):
+    with session_factory() as db:
+        liked = reaction_counts.react(db, BlogLike, "blog-1", "user-1", ip_address="10.0.0.1")
+        assert liked.created["user_id"] == "user-1"
+        assert liked.created["ip_address"] == "10.0.0.1"
+        assert (liked.likes, liked.dislikes) == (1, 0)
+
+        # repeating a reaction inserts nothing
+        assert reaction_counts.react(db, BlogLike, "blog-1", "user-1") == (None, 1, 0)
+
+        disliked = reaction_counts.react(db, BlogDislike, "blog-1", "user-1")
+        assert (disliked.likes, disliked.dislikes) == (0, 1)
+        assert db.query(BlogLike).count() == 0
+
+    assert counts(session_factory, Blog, "blog-1") == (0, 1)
+
+
+def test_react_is_not_an_edit(session_factory):
+    with session_factory() as db:
+        reaction_counts.react(db, CommentLike, "comment-1", "user-1")
+        # nothing changes, so the comment is not updated at all
+        reaction_counts.react(db, CommentLike, "comment-1", "user-1")
+        reaction_counts.react(db, CommentDislike, "comment-1", "user-1")
+
+        comment = db.get(Comment, "comment-1")
+        assert (comment.likes_count, comment.dislikes_count) == (0, 1)
+        assert comment.updated_at == EDITED_AT
+
+
+def test_react_to_missing_parent(session_factory):
+    with session_factory() as db:
+        assert reaction_counts.react(db, CommentLike, "missing", "user-1") is None
+        assert db.query(CommentLike).count() == 0
+
+
+def test_reactions_are_unique_per_user(session_factory):
+    with session_factory() as db:
+        db.add_all([BlogLike(blog_id="blog-1", user_id="user-1") for _ in range(2)])
+        with pytest.raises(IntegrityError):
+            db.commit()
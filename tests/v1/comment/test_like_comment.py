@@ -8,6 +8,7 @@ from api.v1.models import User, Blog, Comment
 from api.v1.services.user import user_service
 from uuid_extensions import uuid7
 from unittest.mock import MagicMock
+from sqlalchemy.exc import IntegrityError
 from faker import Faker
 
 fake = Faker()
@@ -105,4 +106,24 @@ def test_like_comment_twice(
         print(response.json())
 
     assert response.status_code == 200, f"Expected status code 201, got {response.status_code}"
-    assert response.json()['message'] == "You've already liked this comment"
\ No newline at end of file
+    assert response.json()['message'] == "You've already liked this comment"
+
+def test_like_comment_concurrently(
+    mock_db_session,
+    test_user,
+    test_comment,
+    access_token_user1,
+):
+    mock_db_session.get.side_effect = lambda model, ident: test_comment
+    mock_db_session.query.return_value.filter.return_value.first.return_value = test_user
+    mock_db_session.query.return_value.filter_by.return_value.first.return_value = None
+
+    # another request inserted the like after the check
+    mock_db_session.commit.side_effect = IntegrityError("INSERT", {}, Exception())
+
+    headers = {'Authorization': f'Bearer {access_token_user1}'}
+    response = client.post(f"/api/v1/comments/{test_comment.id}/like", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()['message'] == "You've already liked this comment"
+    mock_db_session.rollback.assert_called_once()
@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from main import app
+from api.db.pool import InstrumentedQueuePool, pool_status, register_pool_logging
+from api.v1.models.user import User
+from api.v1.services.user import user_service
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def pool_engine():
+    engine = create_engine(
+        "sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1
+    )
+    register_pool_logging(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_pool_status_counts_checkouts(pool_engine):
+    with pool_engine.connect() as conn:
+        conn.execute(text("select 1"))
+        status = pool_status(pool_engine.pool)
+        assert status["checked_out"] == 1
+        assert status["size"] == 1
+
+    status = pool_status(pool_engine.pool)
+    assert status["checked_out"] == 0
+    assert status["idle"] == 1
+    assert status["checkouts"] == 1
+    assert status["max_wait_ms"] >= 0
+
+
+def test_max_overflow_survives_recreate(pool_engine):
+    assert pool_status(pool_engine.pool)["max_overflow"] == 1
+
+    pool_engine.dispose()
+    assert pool_status(pool_engine.pool)["max_overflow"] == 1
+
+
+def test_overflow_checkout_is_logged(pool_engine):
+    with patch("api.db.pool.db_logger") as mock_logger:
+        with pool_engine.connect(), pool_engine.connect():
+            assert pool_status(pool_engine.pool)["overflow"] == 1
+
+    assert "overflow checkout" in mock_logger.warning.call_args[0][0]
+
+
+def test_get_pool_status_superadmin():
+    app.dependency_overrides[user_service.get_current_super_admin] = lambda: User(
+        id="superadmin_id", email="admin@gmail.com", is_superadmin=True
+    )
+    response = client.get("/api/v1/database/pool")
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert "checked_out" in response.json()["data"]["primary"]
+
+
+def test_get_pool_status_unauthenticated():
+    response = client.get("/api/v1/database/pool")
+
+    assert response.status_code == 401
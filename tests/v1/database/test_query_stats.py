@@ -0,0 +1,117 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from api.db.instrumentation import (
+    QueryStatsMiddleware,
+    register_query_instrumentation,
+    statement_shape,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    register_query_instrumentation(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, headers=True)
+
+    @app.get("/products")
+    def list_products():
+        with engine.connect() as conn:
+            for product_id in range(6):
+                conn.execute(text(f"SELECT {product_id}"))
+        return {}
+
+    @app.get("/failing")
+    def failing_statement():
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("SELECT * FROM missing"))
+            except OperationalError:
+                pass
+            conn.execute(text("SELECT 1"))
+        return {}
+
+    @app.get("/single")
+    def single_product():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {}
+
+    return TestClient(app)
+
+
+def test_statement_shape_ignores_literals_and_in_lists():
+    first = statement_shape("SELECT * FROM users WHERE id IN (?, ?, ?) AND age > 30")
+    second = statement_shape("SELECT *  FROM users\nWHERE id IN (?) AND age > 41")
+
+    assert first == second
+
+
+def test_query_count_headers(client):
+    response = client.get("/single")
+
+    assert response.headers["x-db-queries"] == "1"
+    assert response.headers["server-timing"].startswith("db;dur=")
+
+
+def test_repeated_statements_logged_as_n_plus_one(client):
+    with patch("api.db.instrumentation.db_logger") as mock_logger:
+        response = client.get("/products")
+
+    assert response.headers["x-db-queries"] == "6"
+    message = mock_logger.warning.call_args[0][0]
+    assert "Possible N+1 query" in message
+    assert "list_products" in message
+
+
+def test_no_warning_below_threshold(client):
+    with patch("api.db.instrumentation.db_logger") as mock_logger:
+        client.get("/single")
+
+    mock_logger.warning.assert_not_called()
+
+
+def test_queries_outside_requests_are_ignored(engine):
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_headers_are_opt_in(engine):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, headers=False)
+
+    @app.get("/single")
+    def single_product():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {}
+
+    response = TestClient(app).get("/single")
+
+    assert "x-db-queries" not in response.headers
+    assert "server-timing" not in response.headers
+
+
+def test_failing_statements_leave_no_state_on_the_connection(client, engine):
+    response = client.get("/failing")
+
+    assert response.headers["x-db-queries"] == "1"
+    with engine.connect() as conn:
+        assert "query_start_time" not in conn.info
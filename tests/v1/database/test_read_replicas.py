@@ -0,0 +1,123 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from starlette.middleware.sessions import SessionMiddleware
+
+from api.db import replicas
+from api.db.replicas import (
+    LAST_WRITE_SESSION_KEY,
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    ReplicaSession,
+    RequestWriteState,
+)
+
+
+def make_router(count=2, **kwargs):
+    router = ReplicaRouter(
+        urls=[f"sqlite:///file:replica{i}?mode=memory&uri=true" for i in range(count)],
+        lag_check_interval=3600,
+        **kwargs,
+    )
+    for replica in router.replicas:
+        replica.lag_checked_at = time.monotonic()
+    return router
+
+
+def test_router_disabled_without_replicas():
+    router = ReplicaRouter(urls=[])
+
+    assert not router.enabled
+    assert router.choose() is None
+
+
+def test_round_robin_cycles_replicas():
+    router = make_router(count=2)
+
+    chosen = [router.choose() for _ in range(4)]
+
+    assert chosen == router.replicas * 2
+
+
+def test_least_connections_picks_idle_replica():
+    router = make_router(count=2, strategy="least_connections")
+    busy, idle = router.replicas
+
+    with patch.object(busy, "in_use", return_value=3), \
+            patch.object(idle, "in_use", return_value=1):
+        assert router.choose() is idle
+
+
+def test_lagging_replicas_fall_back_to_primary():
+    router = make_router(count=2, max_lag=5)
+    router.replicas[0].lag = 30
+
+    assert router.choose() is router.replicas[1]
+
+    router.replicas[1].lag = 30
+    assert router.choose() is None
+
+
+def test_invalid_strategy():
+    with pytest.raises(ValueError):
+        ReplicaRouter(urls=[], strategy="random")
+
+
+def test_recent_session_write_is_sticky():
+    router = make_router(count=1, sticky_seconds=5)
+
+    assert router.choose({LAST_WRITE_SESSION_KEY: time.time()}) is None
+    assert router.choose({LAST_WRITE_SESSION_KEY: time.time() - 60}) is not None
+
+
+def test_request_write_is_sticky():
+    router = make_router(count=1)
+    state = RequestWriteState()
+    token = replicas._request_write_state.set(state)
+    try:
+        assert router.choose() is not None
+        replicas.mark_request_write()
+        assert router.choose() is None
+    finally:
+        replicas._request_write_state.reset(token)
+
+
+def test_replica_session_switches_to_primary_after_write():
+    router = make_router(count=1)
+    primary = create_engine("sqlite://")
+    session = ReplicaSession(primary=primary, replica=router.replicas[0])
+    state = RequestWriteState()
+    token = replicas._request_write_state.set(state)
+    try:
+        assert session.get_bind() is router.replicas[0].engine
+        state.wrote = True
+        assert session.get_bind() is primary
+    finally:
+        replicas._request_write_state.reset(token)
+        session.close()
+
+
+def test_middleware_records_write_in_client_session():
+    router = make_router(count=1)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, router=router)
+    app.add_middleware(SessionMiddleware, secret_key="secret")
+
+    @app.post("/write")
+    def write():
+        replicas.mark_request_write()
+        return {}
+
+    @app.get("/read")
+    def read(request: Request):
+        return {"replica": router.choose(request.session) is not None}
+
+    client = TestClient(app)
+
+    assert client.get("/read").json() == {"replica": True}
+    client.post("/write")
+    assert client.get("/read").json() == {"replica": False}
@@ -0,0 +1,114 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from main import app
+from api.db.slow_queries import (
+    SlowQueryRecorder,
+    redact_parameters,
+    register_slow_query_log,
+)
+from api.utils.settings import settings
+from api.v1.models.product import Product
+from api.v1.models.user import User
+from api.v1.services.product import product_service
+from api.v1.services.user import user_service
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def recorder():
+    recorder = SlowQueryRecorder(buffer_size=2)
+    recorder._explainer = MagicMock()
+    return recorder
+
+
+def test_redact_parameters_hides_strings():
+    redacted = redact_parameters({"email": "user@gmail.com", "limit": 10, "ids": ("a", None)})
+
+    assert redacted == {
+        "email": "<redacted str(14)>",
+        "limit": 10,
+        "ids": ["<redacted str(1)>", None],
+    }
+
+
+def test_slow_statement_recorded_with_service_method(recorder):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Product.metadata.create_all(bind=engine, tables=[Product.__table__])
+    register_slow_query_log(engine, recorder)
+    db = sessionmaker(bind=engine)()
+
+    with patch.object(settings, "DB_SLOW_QUERY_MS", 0), \
+            patch("api.db.slow_queries.db_logger") as mock_logger:
+        product_service.fetch_all(db, name="chair")
+
+    entry = recorder.snapshot()["queries"][0]
+    assert entry["service"] == "api.v1.services.product.ProductService.fetch_all"
+    assert entry["params"] == ["<redacted str(6)>"]
+    assert "Slow query" in mock_logger.warning.call_args[0][0]
+    recorder._explainer.submit.assert_not_called()
+    db.close()
+
+
+def test_queries_ring_buffer_is_bounded(recorder):
+    engine = MagicMock()
+    engine.dialect.name = "sqlite"
+
+    for i in range(3):
+        recorder.record(engine, f"SELECT {i}", (), 1.0)
+
+    assert [q["sql"] for q in recorder.snapshot()["queries"]] == ["SELECT 2", "SELECT 1"]
+
+
+def test_explain_runs_once_per_statement_shape(recorder):
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+
+    with patch.object(settings, "DB_SLOW_QUERY_EXPLAIN", True):
+        recorder.record(engine, "SELECT * FROM users WHERE id = %(id)s", {"id": "1"}, 1.0)
+        recorder.record(engine, "SELECT * FROM users WHERE id = %(id)s", {"id": "2"}, 1.0)
+
+    assert recorder._explainer.submit.call_count == 1
+
+
+def test_async_engine_statements_are_not_explained(recorder):
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+
+    with patch.object(settings, "DB_SLOW_QUERY_EXPLAIN", True):
+        recorder.record(engine, "SELECT * FROM users", (), 1.0, explain=False)
+
+    recorder._explainer.submit.assert_not_called()
+    assert recorder.snapshot()["queries"][0]["sql"] == "SELECT * FROM users"
+
+
+def test_explain_stores_plan(recorder):
+    engine = MagicMock()
+    conn = engine.connect.return_value.__enter__.return_value
+    conn.exec_driver_sql.return_value.all.return_value = [("Seq Scan on users",)]
+
+    recorder.explain(engine, "SELECT * FROM users", {}, "SELECT * FROM users")
+
+    conn.exec_driver_sql.assert_called_once_with(
+        "EXPLAIN (ANALYZE off) SELECT * FROM users", {}
+    )
+    assert recorder.snapshot()["plans"][0]["plan"] == "Seq Scan on users"
+
+
+def test_get_slow_queries_superadmin():
+    app.dependency_overrides[user_service.get_current_super_admin] = lambda: User(
+        id="superadmin_id", email="admin@gmail.com", is_superadmin=True
+    )
+    response = client.get("/api/v1/database/slow-queries")
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert set(response.json()["data"]) == {"threshold_ms", "queries", "plans"}
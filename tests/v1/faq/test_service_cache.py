@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+from api.utils.cache import LocalCache, create_cache
+from api.v1.models.billing_plan import BillingPlan
+from api.v1.models.faq import FAQ
+from api.v1.services.faq import faq_service
+from api.v1.services.service_cache import (
+    ServiceCache,
+    invalidate_written_tags,
+    service_cache,
+    table_tags,
+    write_tags,
+)
+
+pytestmark = pytest.mark.sqlite_tables([FAQ])
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    invalidate_written_tags(session_factory)
+    with session_factory() as db:
+        db.add(FAQ(question="What is it?", answer="A boilerplate", category="General"))
+        db.commit()
+    return session_factory
+
+
+@pytest.fixture
+def enabled_cache():
+    service_cache.enabled = True
+    yield service_cache
+
+
+def grouped(session_factory, **query_params):
+    with session_factory() as db:
+        return faq_service.fetch_all_grouped_by_category(db, **query_params)
+
+
+def test_results_are_cached_across_sessions(enabled_cache, session_factory, selects):
+    assert grouped(session_factory) == grouped(session_factory)
+    assert len(selects) == 1
+
+    grouped(session_factory, question="What")
+    assert len(selects) == 2
+    assert enabled_cache.stats()["hits"] == 1
+
+
+def test_commits_invalidate_tags(enabled_cache, session_factory, selects):
+    grouped(session_factory)
+
+    with session_factory() as db:
+        db.add(FAQ(question="Is it free?", answer="Yes", category="Billing"))
+        db.flush()
+        # not invalidated before the commit
+        assert grouped(session_factory) == {
+            "General": [{"question": "What is it?", "answer": "A boilerplate"}]
+        }
+        db.commit()
+
+    assert sorted(grouped(session_factory)) == ["Billing", "General"]
+    assert len(selects) == 2
+
+
+def test_bulk_writes_invalidate_tags(enabled_cache, session_factory):
+    grouped(session_factory)
+
+    with session_factory() as db:
+        db.query(FAQ).update({FAQ.category: "Product"})
+        db.commit()
+
+    assert list(grouped(session_factory)) == ["Product"]
+
+
+def test_rollbacks_keep_entries(enabled_cache, session_factory, selects):
+    grouped(session_factory)
+
+    with session_factory() as db:
+        db.add(FAQ(question="Is it free?", answer="Yes", category="Billing"))
+        db.flush()
+        db.rollback()
+
+    grouped(session_factory)
+    assert len(selects) == 1
+
+
+def test_org_tags():
+    cache = ServiceCache(LocalCache(maxsize=100, ttl=60))
+    calls = []
+
+    @cache.cached("org:{organisation_id}")
+    def plans(db, organisation_id):
+        calls.append(organisation_id)
+        return [organisation_id]
+
+    plans(None, "org-1"), plans(None, "org-2")
+    cache.invalidate("org:org-2")
+    plans(None, "org-1"), plans(None, "org-2")
+    assert calls == ["org-1", "org-2", "org-2"]
+
+    cache.invalidate("org:*")
+    plans(None, "org-1"), plans(None, "org-2")
+    assert calls == ["org-1", "org-2", "org-2", "org-1", "org-2"]
+
+
+def test_write_tags_cover_previous_values():
+    plan = BillingPlan(id="plan-1", organisation_id="org-1")
+
+    assert write_tags(plan) == {"billing_plan", "org:org-1"}
+    assert table_tags("billing_plans") == {"billing_plan", "org:*"}
+
+
+def test_concurrent_misses_call_once():
+    cache = ServiceCache(create_cache("memory://", prefix="test", maxsize=100, ttl=60))
+    calls = []
+
+    @cache.cached("faq")
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"General": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"General": []}] * 8
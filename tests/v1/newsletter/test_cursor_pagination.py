@@ -0,0 +1,66 @@
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from uuid_extensions import uuid7
+
+from api.utils.pagination import paginated_response
+from api.v1.models.newsletter import Newsletter
+
+start = datetime(2024, 8, 1, tzinfo=timezone.utc)
+
+pytestmark = pytest.mark.sqlite_tables([Newsletter])
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as db:
+        # the last two share a timestamp and are ordered by id
+        for i, minutes in enumerate([0, 1, 2, 3, 3]):
+            db.add(Newsletter(
+                id=str(uuid7()),
+                title=f"newsletter {i}",
+                created_at=start + timedelta(minutes=minutes),
+            ))
+        db.commit()
+        yield db
+
+
+def page(db, cursor, limit=2):
+    response = paginated_response(db=db, model=Newsletter, skip=0, limit=limit, cursor=cursor)
+    data = json.loads(response.body)["data"]
+    return [item["title"] for item in data["items"]], data["next"], data["prev"]
+
+
+def test_pages_forward_and_back(db):
+    titles, next, prev = page(db, "")
+    assert titles == ["newsletter 4", "newsletter 3"]
+    assert prev is None
+
+    titles, next, prev = page(db, next)
+    assert titles == ["newsletter 2", "newsletter 1"]
+
+    last, end, _ = page(db, next)
+    assert last == ["newsletter 0"]
+    assert end is None
+
+    titles, _, first_prev = page(db, prev)
+    assert titles == ["newsletter 4", "newsletter 3"]
+    assert first_prev is None
+
+
+def test_pages_do_not_shift_on_insert(db):
+    _, next, _ = page(db, "")
+
+    db.add(Newsletter(id=str(uuid7()), title="newer", created_at=start + timedelta(hours=1)))
+    db.commit()
+
+    titles, _, _ = page(db, next)
+    assert titles == ["newsletter 2", "newsletter 1"]
+
+
+def test_invalid_cursor(db):
+    with pytest.raises(HTTPException) as exc:
+        page(db, "not-a-cursor")
+
+    assert exc.value.status_code == 400
@@ -0,0 +1,64 @@
+import json
+import pytest
+from unittest.mock import patch
+from uuid_extensions import uuid7
+
+from api.utils.pagination import paginated_response
+from api.utils.totals import ESTIMATED, TotalCounter, total_counter
+from api.v1.models.newsletter import Newsletter
+
+pytestmark = pytest.mark.sqlite_tables([Newsletter])
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as db:
+        db.add_all(Newsletter(id=str(uuid7()), title=f"newsletter {i}") for i in range(3))
+        db.commit()
+        yield db
+
+
+@pytest.fixture
+def counts(db, record_statements):
+    return record_statements(lambda statement: "count(" in statement.lower())
+
+
+def page(db, **kwargs):
+    response = paginated_response(db=db, model=Newsletter, skip=0, limit=2, **kwargs)
+    return json.loads(response.body)["data"]
+
+
+def test_cached_totals_are_counted_once(db, counts):
+    first = page(db)
+    second = page(db)
+
+    assert (first["total"], first["pages"], first["total_exact"]) == (3, 2, True)
+    assert (second["total"], second["total_exact"]) == (3, False)
+    assert len(counts) == 1
+
+    page(db, filters={"title": "newsletter 1"})
+    assert len(counts) == 2
+
+
+def test_totals_can_be_skipped(db, counts):
+    data = page(db, include_total=False)
+
+    assert data["total"] is None
+    assert data["pages"] is None
+    assert len(data["items"]) == 2
+    assert counts == []
+
+
+def test_estimated_totals(db, counts):
+    counter = TotalCounter(cache_size=10, cache_ttl=60, estimate_threshold=1000)
+    query = db.query(Newsletter)
+
+    with patch.dict("api.utils.totals.TOTAL_STRATEGIES", {"newsletters": ESTIMATED}):
+        # sqlite has no planner estimate so it is counted
+        assert counter.count(db, query, Newsletter) == (3, True)
+
+        with patch.object(counter, "estimate", return_value=250000):
+            assert counter.count(db, query, Newsletter) == (250000, False)
+
+        with patch.object(counter, "estimate", return_value=10):
+            assert counter.count(db, query, Newsletter) == (3, True)
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from uuid_extensions import uuid7
+
+from main import app
+from api.db.async_session import SyncSessionAdapter
+from api.db.database import get_async_db
+from api.utils.pagination import paginated_response_async
+from api.v1.models.product import Product
+from api.v1.models.user import User
+from api.v1.services.principal_cache import principal_cache
+from api.v1.services.user import user_service
+
+
+@pytest.fixture
+def session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    tables = [User.__table__, Product.__table__]
+    User.metadata.create_all(bind=engine, tables=tables)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        User.metadata.drop_all(bind=engine, tables=tables)
+
+
+@pytest.fixture
+def client(session):
+    app.dependency_overrides[get_async_db] = lambda: SyncSessionAdapter(session)
+    yield TestClient(app)
+    app.dependency_overrides = {}
+
+
+def create_user(session, is_superadmin: bool):
+    user = User(
+        id=str(uuid7()),
+        email=f"{uuid7()}@gmail.com",
+        first_name="Test",
+        last_name="User",
+        is_superadmin=is_superadmin,
+    )
+    session.add(user)
+    session.commit()
+    return user
+
+
+def create_products(session, count: int):
+    for i in range(count):
+        session.add(
+            Product(
+                name=f"product {i}",
+                price=10,
+                org_id=str(uuid7()),
+                category_id=str(uuid7()),
+                image_url="http://img",
+            )
+        )
+    session.commit()
+
+
+def test_get_all_products_superadmin(client, session):
+    admin = create_user(session, is_superadmin=True)
+    create_products(session, 3)
+    token = user_service.create_access_token(admin.id)
+
+    response = client.get(
+        "/api/v1/products?skip=1&limit=2",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 3
+    assert data["pages"] == 2
+    assert len(data["items"]) == 2
+
+
+def test_get_all_products_forbidden_for_regular_user(client, session):
+    user = create_user(session, is_superadmin=False)
+    token = user_service.create_access_token(user.id)
+
+    response = client.get(
+        "/api/v1/products?skip=1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 403
+
+
+def test_async_services_on_sync_stand_in(session):
+    user = create_user(session, is_superadmin=False)
+    create_products(session, 2)
+    db = SyncSessionAdapter(session)
+    token = user_service.create_access_token(user.id)
+
+    current_user = asyncio.run(user_service.get_current_user_async(token, db))
+    response = asyncio.run(
+        paginated_response_async(db=db, model=Product, skip=0, limit=10)
+    )
+
+    assert current_user.id == user.id
+    assert response.status_code == 200
+
+
+def test_current_user_async_is_fully_loaded(session):
+    user = create_user(session, is_superadmin=False)
+    principal_cache.enabled = True
+    principal_cache.set(user)
+    session.expunge_all()
+    token = user_service.create_access_token(user.id)
+
+    current_user = asyncio.run(
+        user_service.get_current_user_async(token, SyncSessionAdapter(session))
+    )
+
+    # an AsyncSession could not lazy load the columns left out of the cache
+    assert inspect(current_user).unloaded.isdisjoint(User.__table__.columns.keys())
@@ -0,0 +1,83 @@
+import pytest
+from decimal import Decimal
+from fastapi import HTTPException
+
+from api.v1.models.product import Product, ProductCategory
+from api.v1.services.product import product_service
+
+pytestmark = pytest.mark.sqlite_tables([Product, ProductCategory])
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as db:
+        db.add(ProductCategory(id="category", name="Furniture"))
+        for name, price, status in [
+            ("Chair", 25, "in_stock"),
+            ("chair_50%", 50, "low_on_stock"),
+            ("Armchair", 120, "out_of_stock"),
+        ]:
+            db.add(Product(
+                name=name, price=price, status=status,
+                org_id="org", category_id="category", image_url="image",
+            ))
+        db.commit()
+        yield db
+
+
+def names(products):
+    return sorted(product.name for product in products)
+
+
+def test_prefix_has_no_leading_wildcard(db, record_statements):
+    statements = record_statements(parameters=True)
+
+    assert names(product_service.fetch_all(db, name="ARM")) == ["Armchair"]
+
+    statement, parameters = statements[0]
+    assert "lower(products.name) LIKE ? ESCAPE '/'" in statement
+    assert parameters == ("arm%",)
+
+
+def test_operators(db):
+    assert names(product_service.fetch_all(db, name__ieq="CHAIR")) == ["Chair"]
+    assert names(product_service.fetch_all(db, name="chair_50%")) == ["chair_50%"]
+    assert names(product_service.fetch_all(db, name="chair_")) == ["chair_50%"]
+    assert names(product_service.fetch_all(db, name="chair")) == ["Chair", "chair_50%"]
+    assert names(product_service.fetch_all(db, price__gte="50", price__lt=Decimal(120))) == ["chair_50%"]
+    assert names(product_service.fetch_all(db, status__in="in_stock,out_of_stock")) == ["Armchair", "Chair"]
+    assert len(product_service.fetch_all(db, name=None, status="")) == 3
+
+
+@pytest.mark.parametrize("params, detail", [
+    ({"description": "chair"}, "Cannot filter by 'description'"),
+    ({"name__contains": "chair"}, "Cannot filter 'name' by 'contains', allowed: prefix, ieq, eq"),
+    ({"price__gte": "cheap"}, "Invalid value for 'price__gte'"),
+])
+def test_rejected_filters(db, params, detail):
+    with pytest.raises(HTTPException) as exc:
+        product_service.fetch_all(db, **params)
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail == detail
+
+
+def test_search_products(db):
+    search = product_service.search_products
+
+    assert names(search(db, org_id="org", name="arm")) == ["Armchair"]
+    assert names(search(db, org_id="org", category="FURNITURE", max_price=50)) == ["Chair", "chair_50%"]
+    assert search(db, org_id="org", category="Lighting") == []
+    assert search(db, org_id="other", name="Chair") == []
+
+
+def test_declared_filters_are_indexed():
+    indexes = {index.name: index for index in Product.__table__.indexes}
+
+    assert "lower(products.name)" in str(indexes["ix_products_name_lower"].expressions[0])
+    assert "lower(products.name)" in str(indexes["ix_products_name_pattern"].expressions[0])
+    assert indexes["ix_products_name_pattern"].dialect_options["postgresql"]["ops"] == {
+        "lower_name": "text_pattern_ops"
+    }
+    # eq and range filters do not get expression indexes
+    assert "ix_products_price_lower" not in indexes
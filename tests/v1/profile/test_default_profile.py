@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from uuid_extensions import uuid7
+
+from api.db.database import get_db
+from api.v1.models.user import User
+from api.v1.services.user import user_service
+from main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def user():
+    return User(
+        id=str(uuid7()),
+        email="testuser@gmail.com",
+        first_name="Test",
+        last_name="User",
+        is_active=True,
+        is_superadmin=False,
+        is_deleted=False,
+        is_verified=True,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+@pytest.fixture
+def mock_db(user):
+    """A session holding `user` and no profile row"""
+
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = None
+    db.get.side_effect = lambda model, id: user if id == user.id else None
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[user_service.get_current_user] = lambda: user
+    yield db
+    app.dependency_overrides = {}
+
+
+def test_me_without_profile(mock_db, user):
+    with patch(
+        "api.v1.routes.auth.organisation_service.retrieve_user_organizations",
+        return_value=[],
+    ):
+        response = client.get("/api/v1/auth/@me")
+
+    assert response.status_code == 200
+    profile = response.json()["data"]["profile"]
+    assert profile["id"] is None
+    assert profile["bio"] is None
+
+
+def test_profile_without_row(mock_db, user):
+    response = client.get(f"/api/v1/profile/{user.id}")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["id"] is None
+    assert data["created_at"] is None
+    assert data["bio"] is None
+
+
+def test_profile_of_unknown_user(mock_db):
+    response = client.get(f"/api/v1/profile/{uuid7()}")
+
+    assert response.status_code == 404
+    assert response.json()["message"] == "User profile not found"
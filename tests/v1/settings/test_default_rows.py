@@ -0,0 +1,93 @@
+"""
+Tests for lazily created per-user settings rows
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from uuid_extensions import uuid7
+from sqlalchemy.orm import Session
+
+from api.utils.default_rows import default_values, fetch_or_create, fetch_or_default
+from api.v1.models.data_privacy import DataPrivacySetting
+from api.v1.models.notifications import NotificationSetting
+from api.v1.models.profile import Profile
+from api.v1.models.user import User
+from api.v1.schemas.notification_settings import NotificationSettingsBase
+from api.v1.services.data_privacy import data_privacy_service
+from api.v1.services.notification_settings import notification_setting_service
+from api.v1.services.profile import profile_service
+
+
+@pytest.fixture
+def db_session_mock():
+    db_session = MagicMock(spec=Session)
+    db_session.query().filter().first.return_value = None
+    return db_session
+
+
+def test_default_values_from_server_defaults():
+    values = default_values(NotificationSetting)
+
+    assert values["mobile_push_notifications"] is False
+    assert values["email_notification_always_send_email_notifications"] is True
+    # generated values are left to the database
+    assert "id" not in values
+    assert "created_at" not in values
+
+
+def test_fetch_or_default_does_not_write(db_session_mock):
+    user_id = str(uuid7())
+
+    setting = fetch_or_default(db_session_mock, NotificationSetting, user_id)
+
+    assert setting.user_id == user_id
+    assert setting.mobile_push_notifications is False
+    db_session_mock.add.assert_not_called()
+    db_session_mock.commit.assert_not_called()
+
+
+def test_fetch_or_default_returns_saved_row(db_session_mock):
+    saved = NotificationSetting(user_id="user", mobile_push_notifications=True)
+    db_session_mock.query().filter().first.return_value = saved
+
+    assert fetch_or_default(db_session_mock, NotificationSetting, "user") is saved
+
+
+def test_fetch_or_create_adds_default_row(db_session_mock):
+    profile = fetch_or_create(db_session_mock, Profile, "user")
+
+    db_session_mock.add.assert_called_once_with(profile)
+    db_session_mock.commit.assert_not_called()
+
+
+def test_notification_settings_created_on_first_update(db_session_mock):
+    setting = notification_setting_service.update(
+        db=db_session_mock,
+        user_id="user",
+        schema=NotificationSettingsBase.model_construct(mobile_push_notifications=True),
+    )
+
+    db_session_mock.add.assert_called_once_with(setting)
+    db_session_mock.commit.assert_called_once()
+    assert setting.mobile_push_notifications is True
+    assert setting.email_notification_always_send_email_notifications is True
+
+
+def test_missing_profile_reads_as_empty(db_session_mock):
+    profile = profile_service.fetch_by_user_id(db_session_mock, "user")
+
+    assert profile.user_id == "user"
+    assert profile.bio is None
+    db_session_mock.add.assert_not_called()
+
+
+def test_data_privacy_defaults_without_saved_setting(db_session_mock):
+    user = User(id="user", email="user@example.com")
+
+    setting = data_privacy_service.fetch(db_session_mock, user)
+
+    assert isinstance(setting, DataPrivacySetting)
+    assert setting.profile_visibility is True
+    assert setting.personalized_ads is False
+    db_session_mock.add.assert_not_called()
+    db_session_mock.commit.assert_not_called()
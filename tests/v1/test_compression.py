@@ -0,0 +1,122 @@
+import asyncio
+import gzip
+import zlib
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.utils.compression import CompressionMiddleware, accepted_encodings
+
+BODY = b'{"items": [' + b'{"name": "product"},' * 200 + b"{}]}"
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+@app.get("/large")
+def large():
+    return Response(BODY, media_type="application/json")
+
+
+@app.get("/tagged")
+def tagged():
+    return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+
+@app.get("/small")
+def small():
+    return PlainTextResponse("ok")
+
+
+@app.get("/image")
+def image():
+    return Response(b"\x89PNG" * 500, media_type="image/png")
+
+
+@app.get("/media/report.csv")
+def media():
+    return Response(b"a,b\n" * 500, media_type="text/csv")
+
+
+@app.get("/export")
+def export():
+    return StreamingResponse((b"id,name\n" for _ in range(100)), media_type="text/csv")
+
+
+client = TestClient(app)
+
+
+def test_gzip():
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+def test_strong_etag_is_weakened():
+    response = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert client.get("/tagged", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"v1"'
+
+
+def test_brotli_preferred():
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.content == BODY
+
+
+def test_quality_values():
+    response = client.get("/large", headers={"Accept-Encoding": "br;q=0.5, gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert accepted_encodings("br;q=0, gzip;q=0.8") == {"br": 0.0, "gzip": 0.8}
+
+
+def test_skipped_responses():
+    headers = {"Accept-Encoding": "gzip, br"}
+
+    assert "content-encoding" not in client.get("/small", headers=headers).headers
+    assert "content-encoding" not in client.get("/image", headers=headers).headers
+    assert "content-encoding" not in client.get("/media/report.csv", headers=headers).headers
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_streaming_chunks_are_flushed():
+    messages = []
+
+    async def csv_export(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/csv"), (b"content-length", b"800"),
+        ]})
+        for _ in range(100):
+            await send({"type": "http.response.body", "body": b"id,name\n", "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "path": "/export", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(csv_export, minimum_size=500)(scope, None, send))
+
+    start, *bodies = messages
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert b"content-length" not in dict(start["headers"])
+
+    # each chunk decompresses as soon as it arrives
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decompressor.decompress(bodies[0]["body"]) == b"id,name\n"
+    assert len(bodies) == 101
+    assert gzip.decompress(b"".join(body["body"] for body in bodies)) == b"id,name\n" * 100
+
+
+def test_brotli_stream():
+    response = client.get("/export", headers={"Accept-Encoding": "br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.content == b"id,name\n" * 100
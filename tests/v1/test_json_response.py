@@ -0,0 +1,64 @@
+import enum
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from api.utils.json_response import FastJSONResponse, row_content
+from api.utils.success_response import success_response
+from api.v1.models.user import User
+
+
+class Colour(enum.Enum):
+    red = "red"
+
+
+class Item(BaseModel):
+    created_at: datetime
+    price: Decimal
+
+
+def user():
+    now = datetime.now(timezone.utc)
+    return User(
+        id="user-1", email="user@example.com", password="hashed", first_name="Ada",
+        is_superadmin=False, created_at=now, updated_at=now,
+    )
+
+
+def test_bytes_match_jsonable_encoder():
+    content = {
+        "aware": datetime.now(timezone.utc),
+        "naive": datetime(2024, 8, 1, 12, 30, 15, 250),
+        "date": date(2024, 8, 1),
+        "decimals": [Decimal("19.99"), Decimal("3")],
+        "uuid": uuid4(),
+        "enum": Colour.red,
+        "set": {1},
+        "timedelta": timedelta(minutes=1),
+        "model": Item(created_at=datetime.now(), price=Decimal("2.50")),
+        "orm": user(),
+        "text": "naïve ✓",
+        1: None,
+    }
+
+    expected = JSONResponse(content=jsonable_encoder(content)).body
+    assert FastJSONResponse(content=content).body == expected
+
+
+def test_success_response_renders_once():
+    response = success_response(200, "ok", data={"price": Decimal("1.5")})
+
+    assert isinstance(response, FastJSONResponse)
+    assert response.body == b'{"status_code":200,"success":true,"message":"ok","data":{"price":1.5}}'
+
+
+def test_row_content_excludes_fields():
+    row = user()
+    exclude = frozenset({"password", "is_superadmin"})
+
+    assert jsonable_encoder(row_content(row, exclude)) == jsonable_encoder(row, exclude=exclude)
+    assert "password" not in row_content(row, exclude)
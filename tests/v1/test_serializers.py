@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+
+from api.utils.serializers import SerializerRegistry
+from api.utils.success_response import success_response
+from api.v1.models.user import User
+from api.v1.schemas.user import AllUsersResponse, UserData
+
+
+def users():
+    now = datetime.now(timezone.utc)
+    return [
+        User(
+            id=f"user-{i}", email=f"user{i}@example.com", first_name="Ada", last_name="L",
+            is_active=True, is_deleted=False, is_verified=True, is_superadmin=False,
+            created_at=now, updated_at=now,
+        )
+        for i in range(3)
+    ]
+
+
+def test_adapters_are_cached():
+    registry = SerializerRegistry()
+
+    assert registry.adapter(List[UserData]) is registry.adapter(List[UserData])
+
+
+def test_success_response_matches_per_row_validation():
+    registry = SerializerRegistry()
+    rows = users()
+
+    expected = success_response(
+        200, "ok", data=jsonable_encoder([UserData.model_validate(row) for row in rows])
+    )
+
+    assert registry.success_response(UserData, rows, "ok").body == expected.body
+
+
+def test_response_model_bytes():
+    registry = SerializerRegistry()
+    value = AllUsersResponse(
+        message="ok", status_code=200, status="success", page=1, per_page=10, total=3,
+        data=registry.validate_list(UserData, users()),
+    )
+
+    response = registry.response(AllUsersResponse, value)
+
+    assert response.media_type == "application/json"
+    assert AllUsersResponse.model_validate_json(response.body) == value
@@ -93,6 +93,7 @@ def test_get_testimonials(db_session_mock):
 
     db_session_mock.query.return_value = mock_query
     response = client.get(url, params={'page_size': 2, 'page': 1})
-    assert len(response.json()['data']) == 5
+    assert len(response.json()['data']) == 6
+    assert response.json()['data']['total_exact'] is True
     assert response.status_code == 200
     assert response.json()['message'] == 'Successfully fetched items'
@@ -109,6 +109,7 @@ def test_get_all_users(mock_db_session, user_service_mock, mock_superadmin, mock
         'page': page,
         'per_page': per_page,
         'total': len(mock_users),
+        'total_exact': True,
         'data': [
             {
                 'id': mock_users[0].id,